@@ -0,0 +1,30 @@
+"""Add idempotency_keys.locked_until
+
+Revision ID: a4f6c8e0b2d9
+Revises: d5a7c9e1f3b2
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4f6c8e0b2d9'
+down_revision: Union[str, Sequence[str], None] = 'd5a7c9e1f3b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # NULL for keys claimed before this revision; those fall back to
+    # created_at plus the lock timeout.
+    op.add_column('idempotency_keys', sa.Column('locked_until', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('idempotency_keys', 'locked_until')
@@ -0,0 +1,46 @@
+"""Add price_guidance and price_guidance_changes tables
+
+Revision ID: b8d2e6f4a1c3
+Revises: 0a6d3f8e2c19
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d2e6f4a1c3'
+down_revision: Union[str, Sequence[str], None] = '0a6d3f8e2c19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('price_guidance',
+    sa.Column('city', sa.Text(), nullable=False),
+    sa.Column('duration_bucket', sa.String(length=10), nullable=False),
+    sa.Column('sample_count', sa.Integer(), nullable=False),
+    sa.Column('price_p10', sa.Float(), nullable=False),
+    sa.Column('price_p25', sa.Float(), nullable=False),
+    sa.Column('price_p50', sa.Float(), nullable=False),
+    sa.Column('price_p75', sa.Float(), nullable=False),
+    sa.Column('price_p90', sa.Float(), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('city', 'duration_bucket')
+    )
+    op.create_table('price_guidance_changes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('city', sa.Text(), nullable=False),
+    sa.Column('duration_bucket', sa.String(length=10), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('price_guidance_changes')
+    op.drop_table('price_guidance')
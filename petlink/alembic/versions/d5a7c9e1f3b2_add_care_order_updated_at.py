@@ -0,0 +1,34 @@
+"""Add care_orders.updated_at and order feed indexes
+
+Revision ID: d5a7c9e1f3b2
+Revises: b8d2e6f4a1c3
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a7c9e1f3b2'
+down_revision: Union[str, Sequence[str], None] = 'b8d2e6f4a1c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # NULL for orders last changed before this revision; the feed's
+    # periodic rebuild still loads them.
+    op.add_column('care_orders', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_care_orders_updated_at', 'care_orders', ['updated_at'], unique=False)
+    op.create_index('ix_proposals_created_at', 'proposals', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_proposals_created_at', table_name='proposals')
+    op.drop_index('ix_care_orders_updated_at', table_name='care_orders')
+    op.drop_column('care_orders', 'updated_at')
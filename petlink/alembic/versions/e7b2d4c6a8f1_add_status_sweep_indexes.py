@@ -0,0 +1,32 @@
+"""Add indexes for order status sweeps
+
+Revision ID: e7b2d4c6a8f1
+Revises: c3a8e5f01b42
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b2d4c6a8f1'
+down_revision: Union[str, Sequence[str], None] = 'c3a8e5f01b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_care_orders_status_start_date', 'care_orders', ['status', 'start_date'], unique=False)
+    op.create_index('ix_care_orders_status_end_date', 'care_orders', ['status', 'end_date'], unique=False)
+    op.create_index('ix_proposals_status_order_id', 'proposals', ['status', 'order_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_proposals_status_order_id', table_name='proposals')
+    op.drop_index('ix_care_orders_status_end_date', table_name='care_orders')
+    op.drop_index('ix_care_orders_status_start_date', table_name='care_orders')
@@ -0,0 +1,30 @@
+"""Add proposal listing indexes
+
+Revision ID: f4c9a1e3b5d7
+Revises: e7b2d4c6a8f1
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4c9a1e3b5d7'
+down_revision: Union[str, Sequence[str], None] = 'e7b2d4c6a8f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_proposals_order_id_id', 'proposals', ['order_id', 'id'], unique=False)
+    op.create_index('ix_proposals_petsitter_id_id', 'proposals', ['petsitter_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_proposals_petsitter_id_id', table_name='proposals')
+    op.drop_index('ix_proposals_order_id_id', table_name='proposals')
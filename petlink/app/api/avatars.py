@@ -0,0 +1,67 @@
+"""
+API routes for serving avatar files.
+
+Content-addressed avatars never change under their URL, so they are served
+with long-lived immutable caching and a strong ETag derived from the hash.
+With a remote storage backend, clients are redirected to the object store
+instead of having the API proxy the bytes.
+"""
+
+import os
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from starlette.responses import FileResponse, RedirectResponse, Response
+
+from app.services.avatar_service import AVATAR_URL_PREFIX
+from app.storage import CONTENT_ADDRESSED_NAME, IMMUTABLE_CACHE_CONTROL, get_avatar_storage
+
+router = APIRouter(prefix=AVATAR_URL_PREFIX, tags=["Avatars"], include_in_schema=False)
+
+# Legacy per-user names are overwritten in place, so clients must revalidate.
+MUTABLE_CACHE_CONTROL = "no-cache"
+# Kept well below the pre-signed URL lifetime.
+REDIRECT_CACHE_CONTROL = "private, max-age=300"
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in (
+        tag.strip() for tag in if_none_match.split(",")
+    )
+
+
+@router.api_route("/{filename}", methods=["GET", "HEAD"])
+async def get_avatar(filename: str, request: Request) -> Response:
+    """
+    Serve an avatar file.
+
+    Supports conditional requests and byte ranges. The file body is handed to
+    the server through FileResponse, which uses zero-copy ``pathsend`` when
+    the ASGI server supports it.
+    """
+    if filename.startswith(".") or os.path.basename(filename) != filename:
+        raise HTTPException(status_code=404, detail="Avatar not found")
+
+    storage = get_avatar_storage()
+    redirect_url = await storage.redirect_url(filename)
+    if redirect_url is not None:
+        return RedirectResponse(
+            redirect_url, status_code=302, headers={"Cache-Control": REDIRECT_CACHE_CONTROL}
+        )
+
+    path = storage.local_path(filename)
+    try:
+        stat_result = await run_in_threadpool(os.stat, path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Avatar not found")
+
+    headers = {"Cache-Control": MUTABLE_CACHE_CONTROL}
+    if CONTENT_ADDRESSED_NAME.match(filename):
+        etag = f'"{os.path.splitext(filename)[0]}"'
+        headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "ETag": etag}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+
+    return FileResponse(path, stat_result=stat_result, headers=headers)
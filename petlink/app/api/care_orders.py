@@ -1,7 +1,8 @@
 """API routes for managing care orders."""
 
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import NoResultFound
 
@@ -9,15 +10,20 @@ from app.db.database import get_db_session
 from app.schemas.care_order import (
     CareOrderCreate,
     CareOrderRead,
+    CareOrderRecommendation,
     CareOrderUpdate,
 )
 from app.services.care_order_service import (
     create_care_order,
     get_care_order,
+    get_care_order_read,
     list_care_orders,
+    list_recommended_care_orders,
     update_care_order,
     delete_care_order,
 )
+from app.services.export_service import export_care_order, user_has_order_access
+from app.api.fieldsets import FIELDS_QUERY, parse_fields, sparse_response
 from app.api.auth import get_current_user  # assuming you have this dependency
 from app.models.user import User
 
@@ -37,21 +43,75 @@ async def create_order(
     return new_order
 
 
+@router.get("/recommended", response_model=list[CareOrderRecommendation])
+async def read_recommended_orders(
+    available_from: datetime | None = None,
+    available_to: datetime | None = None,
+    skip: int = Query(0, ge=0, le=1000),
+    limit: int = Query(20, ge=1, le=100),
+    session: AsyncSession = Depends(get_db_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Open orders ranked for the current petsitter by city, fit with their
+    availability, owner rating, competing proposals and recency.
+    """
+    return await list_recommended_care_orders(
+        session,
+        current_user,
+        available_from=available_from,
+        available_to=available_to,
+        skip=skip,
+        limit=limit,
+    )
+
+
 @router.get("/{order_id}", response_model=CareOrderRead)
 async def read_order(
     order_id: int,
+    fields: str | None = FIELDS_QUERY,
     session: AsyncSession = Depends(get_db_session),
 ):
     """
     Retrieve a care order by its ID.
+
+    Pass `fields` to receive only some of the order's fields.
     """
+    selected = parse_fields(fields, CareOrderRead)
     try:
-        order = await get_care_order(session, order_id)
+        order = await get_care_order_read(session, order_id)
     except NoResultFound:
         raise HTTPException(status_code=404, detail="Care order not found")
+    if selected is not None:
+        return sparse_response(order, CareOrderRead, selected)
     return order
 
 
+@router.get("/{order_id}/export")
+async def export_order(
+    order_id: int,
+    session: AsyncSession = Depends(get_db_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Export a care order with its proposals and chat transcript as NDJSON.
+
+    Available to the order owner and to petsitters who bid on the order.
+    """
+    try:
+        order = await get_care_order(session, order_id)
+    except NoResultFound:
+        raise HTTPException(status_code=404, detail="Care order not found")
+    if not await user_has_order_access(session, order, current_user):
+        raise HTTPException(status_code=403, detail="You cannot export this order")
+
+    return StreamingResponse(
+        export_care_order(order_id),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="care_order_{order_id}.ndjson"'},
+    )
+
+
 @router.get("/", response_model=list[CareOrderRead])
 async def read_orders(
     skip: int = 0,
@@ -61,10 +121,12 @@ async def read_orders(
 
     date_from: str | None = None,
     date_to: str | None = None,
+    fields: str | None = FIELDS_QUERY,
 
     session: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user),
 ):
+    selected = parse_fields(fields, CareOrderRead)
     start_from = datetime.fromisoformat(date_from) if date_from else None
     start_to = datetime.fromisoformat(date_to) if date_to else None
 
@@ -77,7 +139,10 @@ async def read_orders(
         order_by_date=order_by,
         start_date_from=start_from,
         start_date_to=start_to,
+        fields=selected,
     )
+    if selected is not None:
+        return sparse_response(orders, CareOrderRead, selected, many=True)
     return orders
 
 
@@ -0,0 +1,28 @@
+"""API route for the owner dashboard."""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import get_db_session
+from app.schemas.dashboard import Dashboard
+from app.services.dashboard_service import get_owner_dashboard
+from app.api.auth import get_current_user
+from app.models.user import User, UserRole
+
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+
+
+@router.get("/", response_model=Dashboard)
+async def read_dashboard(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    session: AsyncSession = Depends(get_db_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Return the owner's orders with proposal summaries, latest message
+    previews and counterpart profiles in a single response.
+    """
+    if current_user.role != UserRole.owner:
+        raise HTTPException(status_code=403, detail="Dashboard is available to owners only")
+    return await get_owner_dashboard(session, current_user, skip=skip, limit=limit)
@@ -0,0 +1,63 @@
+"""API routes for streaming marketplace events to clients."""
+
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import StreamingResponse
+
+from app.api.auth import get_current_user
+from app.metrics import EVENT_STREAM_CONNECTIONS
+from app.models.user import User
+from app.services.event_service import Event, Subscription, event_broker
+
+router = APIRouter(prefix="/events", tags=["Events"])
+
+HEARTBEAT_SECONDS = 15
+# Tells EventSource clients how long to wait before reconnecting
+RETRY_MILLISECONDS = 3000
+
+
+def _format_event(event: Event) -> str:
+    return f"id: {event.id}\nevent: {event.type}\ndata: {json.dumps(event.data)}\n\n"
+
+
+async def _event_stream(subscription: Subscription):
+    """Yield SSE frames for a subscription until the client leaves, falls behind or the worker stops."""
+    EVENT_STREAM_CONNECTIONS.inc()
+    try:
+        yield f"retry: {RETRY_MILLISECONDS}\n\n"
+        # After an overflow, flush what was buffered and close; the client
+        # reconnects and replays the rest from its last event id.
+        while not (subscription.closed.is_set() and subscription.queue.empty()):
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            if event is not None:
+                yield _format_event(event)
+    finally:
+        EVENT_STREAM_CONNECTIONS.dec()
+        event_broker.unsubscribe(subscription)
+
+
+@router.get("/stream")
+async def stream_events(
+    last_event_id: str | None = Header(default=None),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Stream events for the current user as Server-Sent Events.
+
+    Owners receive new and updated proposals on their orders; sitters
+    receive status changes of orders they bid on and accepted proposals.
+    Reconnecting with ``Last-Event-ID`` replays recently missed events.
+    """
+    resume_from = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+    subscription = event_broker.subscribe(current_user.id, resume_from)
+    return StreamingResponse(
+        _event_stream(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
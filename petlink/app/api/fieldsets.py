@@ -0,0 +1,80 @@
+"""
+Sparse fieldsets for read endpoints.
+
+Clients pass ``?fields=id,title,status`` to receive only those fields. The
+selected names are handed to the service layer, which loads only the
+matching columns, and the response is serialized with a trimmed copy of the
+endpoint's schema.
+"""
+
+from functools import lru_cache
+from typing import Any, Iterable
+
+from fastapi import HTTPException, Query
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, ConfigDict, create_model
+
+FIELDS_QUERY = Query(
+    None,
+    description="Comma-separated list of fields to return, e.g. `id,title,status`",
+)
+
+# Always returned so clients can address what they received
+ALWAYS_INCLUDED = ("id",)
+
+
+def parse_fields(raw: str | None, schema: type[BaseModel]) -> frozenset[str] | None:
+    """
+    Parse a ``fields`` query parameter against a response schema.
+
+    Args:
+        raw: Comma-separated field names, or None for the full schema.
+        schema: Response schema of the endpoint.
+
+    Raises:
+        HTTPException: 400 if a name is not a field of the schema.
+
+    Returns:
+        Selected field names, or None if no selection was made.
+    """
+    if not raw:
+        return None
+    requested = {name.strip() for name in raw.split(",") if name.strip()}
+    unknown = requested - schema.model_fields.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+        )
+    always = {name for name in ALWAYS_INCLUDED if name in schema.model_fields}
+    return frozenset(requested | always)
+
+
+@lru_cache(maxsize=256)
+def _sparse_schema(schema: type[BaseModel], fields: frozenset[str]) -> type[BaseModel]:
+    return create_model(
+        f"{schema.__name__}Sparse",
+        __config__=ConfigDict(from_attributes=True),
+        **{
+            name: (info.annotation, ...)
+            for name, info in schema.model_fields.items()
+            if name in fields
+        },
+    )
+
+
+def sparse_response(
+    data: Any | Iterable[Any], schema: type[BaseModel], fields: frozenset[str], many: bool = False
+) -> JSONResponse:
+    """
+    Serialize ORM objects with only the selected fields of a schema.
+
+    Only the selected attributes are read, so columns left unloaded by the
+    service are never lazy-loaded.
+    """
+    sparse = _sparse_schema(schema, fields)
+    if many:
+        content = [sparse.model_validate(item).model_dump(mode="json") for item in data]
+    else:
+        content = sparse.model_validate(data).model_dump(mode="json")
+    return JSONResponse(content=content)
@@ -0,0 +1,25 @@
+"""API routes for load balancer and orchestrator health checks."""
+
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+router = APIRouter(prefix="/health", tags=["Health"], include_in_schema=False)
+
+
+@router.get("/live")
+async def liveness():
+    """Report that the process is up and serving requests."""
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def readiness(request: Request):
+    """
+    Report whether this process should receive traffic.
+
+    Returns 503 until startup, including the database warmup, has finished,
+    and again once shutdown has begun.
+    """
+    if not request.app.state.ready:
+        return JSONResponse(status_code=503, content={"status": "unavailable"})
+    return {"status": "ready"}
@@ -0,0 +1,33 @@
+"""API route for price suggestions."""
+
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import get_db_session
+from app.schemas.pricing import PriceSuggestion
+from app.services.pricing_service import get_price_suggestion
+from app.api.auth import get_current_user
+from app.models.user import User
+
+router = APIRouter(prefix="/pricing", tags=["Pricing"])
+
+
+@router.get("/suggestion", response_model=PriceSuggestion)
+async def read_price_suggestion(
+    start_date: datetime,
+    end_date: datetime,
+    city: Optional[str] = Query(None, min_length=1, max_length=100),
+    session: AsyncSession = Depends(get_db_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Suggest a price for an order with the given dates, from the proposals
+    made for similar orders. The city defaults to the current user's.
+    """
+    city = city or current_user.city
+    if not city:
+        raise HTTPException(status_code=400, detail="city is required when your profile has none")
+    return await get_price_suggestion(session, city, start_date, end_date)
@@ -1,6 +1,6 @@
 """API routes for managing proposals."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import NoResultFound
 
@@ -8,6 +8,7 @@ from app.db.database import get_db_session
 from app.schemas.proposal import (
     ProposalCreate,
     ProposalRead,
+    ProposalStatus,
     ProposalUpdate,
 )
 from app.services.proposal_service import (
@@ -16,8 +17,10 @@ from app.services.proposal_service import (
     list_proposals,
     update_proposal,
     delete_proposal,
+    accept_proposal,
 )
 from app.api.auth import get_current_user  # your auth dependency
+from app.api.fieldsets import FIELDS_QUERY, parse_fields, sparse_response
 from app.models.user import User
 
 router = APIRouter(prefix="/proposals", tags=["Proposals"])
@@ -43,31 +46,81 @@ async def create_new_proposal(
     return new_proposal
 
 
+@router.get("/me", response_model=list[ProposalRead])
+async def read_my_proposals(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    status: ProposalStatus | None = None,
+    fields: str | None = FIELDS_QUERY,
+    session: AsyncSession = Depends(get_db_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Retrieve the proposals sent by the current petsitter.
+    """
+    selected = parse_fields(fields, ProposalRead)
+    proposals = await list_proposals(
+        session,
+        skip=skip,
+        limit=limit,
+        petsitter_id=current_user.id,
+        status_filter=status.value if status else None,
+        fields=selected,
+    )
+    if selected is not None:
+        return sparse_response(proposals, ProposalRead, selected, many=True)
+    return proposals
+
+
 @router.get("/{proposal_id}", response_model=ProposalRead)
 async def read_proposal(
     proposal_id: int,
+    fields: str | None = FIELDS_QUERY,
     session: AsyncSession = Depends(get_db_session),
 ):
     """
     Retrieve a proposal by ID.
+
+    Pass `fields` to receive only some of the proposal's fields.
     """
+    selected = parse_fields(fields, ProposalRead)
     try:
-        proposal = await get_proposal(session, proposal_id)
+        proposal = await get_proposal(session, proposal_id, fields=selected)
     except NoResultFound:
         raise HTTPException(status_code=404, detail="Proposal not found")
+    if selected is not None:
+        return sparse_response(proposal, ProposalRead, selected)
     return proposal
 
 
 @router.get("/", response_model=list[ProposalRead])
 async def read_proposals(
-    skip: int = 0,
-    limit: int = 20,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    order_id: int | None = None,
+    petsitter_id: int | None = None,
+    status: ProposalStatus | None = None,
+    fields: str | None = FIELDS_QUERY,
     session: AsyncSession = Depends(get_db_session),
 ):
     """
     Retrieve a paginated list of proposals.
+
+    Filter by `order_id`, `petsitter_id` and `status`; pass `fields` to
+    receive only some of each proposal's fields.
     """
-    proposals = await list_proposals(session, skip=skip, limit=limit)
+    selected = parse_fields(fields, ProposalRead)
+    proposals = await list_proposals(
+        session,
+        skip=skip,
+        limit=limit,
+        order_id=order_id,
+        petsitter_id=petsitter_id,
+        status_filter=status.value if status else None,
+        fields=selected,
+    )
+    if selected is not None:
+        return sparse_response(proposals, ProposalRead, selected, many=True)
     return proposals
 
 
@@ -95,6 +148,26 @@ async def update_existing_proposal(
     return updated_proposal
 
 
+@router.post("/{proposal_id}/accept", response_model=ProposalRead)
+async def accept_existing_proposal(
+    proposal_id: int,
+    session: AsyncSession = Depends(get_db_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Accept a proposal for one of the current user's orders.
+
+    Moves the order to in_progress and rejects all other pending proposals
+    in the same transaction. Returns 409 if the order was already taken or
+    is being accepted concurrently.
+    """
+    try:
+        proposal = await accept_proposal(session, proposal_id, current_user)
+    except NoResultFound:
+        raise HTTPException(status_code=404, detail="Proposal not found")
+    return proposal
+
+
 @router.delete("/{proposal_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_existing_proposal(
     proposal_id: int,
@@ -1,25 +1,29 @@
-import os
-from fastapi import APIRouter, Depends, status, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, status, HTTPException, Query, Request
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from starlette.responses import Response
-from pydantic import BaseModel
+from starlette.responses import Response, StreamingResponse
+from pydantic import BaseModel, EmailStr
 
 from app.models.user import User
-from app.schemas.user import UserCreate, UserRead, UserUpdate
+from app.schemas.user import UserAvailability, UserCreate, UserRead, UserUpdate
 from app.services.user_service import (
+    check_availability,
     create_user,
     get_user_by_id,
     update_user,
     delete_user,
     get_user_entity_by_id,
+    to_user_read,
+)
+from app.services.export_service import export_user_history
+from app.services.avatar_service import (
+    AVATAR_FORM_FIELD,
+    save_avatar_upload,
+    set_user_avatar,
 )
 from app.db.database import get_db_session
-from app.core.security import verify_password
-
-AVATAR_DIR = "static/avatars"
-MAX_FILE_SIZE = 5 * 1024 * 1024
-ALLOWED_TYPES = {"image/jpeg", "image/jpg", "image/png", "image/webp"}
+from app.api.auth import get_current_user
+from app.core.security import verify_password_async
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
@@ -34,12 +38,44 @@ async def register_user(user_data: UserCreate, session: AsyncSession = Depends(g
     return await create_user(session, user_data)
 
 
+# Declared before /{user_id}, which would otherwise match this path
+@router.get("/availability", response_model=UserAvailability)
+async def read_availability(
+    username: str | None = Query(None, min_length=3, max_length=50),
+    email: EmailStr | None = None,
+    session: AsyncSession = Depends(get_db_session),
+) -> UserAvailability:
+    """
+    Check whether a username and an email address can still be registered.
+
+    Meant for registration forms checking as the user types: values that
+    were never used are answered without a database query.
+    """
+    return await check_availability(session, username, email)
+
+
 @router.get("/{user_id}", response_model=UserRead)
 async def read_user(user_id: int, session: AsyncSession = Depends(get_db_session)) -> UserRead:
     """Retrieve user by ID."""
     return await get_user_by_id(session, user_id)
 
 
+@router.get("/{user_id}/export")
+async def export_profile(
+    user_id: int,
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """Export the user's profile, orders, proposals and chats as NDJSON."""
+    if current_user.id != user_id:
+        raise HTTPException(status_code=403, detail="You can only export your own data")
+
+    return StreamingResponse(
+        export_user_history(user_id),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="user_{user_id}.ndjson"'},
+    )
+
+
 @router.patch("/{user_id}", response_model=UserRead)
 async def update_profile(user_id: int, user_data: UserUpdate, session: AsyncSession = Depends(get_db_session)) -> UserRead:
     """Update user profile data."""
@@ -57,20 +93,40 @@ async def delete_profile(
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
-    if not verify_password(delete_data.password, user.hashed_password):
+    if not await verify_password_async(delete_data.password, user.hashed_password):
         raise HTTPException(status_code=403, detail="Incorrect password")
 
     await delete_user(session, user_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
-@router.post("/{user_id}/avatar")
+# The body is streamed by the handler itself, so the multipart schema is
+# declared here to keep the upload form in the OpenAPI docs.
+AVATAR_UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": [AVATAR_FORM_FIELD],
+                    "properties": {
+                        AVATAR_FORM_FIELD: {"type": "string", "format": "binary"},
+                    },
+                },
+            },
+        },
+    },
+}
+
+
+@router.post("/{user_id}/avatar", response_model=UserRead, openapi_extra=AVATAR_UPLOAD_OPENAPI)
 async def upload_avatar(
     user_id: int,
-    file: UploadFile = File(...),
+    request: Request,
     session: AsyncSession = Depends(get_db_session),
 ):
-    # 1. Проверяем пользователя
+    # 1. Проверяем пользователя до чтения тела запроса
     result = await session.execute(
         select(User).where(User.id == user_id, User.is_deleted == False)
     )
@@ -78,38 +134,15 @@ async def upload_avatar(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    # 2. Проверка типа файла
-    if file.content_type not in ALLOWED_TYPES:
-        raise HTTPException(status_code=400, detail="Invalid file type")
-
-    # 3. Читаем файл и проверяем размер
-    content = await file.read()
-    if len(content) > MAX_FILE_SIZE:
-        raise HTTPException(status_code=400, detail="File too large (max 5MB)")
-
-    # 4. Создаём папку если нет
-    os.makedirs(AVATAR_DIR, exist_ok=True)
-
-    # Удаляем предыдущий аватар, если есть
-    if user.avatar_url:
-        old_path = user.avatar_url.lstrip("/")
-        if os.path.exists(old_path):
-            os.remove(old_path)
-
-    # 5. Сохраняем файл
-    file_extension = file.filename.split(".")[-1]
-    file_path = f"{AVATAR_DIR}/user_{user_id}.{file_extension}"
+    # 2. Потоково сохраняем файл (размер и тип проверяются на лету)
+    staged = await save_avatar_upload(request)
 
-    with open(file_path, "wb") as buffer:
-        buffer.write(content)
-
-    # 6. Обновляем URL
-    user.avatar_url = f"/static/avatars/user_{user_id}.{file_extension}"
-
-    await session.commit()
+    # 3. Привязываем файл по хэшу содержимого; старый удаляется, если больше не используется.
+    #    Уменьшенные копии появятся после фоновой обработки
+    await set_user_avatar(session, user, staged)
     await session.refresh(user)
 
-    return user
+    return to_user_read(user)
 
 
 @router.delete("/{user_id}/avatar")
@@ -121,13 +154,6 @@ async def delete_avatar(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    if user.avatar_url:
-        file_path = user.avatar_url.lstrip("/")
-        if os.path.exists(file_path):
-            os.remove(file_path)
-
-    user.avatar_url = None
-    await session.commit()
-    await session.refresh(user)
+    await set_user_avatar(session, user, None)
 
     return {"message": "Avatar deleted"}
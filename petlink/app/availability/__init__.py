@@ -0,0 +1,19 @@
+"""
+Username and email availability.
+
+An in-memory Bloom filter answers "definitely free" for values that were
+never used, without a database query. Everything else is checked in the
+database. Each worker keeps its own filter and learns of users registered
+through other workers only when it is rebuilt, so a "free" answer can be
+wrong for up to ``availability_filter_rebuild_seconds``. Registration
+relies on the database's unique constraints, not on the filter.
+"""
+
+from app.availability.bloom import BloomFilter
+from app.availability.filter import AvailabilityFilter, availability_filter
+
+__all__ = [
+    "AvailabilityFilter",
+    "BloomFilter",
+    "availability_filter",
+]
@@ -0,0 +1,39 @@
+"""Bloom filter over strings."""
+
+import hashlib
+import math
+from typing import Iterator
+
+
+class BloomFilter:
+    """
+    Set of strings that may report false positives but never false negatives.
+
+    Sized for ``capacity`` items at the given false positive rate; adding
+    more items than that raises the rate. Bit positions are derived from one
+    BLAKE2b digest per item by double hashing.
+    """
+
+    def __init__(self, capacity: int, false_positive_rate: float):
+        capacity = max(capacity, 1)
+        self.size = max(8, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterator[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        # Odd, so that successive positions never repeat a cycle early
+        step = int.from_bytes(digest[8:], "little") | 1
+        return ((first + index * step) % self.size for index in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        bits = self._bits
+        for position in self._positions(item):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] >> (position & 7) & 1 for position in self._positions(item))
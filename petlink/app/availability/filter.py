@@ -0,0 +1,136 @@
+"""Filter over taken usernames and email addresses, rebuilt in the background."""
+
+import asyncio
+import logging
+import time
+
+from sqlalchemy import func, select
+
+from app.availability.bloom import BloomFilter
+from app.core.config import settings
+from app.db import database
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# User fields covered by the filter
+FIELDS = ("username", "email")
+REBUILD_BATCH_SIZE = 5000
+# Room for users registered before the next rebuild
+GROWTH_HEADROOM = 1.25
+MIN_CAPACITY = 1000
+
+
+def _key(field: str, value: str) -> str:
+    return f"{field}:{value}"
+
+
+class AvailabilityFilter:
+    """
+    Bloom filter over the usernames and emails of all users, deleted included.
+
+    Both must be unique across every row of ``users``, so a value the filter
+    has not seen is definitely free. A value it has seen may have been freed
+    by a rename since, or may be a false positive, and has to be checked in
+    the database.
+
+    The filter is rebuilt from the database at startup and periodically,
+    which also forgets renamed-away values. Users registered or renamed in
+    this process are added right away; those handled by other workers only
+    after this worker's next rebuild.
+    """
+
+    def __init__(self):
+        self._filter: BloomFilter | None = None
+        # Keys added while a rebuild is reading the table
+        self._added_during_rebuild: list[str] | None = None
+        self._task: asyncio.Task | None = None
+        self._stopping: asyncio.Event | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self._filter is not None
+
+    def is_free(self, field: str, value: str) -> bool:
+        """
+        Check a username or email against the filter.
+
+        Returns:
+            True if the value is definitely not taken, False if the database
+            has to be asked (also while the filter is not built yet).
+        """
+        return self._filter is not None and _key(field, value) not in self._filter
+
+    def add_user(self, username: str, email: str) -> None:
+        """Mark a user's current username and email as taken."""
+        for field, value in zip(FIELDS, (username, email)):
+            key = _key(field, value)
+            if self._filter is not None:
+                self._filter.add(key)
+            if self._added_during_rebuild is not None:
+                self._added_during_rebuild.append(key)
+
+    async def rebuild(self) -> None:
+        """Build a new filter from the users table and swap it in."""
+        started = time.perf_counter()
+        self._added_during_rebuild = []
+        try:
+            async with database.AsyncSessionLocal() as session:
+                users = await session.scalar(select(func.count()).select_from(User))
+                bloom = BloomFilter(
+                    len(FIELDS) * max(MIN_CAPACITY, int(users * GROWTH_HEADROOM)),
+                    settings.availability_filter_false_positive_rate,
+                )
+                result = await session.stream(
+                    select(User.username, User.email).execution_options(yield_per=REBUILD_BATCH_SIZE)
+                )
+                async for partition in result.partitions():
+                    for username, email in partition:
+                        bloom.add(_key("username", username))
+                        bloom.add(_key("email", email))
+            for key in self._added_during_rebuild:
+                bloom.add(key)
+            self._filter = bloom
+        finally:
+            self._added_during_rebuild = None
+        logger.info(
+            "Availability filter rebuilt with %s users in %.3fs",
+            users, time.perf_counter() - started,
+        )
+
+    async def start(self) -> None:
+        """Build the filter in the background and keep rebuilding it, unless disabled."""
+        if self._task is not None or not settings.availability_filter_enabled:
+            return
+        self._stopping = asyncio.Event()
+        self._task = asyncio.create_task(self._loop(), name="availability-filter")
+
+    async def stop(self) -> None:
+        """Stop rebuilding; the last filter stays in use."""
+        if self._task is None:
+            return
+        self._stopping.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._stopping = None
+
+    async def _loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await self.rebuild()
+            except Exception:
+                logger.exception("Availability filter rebuild failed")
+            try:
+                await asyncio.wait_for(
+                    self._stopping.wait(), timeout=settings.availability_filter_rebuild_seconds
+                )
+            except asyncio.TimeoutError:
+                pass
+
+
+# Process-wide filter started and stopped by the app lifespan
+availability_filter = AvailabilityFilter()
@@ -0,0 +1,56 @@
+"""
+Read-through cache for user profiles and care order details.
+
+Entries are kept in memory per worker by default, so a change made through
+one worker reaches the others once their entries expire. With
+``settings.cache_backend = "redis"`` all workers share one cache and see
+invalidations immediately. Redis is imported lazily so it is only needed
+when enabled.
+"""
+
+from app.cache.base import CacheBackend
+from app.cache.cache import CARE_ORDER, USER, Cache
+from app.cache.memory import MemoryCacheBackend
+from app.core.config import settings
+
+_cache: Cache | None = None
+
+
+def _create_backend() -> CacheBackend:
+    if settings.cache_backend == "memory":
+        return MemoryCacheBackend(settings.cache_max_entries)
+    if settings.cache_backend == "redis":
+        from app.cache.redis_store import RedisCacheBackend
+
+        if not settings.redis_url:
+            raise RuntimeError("redis_url must be set when cache_backend is 'redis'")
+        return RedisCacheBackend(settings.redis_url)
+    raise RuntimeError(f"Unknown cache backend: {settings.cache_backend}")
+
+
+def get_cache() -> Cache:
+    """Return the process-wide cache; it passes every lookup through when disabled."""
+    global _cache
+    if _cache is None:
+        backend = _create_backend() if settings.cache_enabled else None
+        _cache = Cache(backend, settings.cache_ttl_seconds)
+    return _cache
+
+
+async def close_cache() -> None:
+    """Close the cache's connections, if it was created."""
+    global _cache
+    if _cache is not None:
+        await _cache.close()
+        _cache = None
+
+
+__all__ = [
+    "CARE_ORDER",
+    "Cache",
+    "CacheBackend",
+    "MemoryCacheBackend",
+    "USER",
+    "close_cache",
+    "get_cache",
+]
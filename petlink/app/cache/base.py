@@ -0,0 +1,31 @@
+"""Interface shared by cache backends."""
+
+from abc import ABC, abstractmethod
+
+
+class CacheBackend(ABC):
+    """Keeps bytes under string keys, each with a time to live."""
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        """Return the value of a key, or None if it is missing or expired."""
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store a value, replacing any previous one."""
+
+    @abstractmethod
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        """
+        Store a value unless the key already has one.
+
+        Returns:
+            True if the value was stored.
+        """
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """Remove keys; missing keys are ignored."""
+
+    async def close(self) -> None:
+        """Release connections held by the backend."""
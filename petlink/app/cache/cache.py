@@ -0,0 +1,129 @@
+"""Read-through cache of API views, with versioned keys and request coalescing."""
+
+import asyncio
+import secrets
+from typing import Awaitable, Callable, TypeVar
+
+from pydantic import BaseModel
+
+from app.cache.base import CacheBackend
+from app.metrics import CACHE_REQUESTS
+
+# Entities with cached views; invalidating one drops all of its views
+USER = "user"
+CARE_ORDER = "care_order"
+
+# Versions outlive the views stored under them
+VERSION_TTL_FACTOR = 2
+
+Model = TypeVar("Model", bound=BaseModel)
+
+
+class Cache:
+    """
+    Caches pydantic views of database rows, such as a user's UserRead.
+
+    Each cached entity (user 42, care order 7) has a random version token,
+    and its views are stored under keys containing that token. Invalidating
+    the entity deletes the token, which orphans all of its views at once.
+    Because a reader fetches the token before querying the database, a view
+    read before a write commits is stored under a token the write then
+    deletes, and is never served.
+
+    Concurrent misses of the same view in one process share a single load.
+    Returned views may be shared between requests and must not be modified.
+    Without a backend every lookup goes straight to the loader.
+    """
+
+    def __init__(self, backend: CacheBackend | None, ttl_seconds: float):
+        self.backend = backend
+        self.ttl = ttl_seconds
+        self._loading: dict[str, asyncio.Future] = {}
+        self._counters: dict[tuple[str, str], object] = {}
+
+    async def get_or_load(
+        self,
+        entity: str,
+        entity_id: int,
+        view: str,
+        model: type[Model],
+        load: Callable[[], Awaitable[Model | None]],
+    ) -> Model | None:
+        """
+        Return a cached view of an entity, loading and storing it on a miss.
+
+        Args:
+            entity: Kind of entity, e.g. USER.
+            entity_id: ID of the entity.
+            view: Name of the view, as there may be several per entity.
+            model: Schema the view is stored as.
+            load: Reads the view from the database; returns None if the
+                entity does not exist, which is not cached.
+
+        Returns:
+            The view, or None if ``load`` found nothing.
+        """
+        if self.backend is None:
+            return await load()
+
+        version = await self._version(entity, entity_id)
+        key = f"{entity}:{entity_id}:{version}:{view}"
+        label = f"{entity}.{view}"
+        data = await self.backend.get(key)
+        if data is not None:
+            self._count(label, "hit")
+            return model.model_validate_json(data)
+        return await self._load_once(key, label, load)
+
+    async def invalidate(self, entity: str, *entity_ids: int) -> None:
+        """Drop every cached view of the given entities. Call after committing the change."""
+        if self.backend is not None and entity_ids:
+            await self.backend.delete(*(f"{entity}:{entity_id}" for entity_id in entity_ids))
+
+    async def close(self) -> None:
+        if self.backend is not None:
+            await self.backend.close()
+
+    async def _version(self, entity: str, entity_id: int) -> str:
+        key = f"{entity}:{entity_id}"
+        version = await self.backend.get(key)
+        if version is None:
+            version = secrets.token_hex(8).encode()
+            if not await self.backend.add(key, version, self.ttl * VERSION_TTL_FACTOR):
+                # Another reader created it first; if it is gone already, the
+                # token is only used for this lookup.
+                version = await self.backend.get(key) or version
+        return version.decode()
+
+    async def _load_once(self, key: str, label: str, load: Callable[[], Awaitable[Model | None]]) -> Model | None:
+        while (pending := self._loading.get(key)) is not None:
+            try:
+                value = await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The request loading it failed or was cancelled; load it here.
+                continue
+            self._count(label, "coalesced")
+            return value
+
+        self._count(label, "miss")
+        pending = self._loading[key] = asyncio.get_running_loop().create_future()
+        try:
+            value = await load()
+            if value is not None:
+                await self.backend.set(key, value.model_dump_json().encode(), self.ttl)
+        except BaseException:
+            pending.cancel()
+            raise
+        else:
+            pending.set_result(value)
+        finally:
+            del self._loading[key]
+        return value
+
+    def _count(self, label: str, result: str) -> None:
+        counter = self._counters.get((label, result))
+        if counter is None:
+            counter = self._counters[(label, result)] = CACHE_REQUESTS.labels(label, result)
+        counter.inc()
@@ -0,0 +1,56 @@
+"""Cache backend shared by all workers through Redis."""
+
+import logging
+
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+
+from app.cache.base import CacheBackend
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "cache:"
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Values in Redis strings, expired by Redis itself.
+
+    If Redis is unreachable, reads miss and writes are dropped, so requests
+    fall back to the database instead of failing.
+    """
+
+    def __init__(self, url: str):
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> bytes | None:
+        try:
+            return await self._client.get(KEY_PREFIX + key)
+        except RedisError:
+            logger.warning("Cache unavailable, reading from the database", exc_info=True)
+            return None
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        try:
+            await self._client.set(KEY_PREFIX + key, value, px=int(ttl * 1000))
+        except RedisError:
+            logger.warning("Cache unavailable, value not stored", exc_info=True)
+
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        try:
+            return bool(await self._client.set(KEY_PREFIX + key, value, px=int(ttl * 1000), nx=True))
+        except RedisError:
+            logger.warning("Cache unavailable, value not stored", exc_info=True)
+            return False
+
+    async def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        try:
+            await self._client.delete(*(KEY_PREFIX + key for key in keys))
+        except RedisError:
+            # Entries stay stale until their TTL runs out.
+            logger.warning("Cache unavailable, keys not invalidated: %s", keys, exc_info=True)
+
+    async def close(self) -> None:
+        await self._client.aclose()
@@ -14,10 +14,145 @@ class Settings(BaseSettings):
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
 
+    # Database connection pool: connections kept open, and how many more may
+    # be opened under load. With warmup enabled, startup opens the whole pool
+    # and runs the hot queries on every connection before reporting ready.
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_warmup_enabled: bool = True
+    # How long shutdown waits for in-flight requests before closing the pool
+    shutdown_drain_timeout_seconds: float = 10.0
+
+    # Avatar storage: "local" keeps files on this node's disk,
+    # "s3" uses any S3-compatible object store (AWS, MinIO, ...)
+    avatar_storage: str = "local"
+    s3_bucket: str | None = None
+    s3_endpoint_url: str | None = None
+    s3_region: str = "us-east-1"
+    s3_access_key_id: str | None = None
+    s3_secret_access_key: str | None = None
+    # Public/CDN base URL for the bucket; pre-signed URLs are used when unset
+    s3_public_base_url: str | None = None
+    s3_presign_expires_seconds: int = 3600
+    s3_max_pool_connections: int = 20
+
+    # Background job queue
+    job_workers: int = 4
+    job_poll_interval_seconds: float = 1.0
+    # Running jobs older than this are assumed lost and handed out again
+    job_visibility_timeout_seconds: int = 300
+    job_drain_timeout_seconds: float = 30.0
+
+    # Time-based order status transitions
+    status_scheduler_enabled: bool = True
+    status_scheduler_interval_seconds: float = 60.0
+    status_scheduler_batch_size: int = 500
+
+    # Shared Redis, used by components configured to run across workers
+    redis_url: str | None = None
+
+    # Read-through cache of user profiles and care order details. "memory"
+    # caches per worker, so other workers see a change once their entry
+    # expires; "redis" shares the cache, and invalidations, between workers
+    cache_enabled: bool = True
+    cache_backend: str = "memory"
+    cache_ttl_seconds: float = 30.0
+    cache_max_entries: int = 10_000
+
+    # Bloom filter answering username/email availability checks without a
+    # query for values never used. Each worker rebuilds its own filter, and
+    # sees registrations made through other workers only after a rebuild, so
+    # a value can be reported free wrongly for up to the rebuild interval
+    availability_filter_enabled: bool = True
+    availability_filter_rebuild_seconds: float = 300.0
+    availability_filter_false_positive_rate: float = 0.01
+
+    # Proposal price percentiles per city and order duration, recomputed in
+    # the background for changed buckets only. Buckets with fewer proposals
+    # than the minimum are not served, as they would reveal single bids
+    price_guidance_enabled: bool = True
+    price_guidance_refresh_seconds: float = 300.0
+    price_guidance_min_samples: int = 5
+
+    # Recommended orders for petsitters, ranked from an in-memory snapshot
+    # per worker. Changes show up after the refresh interval; deleted bids
+    # and owner profile changes only after the periodic rebuild
+    order_feed_enabled: bool = True
+    order_feed_refresh_seconds: float = 5.0
+    order_feed_rebuild_seconds: float = 300.0
+    order_feed_weights: dict[str, float] = {
+        "city": 3.0,
+        "overlap": 2.0,
+        "owner_rating": 1.0,
+        "competition": 1.0,
+        "recency": 1.0,
+    }
+    order_feed_recency_half_life_hours: float = 72.0
+
+    # Rate limiting: "METHOD /path" -> "<requests>/<seconds>" per user, or per
+    # IP for anonymous requests; "*" applies to all other routes
+    rate_limit_enabled: bool = True
+    # "memory" limits per worker process, "redis" across all workers
+    rate_limit_backend: str = "memory"
+    rate_limit_rules: dict[str, str] = {
+        "*": "300/60",
+        "POST /auth/login": "10/60",
+        "POST /users/": "5/3600",
+        "POST /messages/": "30/60",
+    }
+    # Only enable behind a proxy that sets X-Forwarded-For itself
+    rate_limit_trust_forwarded_for: bool = False
+
+    # Idempotency-Key handling: routes, how long responses are replayed,
+    # how long a duplicate waits for the first request to finish, and after
+    # how long without a heartbeat from its worker an unfinished request is
+    # assumed lost
+    idempotency_routes: list[str] = [
+        "POST /care_orders/",
+        "POST /proposals/",
+        "POST /messages/",
+    ]
+    idempotency_ttl_seconds: int = 24 * 60 * 60
+    idempotency_wait_seconds: float = 10.0
+    idempotency_lock_timeout_seconds: int = 60
+
+    # Per-request profiler: requests are sampled at this rate, or when they
+    # send a token from `python -m app.profiling` in the X-Profile header
+    profiling_sample_rate: float = 0.0
+    profiling_interval_seconds: float = 0.005
+    profiling_output_dir: str = "profiles"
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"  # Optional: specify encoding of the env file
 
 
+_settings: Settings | None = None
+
+
+def get_settings() -> Settings:
+    """Return the app-wide settings, loading them on first use."""
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
+
+
+def configure_settings(value: Settings) -> None:
+    """Install the settings the app should use, e.g. from create_app()."""
+    global _settings
+    _settings = value
+
+
+class _LazySettings:
+    """Forwards to get_settings(), so importing modules needs no environment."""
+
+    def __getattr__(self, name: str):
+        return getattr(get_settings(), name)
+
+    def __setattr__(self, name: str, value) -> None:
+        setattr(get_settings(), name, value)
+
+
 # Singleton settings instance for app-wide usage
-settings = Settings()
+settings: Settings = _LazySettings()  # type: ignore[assignment]
@@ -4,21 +4,31 @@ Security utilities.
 Contains password hashing, verification, and JWT token creation/validation.
 """
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from functools import lru_cache
+from typing import Callable, Optional, TypeVar
 
 from passlib.context import CryptContext
 from jose import jwt, JWTError
 
 from app.core.config import settings
+from app.metrics import PASSWORD_HASH_QUEUE_DEPTH
 
-
-SECRET_KEY = settings.secret_key
-ALGORITHM = settings.jwt_algorithm
-ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
+# Distinguishes profiling tokens from access tokens
+PROFILING_SCOPE = "profile"
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt releases the GIL, so hashing in threads keeps the event loop free
+PASSWORD_HASH_WORKERS = 4
+_hash_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+
+T = TypeVar("T")
+
 
 def hash_password(password: str) -> str:
     """Hash a plaintext password."""
@@ -30,23 +40,77 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+async def _run_hashing(func: Callable[..., T], *args) -> T:
+    started = False
+
+    def run() -> T:
+        nonlocal started
+        started = True
+        PASSWORD_HASH_QUEUE_DEPTH.dec()
+        return func(*args)
+
+    PASSWORD_HASH_QUEUE_DEPTH.inc()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, run)
+    finally:
+        if not started:
+            PASSWORD_HASH_QUEUE_DEPTH.dec()
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a plaintext password without blocking the event loop."""
+    return await _run_hashing(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against a hash without blocking the event loop."""
+    return await _run_hashing(verify_password, plain_password, hashed_password)
+
+
 def create_access_token(subject: str,
                         expires_delta: Optional[timedelta] = None) -> str:
     """Generate a JWT access token with an expiration."""
     expire = datetime.now(timezone.utc) + (expires_delta or timedelta(
-        minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
+        minutes=settings.access_token_expire_minutes))
     payload = {"sub": subject, "exp": expire}
-    encoded_jwt = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(payload, settings.secret_key, algorithm=settings.jwt_algorithm)
     return encoded_jwt
 
 
 def decode_access_token(token: str) -> Optional[str]:
     """Decode and verify JWT token, return subject or None if invalid."""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.jwt_algorithm])
         subject: str = payload.get("sub")
         if subject is None:
             return None
         return subject
     except JWTError:
         return None
+
+
+def create_profiling_token(expires_delta: timedelta) -> str:
+    """Generate a token that enables profiling of requests sending it."""
+    expire = datetime.now(timezone.utc) + expires_delta
+    payload = {"scope": PROFILING_SCOPE, "exp": expire}
+    return jwt.encode(payload, settings.secret_key, algorithm=settings.jwt_algorithm)
+
+
+def verify_profiling_token(token: str) -> bool:
+    """Check that a token was issued by create_profiling_token and is not expired."""
+    try:
+        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.jwt_algorithm])
+    except JWTError:
+        return False
+    return payload.get("scope") == PROFILING_SCOPE
+
+
+@lru_cache(maxsize=4096)
+def cached_token_subject(token: str) -> Optional[str]:
+    """
+    Like decode_access_token, but remembers results per token.
+
+    For middleware that only needs to tell users apart on every request.
+    Expiry is not re-checked, so never use it to authenticate.
+    """
+    return decode_access_token(token)
@@ -0,0 +1,20 @@
+"""
+Personalized feed of open care orders for petsitters.
+
+Each worker keeps the open orders in NumPy columns and scores all of them
+for a sitter at once, without a query or a Python loop per order. The
+snapshot follows the database with a few seconds' delay.
+"""
+
+from app.feed.feed import OrderFeed, order_feed
+from app.feed.ranking import SitterContext
+from app.feed.snapshot import OrderRow, OrderSnapshot, timestamp
+
+__all__ = [
+    "OrderFeed",
+    "OrderRow",
+    "OrderSnapshot",
+    "SitterContext",
+    "order_feed",
+    "timestamp",
+]
@@ -0,0 +1,176 @@
+"""Per-worker order feed, kept in sync with the database in the background."""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db import database
+from app.feed.ranking import SitterContext, score, top
+from app.feed.snapshot import OrderRow, OrderSnapshot
+from app.models.care_order import CareOrder, OrderStatus
+from app.models.proposal import Proposal
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Changes are re-read this far back, to catch transactions that committed
+# after a refresh with timestamps from before it
+CHANGE_LAG = timedelta(seconds=30)
+
+
+class OrderFeed:
+    """
+    Ranks open care orders for petsitters from an in-memory snapshot.
+
+    The snapshot is built from the database at startup. Every refresh
+    interval it re-reads the orders whose ``updated_at`` changed and the
+    proposal counts of orders with new bids; orders that are no longer open
+    are dropped. A periodic rebuild also picks up what those do not track:
+    deleted proposals and owner rating or city changes.
+    """
+
+    def __init__(self):
+        self._snapshot: OrderSnapshot | None = None
+        # When the last rebuild or refresh started reading, in UTC
+        self._synced_at: datetime | None = None
+        self._rebuilt_at = 0.0
+        self._task: asyncio.Task | None = None
+        self._stopping: asyncio.Event | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self._snapshot is not None
+
+    def __len__(self) -> int:
+        return len(self._snapshot) if self._snapshot is not None else 0
+
+    def rank(self, sitter: SitterContext, count: int, now: datetime | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return the IDs and scores of the ``count`` best orders for a sitter.
+
+        Raises:
+            RuntimeError: if the snapshot has not been built yet.
+        """
+        if self._snapshot is None:
+            raise RuntimeError("Order feed is not ready")
+        now = (now or datetime.now(timezone.utc)).timestamp()
+        scores = score(
+            self._snapshot,
+            sitter,
+            settings.order_feed_weights,
+            settings.order_feed_recency_half_life_hours * 3600,
+            now,
+        )
+        return top(self._snapshot, scores, count)
+
+    async def rebuild(self) -> None:
+        """Build a new snapshot of all open orders and swap it in."""
+        started = time.perf_counter()
+        synced_at = datetime.now(timezone.utc)
+        async with database.AsyncSessionLocal() as session:
+            rows = await _order_rows(session, CareOrder.status == OrderStatus.open)
+        self._snapshot = OrderSnapshot.from_rows([OrderRow(*row[:-1]) for row in rows])
+        self._synced_at = synced_at
+        self._rebuilt_at = time.monotonic()
+        logger.info(
+            "Order feed rebuilt with %s open orders in %.3fs",
+            len(self._snapshot), time.perf_counter() - started,
+        )
+
+    async def refresh(self) -> None:
+        """Apply order changes and new proposals since the last sync."""
+        synced_at = datetime.now(timezone.utc)
+        since = self._synced_at - CHANGE_LAG
+        async with database.AsyncSessionLocal() as session:
+            changed = await _order_rows(session, CareOrder.updated_at > since)
+            # proposals.created_at is naive UTC
+            new_bids = select(Proposal.order_id).where(Proposal.created_at > since.replace(tzinfo=None))
+            counts = await session.execute(
+                select(Proposal.order_id, func.count())
+                .where(Proposal.order_id.in_(new_bids))
+                .group_by(Proposal.order_id)
+            )
+            counts = counts.tuples().all()
+
+        snapshot = self._snapshot
+        for *fields, status in changed:
+            if status == OrderStatus.open:
+                snapshot.upsert(OrderRow(*fields))
+            else:
+                snapshot.remove(fields[0])
+        snapshot.set_proposal_counts(counts)
+        self._synced_at = synced_at
+
+    async def start(self) -> None:
+        """Build the snapshot in the background and keep it in sync, unless disabled."""
+        if self._task is not None or not settings.order_feed_enabled:
+            return
+        self._stopping = asyncio.Event()
+        self._task = asyncio.create_task(self._loop(), name="order-feed")
+
+    async def stop(self) -> None:
+        """Stop syncing; the last snapshot stays in use."""
+        if self._task is None:
+            return
+        self._stopping.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._stopping = None
+
+    async def _loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                if (
+                    self._snapshot is None
+                    or time.monotonic() - self._rebuilt_at >= settings.order_feed_rebuild_seconds
+                ):
+                    await self.rebuild()
+                else:
+                    await self.refresh()
+            except Exception:
+                logger.exception("Order feed sync failed")
+            try:
+                await asyncio.wait_for(
+                    self._stopping.wait(), timeout=settings.order_feed_refresh_seconds
+                )
+            except asyncio.TimeoutError:
+                pass
+
+
+async def _order_rows(session: AsyncSession, *criteria) -> list[tuple]:
+    """Read OrderRow fields, followed by the status, of matching orders."""
+    proposal_count = (
+        select(func.count())
+        .where(Proposal.order_id == CareOrder.id)
+        .correlate(CareOrder)
+        .scalar_subquery()
+    )
+    result = await session.execute(
+        select(
+            CareOrder.id,
+            User.city,
+            CareOrder.start_date,
+            CareOrder.end_date,
+            CareOrder.created_at,
+            User.owner_rating,
+            proposal_count,
+            CareOrder.status,
+        )
+        .join(User, User.id == CareOrder.owner_id)
+        .where(*criteria)
+    )
+    return result.tuples().all()
+
+
+# Process-wide feed started and stopped by the app lifespan
+order_feed = OrderFeed()
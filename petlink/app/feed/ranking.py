@@ -0,0 +1,106 @@
+"""Vectorized scoring of open care orders for one petsitter."""
+
+from dataclasses import dataclass
+from typing import Mapping, Sequence
+
+import numpy as np
+
+from app.feed.snapshot import OrderSnapshot
+
+# Ratings are scaled by this to the 0..1 range of the other signals
+MAX_RATING = 5.0
+# Shortest duration an overlap is measured against, so zero-length orders
+# do not divide by zero
+MIN_DURATION_SECONDS = 60 * 60
+
+
+@dataclass(frozen=True)
+class SitterContext:
+    """What an order is matched against."""
+    city: str | None
+    # Availability window in POSIX seconds; ``available_to`` may be inf
+    available_from: float
+    available_to: float
+    # Orders the sitter already bid on
+    excluded_order_ids: Sequence[int] = ()
+
+
+def score(
+    snapshot: OrderSnapshot,
+    sitter: SitterContext,
+    weights: Mapping[str, float],
+    recency_half_life_seconds: float,
+    now: float,
+) -> np.ndarray:
+    """
+    Score every order of the snapshot; higher is better.
+
+    Each signal lies in 0..1 and is multiplied by its weight:
+
+    - ``city``: the owner lives in the sitter's city.
+    - ``overlap``: share of the order within the sitter's availability.
+    - ``owner_rating``: rating petsitters gave the owner.
+    - ``competition``: 1 / (1 + proposals already made for the order).
+    - ``recency``: halves every ``recency_half_life_seconds`` after posting.
+
+    Orders that have ended or that the sitter already bid on get -inf.
+    Computed in the snapshot's scratch columns, so the result is only valid
+    until the next call.
+    """
+    scores, work, mask = snapshot.scratch()
+    start = snapshot.column("start")
+    end = snapshot.column("end")
+
+    # overlap: (min(end, to) - max(start, from))+ / max(duration, minimum)
+    np.minimum(end, sitter.available_to, out=scores)
+    np.maximum(start, sitter.available_from, out=work)
+    np.subtract(scores, work, out=scores)
+    np.maximum(scores, 0.0, out=scores)
+    np.subtract(end, start, out=work)
+    np.maximum(work, MIN_DURATION_SECONDS, out=work)
+    np.divide(scores, work, out=scores)
+    scores *= weights.get("overlap", 0.0)
+
+    city = snapshot.city_code(sitter.city)
+    if city >= 0:
+        np.equal(snapshot.column("city"), city, out=mask)
+        np.add(scores, weights.get("city", 0.0), out=scores, where=mask)
+
+    weight = weights.get("owner_rating", 0.0)
+    np.multiply(snapshot.column("owner_rating"), weight / MAX_RATING, out=work)
+    np.clip(work, 0.0, weight, out=work)
+    scores += work
+
+    np.add(snapshot.column("proposal_count"), 1.0, out=work)
+    np.divide(weights.get("competition", 0.0), work, out=work)
+    scores += work
+
+    # recency: 2 ** (-age / half-life), with age clamped at zero
+    np.subtract(snapshot.column("created"), now, out=work)
+    np.minimum(work, 0.0, out=work)
+    work /= recency_half_life_seconds
+    np.exp2(work, out=work)
+    work *= weights.get("recency", 0.0)
+    scores += work
+
+    np.less_equal(end, now, out=mask)
+    np.putmask(scores, mask, -np.inf)
+    if sitter.excluded_order_ids:
+        scores[snapshot.rows_of(sitter.excluded_order_ids)] = -np.inf
+    return scores
+
+
+def top(snapshot: OrderSnapshot, scores: np.ndarray, count: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    IDs and scores of the ``count`` best orders, best first; ties go to the
+    earlier start. Hidden orders are never returned.
+    """
+    size = snapshot.size
+    count = min(count, size)
+    if count <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+    # Partial selection is linear; only the selected rows are sorted.
+    best = np.argpartition(scores, size - count)[size - count:]
+    best = best[np.lexsort((snapshot.column("start")[best], -scores[best]))]
+    best = best[np.isfinite(scores[best])]
+    return snapshot.column("order_id")[best], scores[best]
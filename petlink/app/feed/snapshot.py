@@ -0,0 +1,156 @@
+"""Columnar in-memory copy of the open care orders."""
+
+from datetime import datetime, timezone
+from typing import Iterable, NamedTuple
+
+import numpy as np
+
+MIN_CAPACITY = 1024
+# City code of orders whose owner has no city; never matches a sitter
+NO_CITY = 0
+
+
+class OrderRow(NamedTuple):
+    """The fields of an open care order that the feed ranks on."""
+    id: int
+    city: str | None
+    start_date: datetime
+    end_date: datetime
+    created_at: datetime
+    owner_rating: float
+    proposal_count: int
+
+
+def timestamp(value: datetime) -> float:
+    """POSIX seconds of a datetime; naive values are taken as UTC, as SQLite returns them."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class OrderSnapshot:
+    """
+    Open care orders stored column by column, one NumPy array per field.
+
+    The first ``size`` entries of each array are valid. Removing an order
+    moves the last row into its place, so rows stay packed and every
+    column can be scored without a mask. Cities are stored as integer
+    codes, so that matching a city is an integer comparison.
+    """
+
+    def __init__(self, capacity: int = MIN_CAPACITY):
+        self.size = 0
+        self._rows: dict[int, int] = {}
+        self._cities: dict[str, int] = {}
+        self._allocate(max(capacity, MIN_CAPACITY))
+
+    @classmethod
+    def from_rows(cls, rows: list[OrderRow]) -> "OrderSnapshot":
+        snapshot = cls(len(rows))
+        size = snapshot.size = len(rows)
+        snapshot._rows = {row.id: index for index, row in enumerate(rows)}
+        # Filled a column at a time; assigning NumPy items one by one is slow.
+        snapshot.order_id[:size] = [row.id for row in rows]
+        snapshot.city[:size] = [snapshot._encode_city(row.city) for row in rows]
+        snapshot.start[:size] = [timestamp(row.start_date) for row in rows]
+        snapshot.end[:size] = [timestamp(row.end_date) for row in rows]
+        snapshot.created[:size] = [timestamp(row.created_at) if row.created_at else 0.0 for row in rows]
+        snapshot.owner_rating[:size] = [row.owner_rating or 0.0 for row in rows]
+        snapshot.proposal_count[:size] = [row.proposal_count for row in rows]
+        return snapshot
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, order_id: int) -> bool:
+        return order_id in self._rows
+
+    def city_code(self, city: str | None) -> int:
+        """Code of a city, or -1 if no open order is in it."""
+        if city is None:
+            return -1
+        return self._cities.get(city, -1)
+
+    def column(self, name: str) -> np.ndarray:
+        """View of the valid part of a column."""
+        return getattr(self, name)[:self.size]
+
+    def upsert(self, row: OrderRow) -> None:
+        """Add an order, or overwrite the stored fields of one already present."""
+        index = self._rows.get(row.id)
+        if index is None:
+            if self.size == len(self.order_id):
+                self._grow()
+            index = self._rows[row.id] = self.size
+            self.size += 1
+        self.order_id[index] = row.id
+        self.city[index] = self._encode_city(row.city)
+        self.start[index] = timestamp(row.start_date)
+        self.end[index] = timestamp(row.end_date)
+        self.created[index] = timestamp(row.created_at) if row.created_at else 0.0
+        self.owner_rating[index] = row.owner_rating or 0.0
+        self.proposal_count[index] = row.proposal_count
+
+    def remove(self, order_id: int) -> None:
+        """Drop an order, if present."""
+        index = self._rows.pop(order_id, None)
+        if index is None:
+            return
+        last = self.size - 1
+        if index != last:
+            for name in self._columns():
+                column = getattr(self, name)
+                column[index] = column[last]
+            self._rows[int(self.order_id[index])] = index
+        self.size = last
+
+    def rows_of(self, order_ids: Iterable[int]) -> np.ndarray:
+        """Row indices of the given orders; absent orders are skipped."""
+        rows = self._rows
+        return np.fromiter((rows[order_id] for order_id in order_ids if order_id in rows), dtype=np.intp)
+
+    def scratch(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Two float columns and a boolean one for scoring in place.
+
+        Reused by every call, so results are only valid until the next one.
+        Fresh temporaries of this size cost a page fault per 4 KiB each
+        time, which dominates ranking time.
+        """
+        size = self.size
+        return self._scores[:size], self._work[:size], self._mask[:size]
+
+    def set_proposal_counts(self, counts: Iterable[tuple[int, int]]) -> None:
+        """Update the proposal counts of (order ID, count) pairs; absent orders are skipped."""
+        for order_id, count in counts:
+            index = self._rows.get(order_id)
+            if index is not None:
+                self.proposal_count[index] = count
+
+    def _encode_city(self, city: str | None) -> int:
+        if city is None:
+            return NO_CITY
+        return self._cities.setdefault(city, len(self._cities) + 1)
+
+    @staticmethod
+    def _columns() -> tuple[str, ...]:
+        return ("order_id", "city", "start", "end", "created", "owner_rating", "proposal_count")
+
+    def _allocate(self, capacity: int) -> None:
+        self.order_id = np.zeros(capacity, dtype=np.int64)
+        self.city = np.zeros(capacity, dtype=np.int32)
+        # POSIX seconds
+        self.start = np.zeros(capacity, dtype=np.float64)
+        self.end = np.zeros(capacity, dtype=np.float64)
+        self.created = np.zeros(capacity, dtype=np.float64)
+        self.owner_rating = np.zeros(capacity, dtype=np.float64)
+        self.proposal_count = np.zeros(capacity, dtype=np.int32)
+        self._scores = np.zeros(capacity, dtype=np.float64)
+        self._work = np.zeros(capacity, dtype=np.float64)
+        self._mask = np.zeros(capacity, dtype=bool)
+
+    def _grow(self) -> None:
+        old = {name: getattr(self, name) for name in self._columns()}
+        self._allocate(len(self.order_id) * 2)
+        for name, column in old.items():
+            getattr(self, name)[:self.size] = column[:self.size]
@@ -0,0 +1,13 @@
+"""
+Idempotency-Key support.
+
+Outcomes of keyed requests are stored in the idempotency_keys table, so
+retries are recognized by every worker. Expired keys are purged by the
+status scheduler.
+"""
+
+from app.idempotency.middleware import IdempotencyMiddleware
+
+__all__ = [
+    "IdempotencyMiddleware",
+]
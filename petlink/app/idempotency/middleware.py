@@ -0,0 +1,319 @@
+"""ASGI middleware making POST endpoints safe to retry with ``Idempotency-Key``."""
+
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.future import select
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.security import cached_token_subject
+from app.db import database
+from app.models.idempotency_key import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+REPLAYED_HEADER = b"idempotent-replayed"
+MAX_KEY_LENGTH = 255
+# How often a duplicate checks for the result of a request on another worker
+POLL_INTERVAL_SECONDS = 0.1
+# Heartbeats per lock timeout, so one slow write does not lose the key
+HEARTBEATS_PER_LOCK_TIMEOUT = 3
+# Claims lost to keys that finish or expire in between, before giving up
+MAX_CLAIM_ATTEMPTS = 3
+
+
+class _ClaimContended(Exception):
+    """The key kept changing hands while this request tried to claim it."""
+
+
+def _lock_timeout() -> timedelta:
+    return timedelta(seconds=settings.idempotency_lock_timeout_seconds)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _request_identity(scope: Scope) -> tuple[str | None, int | None]:
+    key = user_id = None
+    for name, value in scope["headers"]:
+        if name == IDEMPOTENCY_HEADER:
+            key = value.decode("latin-1").strip()
+        elif name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                subject = cached_token_subject(token)
+                if subject is not None and subject.isdigit():
+                    user_id = int(subject)
+    return key, user_id
+
+
+async def _read_body(receive: Receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+def _replay_body(body: bytes, receive: Receive) -> Receive:
+    sent = False
+
+    async def replay() -> Message:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return replay
+
+
+async def _error(scope: Scope, receive: Receive, send: Send, status_code: int, detail: str,
+                 headers: dict[str, str] | None = None) -> None:
+    response = JSONResponse(status_code=status_code, content={"detail": detail}, headers=headers)
+    await response(scope, receive, send)
+
+
+class IdempotencyMiddleware:
+    """
+    Store the first successful response per ``Idempotency-Key`` and replay it.
+
+    Keys are scoped to the authenticated user. A retry with the same key and
+    request body gets the stored response instead of running the endpoint
+    again; a concurrent duplicate waits for the first request to finish.
+    Failed requests are not stored, so they can be retried for real.
+    """
+
+    def __init__(self, app: ASGIApp, routes: list[str] | None = None):
+        self.app = app
+        self._routes = frozenset(settings.idempotency_routes if routes is None else routes)
+        # Requests running in this process, so local duplicates need not poll
+        self._running: dict[tuple[int, str], asyncio.Event] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or f"{scope['method']} {scope['path']}" not in self._routes:
+            await self.app(scope, receive, send)
+            return
+        key, user_id = _request_identity(scope)
+        if key is None or user_id is None:
+            # No key, or anonymous: the endpoint rejects or handles it as usual.
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > MAX_KEY_LENGTH:
+            await _error(scope, receive, send, 400, "Invalid Idempotency-Key")
+            return
+
+        body = await _read_body(receive)
+        request_hash = hashlib.sha256(
+            b"%s %s\n%s" % (scope["method"].encode(), scope["path"].encode(), body)
+        ).hexdigest()
+        receive = _replay_body(body, receive)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.idempotency_wait_seconds
+        while True:
+            try:
+                record = await self._claim(user_id, key, scope, request_hash)
+            except _ClaimContended:
+                await _error(scope, receive, send, 409,
+                             "A request with this Idempotency-Key is still in progress",
+                             headers={"Retry-After": "1"})
+                return
+            if record is None:
+                await self._run(user_id, key, scope, receive, send)
+                return
+            if record.request_hash != request_hash:
+                await _error(scope, receive, send, 422,
+                             "Idempotency-Key was already used for a different request")
+                return
+            if record.status_code is not None:
+                await self._replay(record, send)
+                return
+            if await self._release_if_abandoned(record):
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                await _error(scope, receive, send, 409,
+                             "A request with this Idempotency-Key is still in progress",
+                             headers={"Retry-After": "1"})
+                return
+            await self._wait(user_id, key, min(remaining, POLL_INTERVAL_SECONDS))
+
+    async def _claim(
+        self, user_id: int, key: str, scope: Scope, request_hash: str
+    ) -> IdempotencyKey | None:
+        """
+        Insert the key, or return the existing record if another request owns it.
+
+        Raises:
+            _ClaimContended: if the key was released or expired between the
+                insert and the lookup every time.
+        """
+        for _ in range(MAX_CLAIM_ATTEMPTS):
+            now = datetime.now(timezone.utc)
+            async with database.AsyncSessionLocal() as session:
+                session.add(IdempotencyKey(
+                    user_id=user_id,
+                    key=key,
+                    method=scope["method"],
+                    path=scope["path"],
+                    request_hash=request_hash,
+                    created_at=now,
+                    expires_at=now + timedelta(seconds=settings.idempotency_ttl_seconds),
+                    locked_until=now + _lock_timeout(),
+                ))
+                try:
+                    await session.commit()
+                    return None
+                except IntegrityError:
+                    await session.rollback()
+                record = await session.scalar(
+                    select(IdempotencyKey).where(
+                        IdempotencyKey.user_id == user_id, IdempotencyKey.key == key
+                    )
+                )
+            if record is not None and _as_utc(record.expires_at) > now:
+                return record
+            # Finished or expired in the meantime: try to claim it again.
+            if record is not None:
+                await self._delete(record.id)
+        raise _ClaimContended
+
+    async def _run(self, user_id: int, key: str, scope: Scope, receive: Receive, send: Send) -> None:
+        done = self._running[(user_id, key)] = asyncio.Event()
+        start: Message | None = None
+        chunks: list[bytes] = []
+
+        async def capture(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        stored = False
+        heartbeat = asyncio.create_task(self._heartbeat(user_id, key))
+        try:
+            await self.app(scope, receive, capture)
+            if start is not None and 200 <= start["status"] < 300:
+                await self._store(user_id, key, start, b"".join(chunks))
+                stored = True
+        finally:
+            heartbeat.cancel()
+            if not stored:
+                await self._delete_key(user_id, key)
+            del self._running[(user_id, key)]
+            done.set()
+
+    async def _heartbeat(self, user_id: int, key: str) -> None:
+        """Keep extending the key's lock while this worker runs the request."""
+        interval = settings.idempotency_lock_timeout_seconds / HEARTBEATS_PER_LOCK_TIMEOUT
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with database.AsyncSessionLocal() as session:
+                    await session.execute(
+                        update(IdempotencyKey)
+                        .where(
+                            IdempotencyKey.user_id == user_id,
+                            IdempotencyKey.key == key,
+                            IdempotencyKey.status_code.is_(None),
+                        )
+                        .values(locked_until=datetime.now(timezone.utc) + _lock_timeout())
+                    )
+                    await session.commit()
+            except Exception:
+                # The next beat retries; the lock still has time left.
+                logger.exception("Could not extend the Idempotency-Key lock")
+
+    async def _store(self, user_id: int, key: str, start: Message, body: bytes) -> None:
+        headers = [
+            [name.decode("latin-1"), value.decode("latin-1")]
+            for name, value in start.get("headers", [])
+        ]
+        async with database.AsyncSessionLocal() as session:
+            await session.execute(
+                update(IdempotencyKey)
+                .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+                .values(status_code=start["status"], response_headers=headers, response_body=body)
+            )
+            await session.commit()
+
+    async def _replay(self, record: IdempotencyKey, send: Send) -> None:
+        headers = [
+            (name.encode("latin-1"), value.encode("latin-1"))
+            for name, value in record.response_headers
+        ]
+        headers.append((REPLAYED_HEADER, b"true"))
+        await send({"type": "http.response.start", "status": record.status_code, "headers": headers})
+        await send({"type": "http.response.body", "body": record.response_body})
+
+    async def _release_if_abandoned(self, record: IdempotencyKey) -> bool:
+        """
+        Drop a key whose request died with its worker without finishing.
+
+        A request running in this process is never abandoned. On other
+        workers it is abandoned once its lock has not been extended for the
+        lock timeout, however long ago it started.
+        """
+        if (record.user_id, record.key) in self._running:
+            return False
+        now = datetime.now(timezone.utc)
+        if record.locked_until is not None:
+            locked_until = _as_utc(record.locked_until)
+        else:
+            # Claimed by a worker that predates heartbeats
+            locked_until = _as_utc(record.created_at) + _lock_timeout()
+        if locked_until > now:
+            return False
+        await self._delete(record.id, in_progress_only=True, lock_expired_at=now)
+        return True
+
+    async def _wait(self, user_id: int, key: str, timeout: float) -> None:
+        running = self._running.get((user_id, key))
+        if running is None:
+            await asyncio.sleep(timeout)
+            return
+        try:
+            await asyncio.wait_for(running.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _delete(
+        self, record_id: int, in_progress_only: bool = False, lock_expired_at: datetime | None = None
+    ) -> None:
+        query = delete(IdempotencyKey).where(IdempotencyKey.id == record_id)
+        if in_progress_only:
+            query = query.where(IdempotencyKey.status_code.is_(None))
+        if lock_expired_at is not None:
+            # Unless its worker extended the lock since the record was read
+            query = query.where(or_(
+                IdempotencyKey.locked_until.is_(None),
+                IdempotencyKey.locked_until <= lock_expired_at,
+            ))
+        async with database.AsyncSessionLocal() as session:
+            await session.execute(query)
+            await session.commit()
+
+    async def _delete_key(self, user_id: int, key: str) -> None:
+        async with database.AsyncSessionLocal() as session:
+            await session.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.user_id == user_id, IdempotencyKey.key == key
+                )
+            )
+            await session.commit()
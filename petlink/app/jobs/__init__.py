@@ -0,0 +1,21 @@
+"""Background jobs for side effects that should not delay the request."""
+
+from app.jobs.queue import (
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    PRIORITY_NORMAL,
+    enqueue_job,
+    job_handler,
+    job_queue,
+)
+from app.jobs.status_scheduler import status_scheduler
+
+__all__ = [
+    "PRIORITY_HIGH",
+    "PRIORITY_LOW",
+    "PRIORITY_NORMAL",
+    "enqueue_job",
+    "job_handler",
+    "job_queue",
+    "status_scheduler",
+]
@@ -0,0 +1,257 @@
+"""
+In-process job queue.
+
+Jobs are rows in the ``jobs`` table, written in the same transaction as the
+change that caused them, and executed by a pool of asyncio workers. Delivery
+is at-least-once: a job is deleted only after its handler succeeds, failed
+attempts are retried with exponential backoff, and jobs left running by a
+crashed worker are handed out again after the visibility timeout.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import and_, delete, event, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import database
+from app.models.job import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_HIGH = 10
+PRIORITY_NORMAL = 0
+PRIORITY_LOW = -10
+
+MAX_RETRY_DELAY_SECONDS = 600
+
+JobHandler = Callable[[dict[str, Any]], Awaitable[None]]
+
+_handlers: dict[str, JobHandler] = {}
+
+# Session.info flag telling the after_commit hook to wake the workers.
+_ENQUEUED_FLAG = "jobs_enqueued"
+
+
+def job_handler(name: str) -> Callable[[JobHandler], JobHandler]:
+    """
+    Register an async function as the handler for jobs called ``name``.
+
+    Handlers receive the job payload and must be idempotent, since a job may
+    run more than once.
+    """
+    def register(func: JobHandler) -> JobHandler:
+        if name in _handlers:
+            raise ValueError(f"Job handler {name!r} is already registered")
+        _handlers[name] = func
+        return func
+    return register
+
+
+async def enqueue_job(
+    session: AsyncSession,
+    name: str,
+    payload: dict[str, Any],
+    priority: int = PRIORITY_NORMAL,
+    delay: timedelta | None = None,
+    max_attempts: int = 5,
+) -> Job:
+    """
+    Add a job to the caller's transaction.
+
+    The job becomes visible to workers when the caller commits, so it is
+    never run for a change that was rolled back.
+
+    Args:
+        session: Async SQLAlchemy session of the triggering change.
+        name: Registered handler name.
+        payload: JSON-serializable handler arguments.
+        priority: Higher values are claimed first.
+        delay: Earliest time to run, relative to now.
+        max_attempts: Attempts before the job is marked failed.
+
+    Returns:
+        The pending Job instance.
+    """
+    job = Job(
+        name=name,
+        payload=payload,
+        priority=priority,
+        max_attempts=max_attempts,
+        run_at=datetime.now(timezone.utc) + (delay or timedelta()),
+    )
+    session.add(job)
+    session.info[_ENQUEUED_FLAG] = True
+    return job
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_workers_after_commit(session: Session) -> None:
+    if session.info.pop(_ENQUEUED_FLAG, False):
+        job_queue.wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_enqueued_on_rollback(session: Session) -> None:
+    session.info.pop(_ENQUEUED_FLAG, None)
+
+
+class JobQueue:
+    """Pool of asyncio workers that claim and execute jobs from the database."""
+
+    def __init__(self):
+        self._workers: list[asyncio.Task] = []
+        self._wakeup: asyncio.Event | None = None
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def wake(self) -> None:
+        """Signal idle workers that new jobs may be available."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def start(self, workers: int | None = None) -> None:
+        """Start the worker tasks on the running event loop."""
+        if self._workers:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        count = workers if workers is not None else settings.job_workers
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"job-worker-{number}")
+            for number in range(count)
+        ]
+
+    async def stop(self, timeout: float | None = None) -> None:
+        """
+        Stop claiming jobs and wait for in-flight ones to finish.
+
+        Jobs still running after ``timeout`` are cancelled and returned to
+        the queue, to be picked up again after restart.
+        """
+        if not self._workers:
+            return
+        self._stopping = True
+        self.wake()
+        timeout = settings.job_drain_timeout_seconds if timeout is None else timeout
+        _, still_running = await asyncio.wait(self._workers, timeout=timeout)
+        for task in still_running:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._wakeup = None
+
+    async def _worker(self) -> None:
+        while not self._stopping:
+            try:
+                claimed = await self._claim()
+            except Exception:
+                logger.exception("Failed to claim a job")
+                claimed = None
+
+            if claimed is None:
+                await self._idle()
+                continue
+            await self._run(*claimed)
+
+    async def _idle(self) -> None:
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(
+                self._wakeup.wait(), timeout=settings.job_poll_interval_seconds
+            )
+        except asyncio.TimeoutError:
+            pass
+
+    async def _claim(self) -> tuple[int, str, dict[str, Any], int, int] | None:
+        now = datetime.now(timezone.utc)
+        lost_before = now - timedelta(seconds=settings.job_visibility_timeout_seconds)
+        async with database.AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(Job.id, Job.name, Job.payload, Job.attempts, Job.max_attempts)
+                .where(or_(
+                    and_(Job.status == JobStatus.pending, Job.run_at <= now),
+                    and_(Job.status == JobStatus.running, Job.locked_at < lost_before),
+                ))
+                .order_by(Job.priority.desc(), Job.run_at.asc(), Job.id.asc())
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            row = result.first()
+            if row is None:
+                return None
+            # Compare-and-set on attempts, so the claim is also safe on
+            # databases without SKIP LOCKED.
+            claimed = await session.execute(
+                update(Job)
+                .where(Job.id == row.id, Job.attempts == row.attempts)
+                .values(status=JobStatus.running, locked_at=now, attempts=row.attempts + 1)
+            )
+            await session.commit()
+            if claimed.rowcount != 1:
+                return None
+            return row.id, row.name, dict(row.payload), row.attempts + 1, row.max_attempts
+
+    async def _run(
+        self, job_id: int, name: str, payload: dict[str, Any], attempts: int, max_attempts: int
+    ) -> None:
+        handler = _handlers.get(name)
+        try:
+            if handler is None:
+                raise LookupError(f"No handler registered for job {name!r}")
+            await handler(payload)
+        except asyncio.CancelledError:
+            await self._release(job_id)
+            raise
+        except Exception as exc:
+            logger.exception("Job %s (%s) failed on attempt %s", job_id, name, attempts)
+            await self._fail(job_id, repr(exc), attempts, max_attempts, retry=handler is not None)
+        else:
+            async with database.AsyncSessionLocal() as session:
+                await session.execute(delete(Job).where(Job.id == job_id))
+                await session.commit()
+
+    async def _fail(
+        self, job_id: int, error: str, attempts: int, max_attempts: int, retry: bool
+    ) -> None:
+        if retry and attempts < max_attempts:
+            delay = min(2 ** attempts, MAX_RETRY_DELAY_SECONDS)
+            values = {
+                "status": JobStatus.pending,
+                "run_at": datetime.now(timezone.utc) + timedelta(seconds=delay),
+            }
+        else:
+            values = {"status": JobStatus.failed}
+        async with database.AsyncSessionLocal() as session:
+            await session.execute(
+                update(Job)
+                .where(Job.id == job_id)
+                .values(locked_at=None, last_error=error, **values)
+            )
+            await session.commit()
+
+    async def _release(self, job_id: int) -> None:
+        # Cancelled during shutdown: give the attempt back and requeue now.
+        async with database.AsyncSessionLocal() as session:
+            await session.execute(
+                update(Job)
+                .where(Job.id == job_id)
+                .values(
+                    status=JobStatus.pending,
+                    locked_at=None,
+                    attempts=Job.attempts - 1,
+                )
+            )
+            await session.commit()
+
+
+# Process-wide queue started and drained by the app lifespan
+job_queue = JobQueue()
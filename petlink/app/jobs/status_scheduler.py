@@ -0,0 +1,328 @@
+"""
+Scheduler for time-based care order status transitions.
+
+Every tick moves rows in chunks of set-based UPDATEs, each in its own short
+transaction: open orders whose start date has passed are canceled,
+in-progress orders past their end date are completed, and pending proposals
+of orders that are closed are canceled. Expired idempotency keys are purged
+along the way. Each tick is run by one process only: on PostgreSQL the
+leader holds an advisory lock while it sweeps.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, func, update
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.future import select
+
+from app.cache import CARE_ORDER, get_cache
+from app.core.config import settings
+from app.db import database
+from app.metrics import STATUS_SWEEP_ROWS
+from app.models.care_order import CareOrder, OrderStatus
+from app.models.idempotency_key import IdempotencyKey
+from app.models.proposal import Proposal, ProposalStatus
+from app.services.event_service import (
+    ORDER_STATUS_CHANGED,
+    PROPOSAL_UPDATED,
+    event_broker,
+)
+
+logger = logging.getLogger(__name__)
+
+# Key of the PostgreSQL advisory lock held by the sweeping process
+ADVISORY_LOCK_KEY = 0x7065_746C  # "petl"
+
+# SweepStats fields exported as status_sweep_rows_total{transition=...}
+TRANSITIONS = (
+    "orders_expired",
+    "orders_completed",
+    "proposals_canceled",
+    "idempotency_keys_purged",
+)
+
+# Orders whose pending proposals can no longer be accepted
+CLOSED_ORDER_STATUSES = (OrderStatus.completed, OrderStatus.canceled)
+
+
+@dataclass
+class SweepStats:
+    """Rows moved by the scheduler, per tick or in total."""
+    orders_expired: int = 0
+    orders_completed: int = 0
+    proposals_canceled: int = 0
+    idempotency_keys_purged: int = 0
+    duration_seconds: float = 0.0
+
+    @property
+    def rows_moved(self) -> int:
+        return (
+            self.orders_expired
+            + self.orders_completed
+            + self.proposals_canceled
+            + self.idempotency_keys_purged
+        )
+
+    def add(self, other: "SweepStats") -> None:
+        for field in fields(self):
+            setattr(self, field.name, getattr(self, field.name) + getattr(other, field.name))
+
+
+def _expire_open_orders(now: datetime, batch_size: int):
+    stale = (
+        select(CareOrder.id)
+        .where(CareOrder.status == OrderStatus.open, CareOrder.start_date < now)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    return (
+        update(CareOrder)
+        .where(CareOrder.id.in_(stale))
+        .values(status=OrderStatus.canceled)
+        .returning(CareOrder.id, CareOrder.owner_id, CareOrder.status)
+    )
+
+
+def _complete_finished_orders(now: datetime, batch_size: int):
+    finished = (
+        select(CareOrder.id)
+        .where(CareOrder.status == OrderStatus.in_progress, CareOrder.end_date < now)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    return (
+        update(CareOrder)
+        .where(CareOrder.id.in_(finished))
+        .values(status=OrderStatus.completed)
+        .returning(CareOrder.id, CareOrder.owner_id, CareOrder.status)
+    )
+
+
+def _cancel_orphaned_proposals(batch_size: int):
+    orphaned = (
+        select(Proposal.id)
+        .where(
+            Proposal.status == ProposalStatus.pending,
+            Proposal.order_id.in_(
+                select(CareOrder.id).where(CareOrder.status.in_(CLOSED_ORDER_STATUSES))
+            ),
+        )
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    return (
+        update(Proposal)
+        .where(Proposal.id.in_(orphaned))
+        .values(status=ProposalStatus.canceled)
+        .returning(
+            Proposal.id, Proposal.order_id, Proposal.petsitter_id, Proposal.price, Proposal.status
+        )
+    )
+
+
+def _purge_idempotency_keys(now: datetime, batch_size: int):
+    expired = (
+        select(IdempotencyKey.id)
+        .where(IdempotencyKey.expires_at < now)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    return (
+        delete(IdempotencyKey)
+        .where(IdempotencyKey.id.in_(expired))
+        .returning(IdempotencyKey.id)
+    )
+
+
+async def _run_in_chunks(
+    conn: AsyncConnection, make_statement, publish=None, cached_entity: str | None = None
+) -> int:
+    """
+    Execute a chunked UPDATE ... RETURNING until it moves less than a full chunk.
+
+    After each chunk commits, cached views of ``cached_entity`` with the
+    returned ids are invalidated and ``publish`` is awaited with the
+    connection and the returned rows.
+    """
+    batch_size = settings.status_scheduler_batch_size
+    moved = 0
+    while True:
+        rows = (await conn.execute(make_statement(batch_size))).all()
+        await conn.commit()
+        if cached_entity is not None and rows:
+            await get_cache().invalidate(cached_entity, *(row.id for row in rows))
+        if publish is not None and rows:
+            await publish(conn, rows)
+        moved += len(rows)
+        if len(rows) < batch_size:
+            return moved
+
+
+async def _publish_orders(conn: AsyncConnection, rows) -> None:
+    """Notify the owner and every petsitter who bid of each order's new status."""
+    result = await conn.execute(
+        select(Proposal.order_id, Proposal.petsitter_id)
+        .where(Proposal.order_id.in_([row.id for row in rows]))
+        .distinct()
+    )
+    bids = result.all()
+    # Do not hold the read transaction open into the next chunk
+    await conn.commit()
+    bidders: dict[int, set[int]] = {}
+    for order_id, petsitter_id in bids:
+        bidders.setdefault(order_id, set()).add(petsitter_id)
+    for row in rows:
+        event_broker.publish(
+            ORDER_STATUS_CHANGED,
+            {"order_id": row.id, "status": row.status.value},
+            {row.owner_id, *bidders.get(row.id, ())},
+        )
+
+
+async def _publish_proposals(conn: AsyncConnection, rows) -> None:
+    for row in rows:
+        event_broker.publish(
+            PROPOSAL_UPDATED,
+            {
+                "proposal_id": row.id,
+                "order_id": row.order_id,
+                "petsitter_id": row.petsitter_id,
+                "price": float(row.price),
+                "status": row.status.value,
+            },
+            [row.petsitter_id],
+        )
+
+
+async def sweep_order_statuses(conn: AsyncConnection, now: datetime | None = None) -> SweepStats:
+    """
+    Apply all time-based transitions that are due.
+
+    Args:
+        conn: Connection to run the updates on; committed after every chunk.
+        now: Reference time, defaults to the current UTC time.
+
+    Returns:
+        Number of rows moved by each transition.
+    """
+    now = now or datetime.now(timezone.utc)
+    stats = SweepStats()
+    stats.orders_expired = await _run_in_chunks(
+        conn, lambda size: _expire_open_orders(now, size), _publish_orders, CARE_ORDER
+    )
+    stats.orders_completed = await _run_in_chunks(
+        conn, lambda size: _complete_finished_orders(now, size), _publish_orders, CARE_ORDER
+    )
+    stats.proposals_canceled = await _run_in_chunks(
+        conn, _cancel_orphaned_proposals, _publish_proposals
+    )
+    stats.idempotency_keys_purged = await _run_in_chunks(
+        conn, lambda size: _purge_idempotency_keys(now, size)
+    )
+    return stats
+
+
+async def _try_lead(conn: AsyncConnection) -> bool:
+    if conn.dialect.name != "postgresql":
+        # No advisory locks; a single process is assumed.
+        return True
+    acquired = await conn.scalar(select(func.pg_try_advisory_lock(ADVISORY_LOCK_KEY)))
+    await conn.commit()
+    return bool(acquired)
+
+
+async def _resign(conn: AsyncConnection) -> None:
+    # Drop a chunk left open by a failed or cancelled sweep first.
+    await conn.rollback()
+    if conn.dialect.name == "postgresql":
+        await conn.scalar(select(func.pg_advisory_unlock(ADVISORY_LOCK_KEY)))
+        await conn.commit()
+
+
+class StatusScheduler:
+    """Periodically runs the status sweep in the process that wins the advisory lock."""
+
+    def __init__(self):
+        self._task: asyncio.Task | None = None
+        self._stopping: asyncio.Event | None = None
+        self.ticks = 0
+        self.last_tick: SweepStats | None = None
+        self.totals = SweepStats()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    async def start(self) -> None:
+        """Start ticking on the running event loop, unless disabled in settings."""
+        if self._task is not None or not settings.status_scheduler_enabled:
+            return
+        self._stopping = asyncio.Event()
+        self._task = asyncio.create_task(self._loop(), name="status-scheduler")
+
+    async def stop(self) -> None:
+        """Stop ticking, letting a sweep in progress finish its current work."""
+        if self._task is None:
+            return
+        self._stopping.set()
+        try:
+            await asyncio.wait_for(self._task, timeout=settings.job_drain_timeout_seconds)
+        except asyncio.TimeoutError:
+            # wait_for cancelled the sweep; the open chunk is rolled back.
+            pass
+        self._task = None
+        self._stopping = None
+
+    async def run_once(self, now: datetime | None = None) -> SweepStats | None:
+        """
+        Run one tick.
+
+        Returns:
+            Rows moved by this tick, or None if another process holds the lock.
+        """
+        started = time.perf_counter()
+        async with database.engine.connect() as conn:
+            if not await _try_lead(conn):
+                return None
+            try:
+                stats = await sweep_order_statuses(conn, now)
+            finally:
+                await _resign(conn)
+        stats.duration_seconds = time.perf_counter() - started
+
+        self.ticks += 1
+        self.last_tick = stats
+        self.totals.add(stats)
+        for transition in TRANSITIONS:
+            STATUS_SWEEP_ROWS.labels(transition).inc(getattr(stats, transition))
+        if stats.rows_moved:
+            logger.info(
+                "Status sweep moved %s rows in %.3fs "
+                "(orders expired: %s, orders completed: %s, proposals canceled: %s, "
+                "idempotency keys purged: %s)",
+                stats.rows_moved, stats.duration_seconds,
+                stats.orders_expired, stats.orders_completed, stats.proposals_canceled,
+                stats.idempotency_keys_purged,
+            )
+        return stats
+
+    async def _loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Status sweep failed")
+            try:
+                await asyncio.wait_for(
+                    self._stopping.wait(), timeout=settings.status_scheduler_interval_seconds
+                )
+            except asyncio.TimeoutError:
+                pass
+
+
+# Process-wide scheduler started and stopped by the app lifespan
+status_scheduler = StatusScheduler()
@@ -0,0 +1,18 @@
+"""
+Process startup and shutdown.
+
+On startup the lifespan fills the database pool and primes the hot
+statements before ``/health/ready`` reports ready. On shutdown it waits for
+in-flight requests before closing anything they might still use.
+"""
+
+from app.lifecycle.drain import DrainMiddleware, InFlightRequests, in_flight_requests
+from app.lifecycle.warmup import hot_queries, warm_up_database
+
+__all__ = [
+    "DrainMiddleware",
+    "InFlightRequests",
+    "hot_queries",
+    "in_flight_requests",
+    "warm_up_database",
+]
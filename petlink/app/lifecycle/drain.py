@@ -0,0 +1,58 @@
+"""Tracking of in-flight requests, so shutdown can wait for them."""
+
+import asyncio
+import logging
+import time
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+DRAIN_POLL_SECONDS = 0.05
+
+
+class InFlightRequests:
+    """Counts HTTP requests and WebSocket sessions being handled."""
+
+    def __init__(self):
+        self.count = 0
+
+    async def drain(self, timeout: float) -> bool:
+        """
+        Wait until no request is in flight, for at most ``timeout`` seconds.
+
+        Returns:
+            Whether all requests finished in time.
+        """
+        deadline = time.monotonic() + timeout
+        if self.count:
+            logger.info("Waiting for %s in-flight request(s)", self.count)
+        while self.count and time.monotonic() < deadline:
+            await asyncio.sleep(DRAIN_POLL_SECONDS)
+        if self.count:
+            logger.warning("Shutting down with %s request(s) still in flight", self.count)
+            return False
+        return True
+
+
+# Process-wide, shared by DrainMiddleware and the lifespan
+in_flight_requests = InFlightRequests()
+
+
+class DrainMiddleware:
+    """Counts requests in ``in_flight_requests`` while the app handles them."""
+
+    def __init__(self, app: ASGIApp, tracker: InFlightRequests = in_flight_requests):
+        self.app = app
+        self.tracker = tracker
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        self.tracker.count += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.tracker.count -= 1
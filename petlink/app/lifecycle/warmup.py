@@ -0,0 +1,67 @@
+"""Startup warmup of the database connection pool."""
+
+import logging
+import time
+from contextlib import AsyncExitStack
+
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from app.models.user import User, UserRole
+from app.services.care_order_service import build_care_orders_query
+from app.services.chat_service import build_messages_by_order_query
+from app.services.user_service import active_user_query
+
+logger = logging.getLogger(__name__)
+
+# No row has this ID, so warmup queries return nothing
+_MISSING_ID = 0
+
+
+def hot_queries() -> list[Select]:
+    """
+    Statements run by the most frequent requests, with their default options.
+
+    Built by the same functions the services use, so they share the services'
+    compiled cache entries and prepared statements.
+    """
+    owner = User(id=_MISSING_ID, role=UserRole.owner)
+    petsitter = User(id=_MISSING_ID, role=UserRole.petsitter)
+    return [
+        # get_user_by_token, behind every authenticated request
+        active_user_query(_MISSING_ID),
+        build_care_orders_query(owner),
+        build_care_orders_query(petsitter),
+        build_messages_by_order_query(_MISSING_ID),
+    ]
+
+
+async def _run_hot_queries(connection: AsyncConnection) -> None:
+    async with AsyncSession(bind=connection) as session:
+        for query in hot_queries():
+            await session.execute(query)
+
+
+async def warm_up_database(engine: AsyncEngine, connections: int) -> None:
+    """
+    Open pooled connections and run the hot queries on each of them.
+
+    The first request served by a cold process would otherwise pay for
+    connecting and authenticating, and for compiling each hot statement. All
+    connections are held at once, so ``connections`` distinct ones end up in
+    the pool. SQLAlchemy compiles every statement once; asyncpg prepares it
+    once per connection.
+
+    Args:
+        engine: Engine whose pool to fill.
+        connections: Number of connections to open, normally the pool size.
+    """
+    started = time.perf_counter()
+    async with AsyncExitStack() as stack:
+        opened = [await stack.enter_async_context(engine.connect()) for _ in range(connections)]
+        for connection in opened:
+            await _run_hot_queries(connection)
+    logger.info(
+        "Warmed up %s database connection(s) in %.0f ms",
+        connections, (time.perf_counter() - started) * 1000,
+    )
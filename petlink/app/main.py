@@ -1,12 +1,36 @@
+import time
+
+# Measured from here: importing the app's modules is most of a cold start.
+_import_started = time.perf_counter()
+
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware  # <-- импортируем CORS middleware
-from fastapi.staticfiles import StaticFiles
 from sqlalchemy.exc import IntegrityError
 
-from app.api import auth, users, care_orders, proposals, chat
+from app.api import auth, users, care_orders, proposals, chat, avatars, events, dashboard, health, metrics, pricing
+from app.availability import availability_filter
+from app.cache import close_cache
+from app.core.config import Settings, configure_settings, settings
+from app.db import database
+from app.feed import order_feed
+from app.jobs import job_queue, status_scheduler
+from app.idempotency import IdempotencyMiddleware
+from app.lifecycle import DrainMiddleware, in_flight_requests, warm_up_database
+from app.metrics import APP_STARTUP_SECONDS, MetricsMiddleware
+from app.pricing import price_guidance_refresher
+from app.profiling import ProfilingMiddleware
+from app.ratelimit import RateLimitMiddleware, close_rate_limit_store
+from app.services.event_service import event_broker
+from app.services.thumbnail_service import shutdown_thumbnail_pool
+from app.storage import close_avatar_storage
 
-app = FastAPI(title="PetLink API")
+logger = logging.getLogger(__name__)
+
+IMPORT_SECONDS = time.perf_counter() - _import_started
 
 # Разрешённые источники (React dev сервер)
 origins = [
@@ -14,29 +38,69 @@ origins = [
     "http://127.0.0.1:3000",
 ]
 
-# Подключаем CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,          # разрешаем запросы с этих адресов
-    allow_credentials=True,
-    allow_methods=["*"],            # разрешаем все методы (GET, POST, и т.д.)
-    allow_headers=["*"],            # разрешаем все заголовки
-)
 
-app.include_router(auth.router)
-app.include_router(users.router)
-app.include_router(care_orders.router)
-app.include_router(proposals.router)
-app.include_router(chat.router)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create per-process resources on startup and release them on shutdown."""
+    started = time.perf_counter()
+    # Tooling such as the benchmarks may bind its own engine first.
+    owns_engine = database.engine is None
+    if owns_engine:
+        database.init_engine()
+    if settings.database_warmup_enabled:
+        try:
+            await warm_up_database(database.engine, settings.database_pool_size)
+        except Exception:
+            # Requests connect on demand; a cold pool only makes them slower.
+            logger.exception("Database warmup failed")
+    await job_queue.start()
+    await status_scheduler.start()
+    await availability_filter.start()
+    await price_guidance_refresher.start()
+    await order_feed.start()
+    app.state.ready = True
+    _report_startup(app, time.perf_counter() - started)
+    yield
+    app.state.ready = False
+    # Event streams never end by themselves; close them so they do not hold
+    # up the drain. uvicorn has already waited for open connections, but
+    # requests it cancelled after --timeout-graceful-shutdown may still be
+    # unwinding.
+    event_broker.close_all()
+    await in_flight_requests.drain(settings.shutdown_drain_timeout_seconds)
+    await order_feed.stop()
+    await price_guidance_refresher.stop()
+    await availability_filter.stop()
+    await status_scheduler.stop()
+    # Drain in-flight jobs before tearing down what they use.
+    await job_queue.stop()
+    shutdown_thumbnail_pool()
+    await close_avatar_storage()
+    await close_rate_limit_store()
+    await close_cache()
+    if owns_engine:
+        await database.dispose_engine()
+
+
+def _report_startup(app: FastAPI, lifespan_seconds: float) -> None:
+    timings = {**app.state.startup_seconds, "lifespan": lifespan_seconds}
+    app.state.startup_seconds = timings
+    for phase, seconds in timings.items():
+        APP_STARTUP_SECONDS.labels(phase).set(seconds)
+    logger.info(
+        "Started in %.0f ms (import %.0f ms, create_app %.0f ms, lifespan %.0f ms)",
+        sum(timings.values()) * 1000,
+        timings["import"] * 1000,
+        timings["create_app"] * 1000,
+        timings["lifespan"] * 1000,
+    )
 
 
-@app.get("/")
 async def root():
     """Root endpoint returning a welcome message."""
     return {"message": "Welcome to PetLink API!"}
 
 
-@app.exception_handler(IntegrityError)
 async def integrity_error_handler(request: Request, exc: IntegrityError):
     """
     Global exception handler for SQLAlchemy IntegrityError.
@@ -59,4 +123,78 @@ async def integrity_error_handler(request: Request, exc: IntegrityError):
     )
 
 
-app.mount("/static", StaticFiles(directory="static"), name="static")
\ No newline at end of file
+def create_app(app_settings: Settings | None = None) -> FastAPI:
+    """
+    Build the PetLink application.
+
+    Neither settings nor the database are touched here: the engine and the
+    other per-process resources are created in the lifespan. The app can
+    therefore be built once and preloaded before workers fork, and tools can
+    import it without a database.
+
+    Args:
+        app_settings: Settings to install, instead of loading them from the
+            environment on first use.
+
+    Returns:
+        The configured application.
+    """
+    started = time.perf_counter()
+    if app_settings is not None:
+        configure_settings(app_settings)
+
+    app = FastAPI(title="PetLink API", lifespan=lifespan)
+
+    # Retries replayed from stored responses still count against rate limits
+    app.add_middleware(IdempotencyMiddleware)
+    # Rate limiting runs inside CORS, so 429 responses carry CORS headers
+    app.add_middleware(RateLimitMiddleware)
+
+    # Подключаем CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=origins,          # разрешаем запросы с этих адресов
+        allow_credentials=True,
+        allow_methods=["*"],            # разрешаем все методы (GET, POST, и т.д.)
+        allow_headers=["*"],            # разрешаем все заголовки
+    )
+
+    # Profiles cover everything the request goes through, except metrics
+    app.add_middleware(ProfilingMiddleware)
+
+    # Shutdown waits for requests counted here before closing the engine
+    app.add_middleware(DrainMiddleware)
+
+    # Outermost, so rejected and failed requests are measured too
+    app.add_middleware(MetricsMiddleware)
+
+    app.include_router(auth.router)
+    app.include_router(users.router)
+    app.include_router(care_orders.router)
+    app.include_router(proposals.router)
+    app.include_router(chat.router)
+    app.include_router(avatars.router)
+    app.include_router(events.router)
+    app.include_router(dashboard.router)
+    app.include_router(pricing.router)
+    app.include_router(metrics.router)
+    app.include_router(health.router)
+
+    app.add_api_route("/", root, methods=["GET"])
+    app.add_exception_handler(IntegrityError, integrity_error_handler)
+
+    # Set by the lifespan once startup, including the warmup, has finished
+    app.state.ready = False
+    app.state.startup_seconds = {
+        "import": IMPORT_SECONDS,
+        "create_app": time.perf_counter() - started,
+    }
+    return app
+
+
+def __getattr__(name: str):
+    # `uvicorn app.main:app` keeps working; the app is built on first access.
+    if name == "app":
+        app = globals()["app"] = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,38 @@
+"""
+Prometheus metrics.
+
+Collectors live in the default registry and are exposed at ``/metrics``.
+Importing this package also installs the database statement listeners.
+"""
+
+from app.metrics.collectors import (
+    APP_STARTUP_SECONDS,
+    AVAILABILITY_CHECKS,
+    CACHE_REQUESTS,
+    DB_POOL_CHECKOUT_WAIT,
+    DB_STATEMENT_DURATION,
+    EVENT_STREAM_CONNECTIONS,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_FLIGHT,
+    PASSWORD_HASH_QUEUE_DEPTH,
+    STATUS_SWEEP_ROWS,
+)
+from app.metrics.db import InstrumentedAsyncQueuePool
+from app.metrics.middleware import MetricsMiddleware
+
+__all__ = [
+    "APP_STARTUP_SECONDS",
+    "AVAILABILITY_CHECKS",
+    "CACHE_REQUESTS",
+    "DB_POOL_CHECKOUT_WAIT",
+    "DB_STATEMENT_DURATION",
+    "EVENT_STREAM_CONNECTIONS",
+    "HTTP_REQUEST_DURATION",
+    "HTTP_REQUESTS",
+    "HTTP_REQUESTS_IN_FLIGHT",
+    "InstrumentedAsyncQueuePool",
+    "MetricsMiddleware",
+    "PASSWORD_HASH_QUEUE_DEPTH",
+    "STATUS_SWEEP_ROWS",
+]
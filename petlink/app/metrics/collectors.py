@@ -0,0 +1,68 @@
+"""Prometheus collectors shared across the app."""
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# Latency buckets in seconds, from cache hits to slow bcrypt-bound requests
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route template and status code.",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last byte of its response.",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being handled.",
+)
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a database connection from the pool.",
+    buckets=LATENCY_BUCKETS,
+)
+DB_STATEMENT_DURATION = Histogram(
+    "db_statement_duration_seconds",
+    "Database statement execution time by SQL verb.",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth",
+    "bcrypt hash/verify calls waiting for a free executor thread.",
+)
+
+EVENT_STREAM_CONNECTIONS = Gauge(
+    "event_stream_connections",
+    "Open Server-Sent Events connections.",
+)
+
+STATUS_SWEEP_ROWS = Counter(
+    "status_sweep_rows_total",
+    "Rows moved by the status scheduler, by transition.",
+    ["transition"],
+)
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by view and result: hit, miss, or coalesced into a concurrent miss.",
+    ["view", "result"],
+)
+
+AVAILABILITY_CHECKS = Counter(
+    "availability_checks_total",
+    "Username and email availability checks by field and by what answered them: filter or database.",
+    ["field", "source"],
+)
+
+APP_STARTUP_SECONDS = Gauge(
+    "app_startup_seconds",
+    "Cold start time of this process, by phase: import, create_app, lifespan.",
+    ["phase"],
+)
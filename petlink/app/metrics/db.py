@@ -0,0 +1,50 @@
+"""Database instrumentation: pool checkout wait and statement latency."""
+
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.metrics.collectors import DB_POOL_CHECKOUT_WAIT, DB_STATEMENT_DURATION
+
+_OPERATIONS = ("SELECT", "INSERT", "UPDATE", "DELETE")
+_statement_timers = {
+    operation: DB_STATEMENT_DURATION.labels(operation) for operation in _OPERATIONS
+}
+_other_statement_timer = DB_STATEMENT_DURATION.labels("OTHER")
+
+_STARTED_KEY = "statement_started"
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool recording how long each checkout waited."""
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_STARTED_KEY, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _stop_statement_timer(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info[_STARTED_KEY].pop()
+    operation = statement.lstrip()[:6].upper()
+    _statement_timers.get(operation, _other_statement_timer).observe(
+        time.perf_counter() - started
+    )
+
+
+@event.listens_for(Engine, "handle_error")
+def _drop_statement_timer(context):
+    # after_cursor_execute does not fire for failed statements.
+    timers = context.connection.info.get(_STARTED_KEY) if context.connection else None
+    if timers:
+        timers.pop()
@@ -0,0 +1,70 @@
+"""ASGI middleware recording per-route HTTP metrics."""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics.collectors import (
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_FLIGHT,
+)
+
+# Requests that matched no route share one label value, so unknown
+# paths cannot blow up the number of series.
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    Count requests and time responses per route template.
+
+    Routes are labelled with their template (``/care_orders/{order_id}``),
+    read from the route FastAPI matched. Label children are bound once per
+    label combination and reused, so recording is a dict lookup plus the
+    observation itself.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._counters: dict[tuple[str, str, int], object] = {}
+        self._timers: dict[tuple[str, str], object] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            self._record(scope, status_code, time.perf_counter() - started)
+
+    def _record(self, scope: Scope, status_code: int, duration: float) -> None:
+        route = scope.get("route")
+        template = getattr(route, "path", UNMATCHED_ROUTE)
+        method = scope["method"]
+
+        counter = self._counters.get((method, template, status_code))
+        if counter is None:
+            counter = self._counters[(method, template, status_code)] = HTTP_REQUESTS.labels(
+                method, template, str(status_code)
+            )
+        timer = self._timers.get((method, template))
+        if timer is None:
+            timer = self._timers[(method, template)] = HTTP_REQUEST_DURATION.labels(
+                method, template
+            )
+        counter.inc()
+        timer.observe(duration)
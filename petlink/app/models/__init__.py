@@ -4,6 +4,10 @@ from .user import User
 from .care_order import CareOrder
 from .proposal import Proposal
 from .message import Message
+from .avatar_blob import AvatarBlob
+from .job import Job
+from .idempotency_key import IdempotencyKey
+from .price_guidance import PriceGuidance, PriceGuidanceChange
 
 __all__ = [
     "Base",
@@ -11,4 +15,9 @@ __all__ = [
     "CareOrder",
     "Proposal",
     "Message",
+    "AvatarBlob",
+    "Job",
+    "IdempotencyKey",
+    "PriceGuidance",
+    "PriceGuidanceChange",
 ]
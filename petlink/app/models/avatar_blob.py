@@ -0,0 +1,21 @@
+"""AvatarBlob model tracking content-addressed avatar files."""
+
+from sqlalchemy import Column, Integer, String, DateTime
+from app.models.base import Base
+from datetime import datetime, timezone
+
+
+class AvatarBlob(Base):
+    """A stored avatar file, shared by every user who uploaded the same bytes."""
+    __tablename__ = "avatar_blobs"
+
+    digest = Column(String(64), primary_key=True)  # SHA-256 hex of the file
+    extension = Column(String(10), nullable=False)
+
+    # Number of users whose avatar_url points at this file
+    refcount = Column(Integer, default=0, nullable=False)
+
+    created_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc)
+    )
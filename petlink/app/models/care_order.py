@@ -1,6 +1,6 @@
 """CareOrder model representing a pet care order."""
 
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, Index
 from sqlalchemy.orm import relationship
 from app.models.base import Base
 import enum
@@ -36,5 +36,18 @@ class CareOrder(Base):
         DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc)
     )
+    # Bumped by every ORM or bulk UPDATE; the order feed polls it for changes
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
 
     owner = relationship("User", backref="care_orders")
+
+    # Status sweeps of the scheduler look orders up by status and date
+    __table_args__ = (
+        Index("ix_care_orders_status_start_date", "status", "start_date"),
+        Index("ix_care_orders_status_end_date", "status", "end_date"),
+        Index("ix_care_orders_updated_at", "updated_at"),
+    )
@@ -0,0 +1,51 @@
+"""IdempotencyKey model storing the outcome of a client-keyed request."""
+
+from sqlalchemy import (Column,
+                        Integer,
+                        String,
+                        DateTime,
+                        JSON,
+                        LargeBinary,
+                        UniqueConstraint,
+                        Index)
+from app.models.base import Base
+from datetime import datetime, timezone
+
+
+class IdempotencyKey(Base):
+    """
+    A request sent with an ``Idempotency-Key`` header.
+
+    The row is inserted before the request runs, so concurrent duplicates see
+    it and wait; the response is filled in once the request has succeeded.
+    """
+    __tablename__ = "idempotency_keys"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    key = Column(String(255), nullable=False)
+
+    method = Column(String(10), nullable=False)
+    path = Column(String(255), nullable=False)
+    # SHA-256 of method, path and body; a reused key must repeat the request
+    request_hash = Column(String(64), nullable=False)
+
+    # Null while the first request is still running
+    status_code = Column(Integer, nullable=True)
+    response_headers = Column(JSON, nullable=True)
+    response_body = Column(LargeBinary, nullable=True)
+
+    created_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    # Pushed forward by the worker running the request; once it passes, the
+    # worker is assumed lost and the key may be claimed again
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "key", name="uq_idempotency_keys_user_id_key"),
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
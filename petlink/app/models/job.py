@@ -0,0 +1,49 @@
+"""Job model representing a unit of deferred background work."""
+
+from sqlalchemy import Column, Integer, String, DateTime, Enum, Text, JSON, Index
+from app.models.base import Base
+import enum
+from datetime import datetime, timezone
+
+
+class JobStatus(enum.Enum):
+    """Enumeration for job status."""
+    pending = "pending"
+    running = "running"
+    failed = "failed"
+
+
+class Job(Base):
+    """
+    A queued side effect, stored so it survives restarts and can be retried.
+
+    Finished jobs are deleted; jobs that used up their attempts stay as failed.
+    """
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), nullable=False)
+    payload = Column(JSON, nullable=False, default=dict)
+
+    # Higher priority jobs are claimed first
+    priority = Column(Integer, default=0, nullable=False)
+    status = Column(Enum(JobStatus), default=JobStatus.pending, nullable=False)
+
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=5, nullable=False)
+    last_error = Column(Text, nullable=True)
+
+    run_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc)
+    )
+
+    __table_args__ = (
+        Index("ix_jobs_claim", "status", "priority", "run_at"),
+    )
@@ -0,0 +1,37 @@
+"""Precomputed proposal price percentiles by owner city and order duration."""
+
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime
+from app.models.base import Base
+
+
+class PriceGuidance(Base):
+    """
+    Price percentiles of the proposals made for one bucket of care orders.
+
+    Orders are bucketed by their owner's city and by duration; rows are
+    recomputed by the price guidance refresher, never written by requests.
+    """
+    __tablename__ = "price_guidance"
+
+    city = Column(Text, primary_key=True)
+    duration_bucket = Column(String(10), primary_key=True)
+
+    # Proposals the percentiles were computed from
+    sample_count = Column(Integer, nullable=False)
+
+    price_p10 = Column(Float, nullable=False)
+    price_p25 = Column(Float, nullable=False)
+    price_p50 = Column(Float, nullable=False)
+    price_p75 = Column(Float, nullable=False)
+    price_p90 = Column(Float, nullable=False)
+
+    refreshed_at = Column(DateTime(timezone=True), nullable=False)
+
+
+class PriceGuidanceChange(Base):
+    """A bucket whose proposals changed since the last price guidance refresh."""
+    __tablename__ = "price_guidance_changes"
+
+    id = Column(Integer, primary_key=True)
+    city = Column(Text, nullable=False)
+    duration_bucket = Column(String(10), nullable=False)
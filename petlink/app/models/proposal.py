@@ -6,7 +6,8 @@ from sqlalchemy import (Column,
                         ForeignKey,
                         DateTime,
                         Enum,
-                        Float)
+                        Float,
+                        Index)
 from sqlalchemy.orm import relationship
 from app.models.base import Base
 import enum
@@ -42,3 +43,12 @@ class Proposal(Base):
     # Relationships
     order = relationship("CareOrder", backref="proposals")
     petsitter = relationship("User", backref="proposals")
+
+    __table_args__ = (
+        Index("ix_proposals_status_order_id", "status", "order_id"),
+        # Bids of one order and proposals of one sitter, in listing order
+        Index("ix_proposals_order_id_id", "order_id", "id"),
+        Index("ix_proposals_petsitter_id_id", "petsitter_id", "id"),
+        # New bids since the order feed's last refresh
+        Index("ix_proposals_created_at", "created_at"),
+    )
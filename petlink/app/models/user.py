@@ -31,6 +31,8 @@ class User(Base):
     is_deleted = Column(Boolean, default=False, nullable=False)
 
     avatar_url = Column(Text, nullable=True)
+    # Set by the thumbnail pipeline once resized variants exist on disk
+    avatar_variants_ready = Column(Boolean, default=False, nullable=False)
     bio = Column(Text, nullable=True)
     pets = Column(Text, nullable=True)
     experience = Column(Text, nullable=True)
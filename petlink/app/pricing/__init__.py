@@ -0,0 +1,24 @@
+"""
+Price guidance for care orders.
+
+Percentiles of proposal prices are precomputed per owner city and order
+duration bucket into the price_guidance table. Writes that change them mark
+their buckets, and a background refresher recomputes only those.
+"""
+
+from app.pricing.buckets import DURATION_BUCKETS, LONGEST_BUCKET, PERCENTILES, duration_bucket
+from app.pricing.refresher import (
+    PriceGuidanceRefresher,
+    mark_price_guidance_stale,
+    price_guidance_refresher,
+)
+
+__all__ = [
+    "DURATION_BUCKETS",
+    "LONGEST_BUCKET",
+    "PERCENTILES",
+    "PriceGuidanceRefresher",
+    "duration_bucket",
+    "mark_price_guidance_stale",
+    "price_guidance_refresher",
+]
@@ -0,0 +1,56 @@
+"""Order duration buckets and percentiles, in Python and in SQL."""
+
+import math
+from datetime import datetime
+from typing import Sequence
+
+from sqlalchemy import ColumnElement, case, extract, func
+
+from app.models.care_order import CareOrder
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+# Longest duration of each bucket in days, inclusive, and the bucket's name;
+# longer orders fall into LONGEST_BUCKET
+DURATION_BUCKETS = (
+    (1, "0-1d"),
+    (3, "1-3d"),
+    (7, "3-7d"),
+    (14, "7-14d"),
+)
+LONGEST_BUCKET = "14d+"
+
+# Percentiles stored per bucket, as PriceGuidance.price_p<N> columns
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def duration_bucket(start_date: datetime, end_date: datetime) -> str:
+    """Name the duration bucket of an order running from start_date to end_date."""
+    seconds = (end_date - start_date).total_seconds()
+    for days, name in DURATION_BUCKETS:
+        if seconds <= days * SECONDS_PER_DAY:
+            return name
+    return LONGEST_BUCKET
+
+
+def duration_bucket_column(dialect_name: str) -> ColumnElement[str]:
+    """SQL expression computing duration_bucket() of CareOrder rows."""
+    if dialect_name == "postgresql":
+        seconds = extract("epoch", CareOrder.end_date - CareOrder.start_date)
+    else:
+        # SQLite keeps datetimes as text; julianday() parses them.
+        seconds = (func.julianday(CareOrder.end_date) - func.julianday(CareOrder.start_date)) * SECONDS_PER_DAY
+    return case(
+        *((seconds <= days * SECONDS_PER_DAY, name) for days, name in DURATION_BUCKETS),
+        else_=LONGEST_BUCKET,
+    )
+
+
+def percentile(values: Sequence[float], percent: float) -> float:
+    """
+    Interpolated percentile of sorted values, matching Postgres' percentile_cont.
+    """
+    position = (len(values) - 1) * percent / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
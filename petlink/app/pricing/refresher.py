@@ -0,0 +1,201 @@
+"""Incremental refresh of the price_guidance table."""
+
+import asyncio
+import itertools
+import logging
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, func, insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db import database
+from app.models.care_order import CareOrder
+from app.models.price_guidance import PriceGuidance, PriceGuidanceChange
+from app.models.proposal import Proposal
+from app.models.user import User
+from app.pricing.buckets import PERCENTILES, duration_bucket_column, percentile
+
+logger = logging.getLogger(__name__)
+
+# Held for the refresh transaction, so one worker refreshes at a time
+ADVISORY_LOCK_KEY = 0x7072_6963  # "pric"
+
+Bucket = tuple[str, str]
+
+
+async def mark_price_guidance_stale(session: AsyncSession, *criteria) -> None:
+    """
+    Queue the buckets of matching care orders for the next refresh.
+
+    Call in the transaction of a change to proposal prices, or to anything
+    that decides an order's bucket. Changes that can move orders to another
+    bucket (dates, the owner's city) must be marked before and after they
+    are applied, so both the old and the new bucket are recomputed.
+
+    Args:
+        session: Async SQLAlchemy session of the change.
+        criteria: Conditions on CareOrder and its owner User selecting the
+            orders concerned.
+    """
+    bucket = duration_bucket_column(session.bind.dialect.name)
+    has_proposals = select(Proposal.id).where(Proposal.order_id == CareOrder.id).exists()
+    await session.execute(
+        insert(PriceGuidanceChange).from_select(
+            ["city", "duration_bucket"],
+            select(User.city, bucket)
+            .distinct()
+            .select_from(CareOrder)
+            .join(User, User.id == CareOrder.owner_id)
+            .where(User.city.is_not(None), has_proposals, *criteria),
+        )
+    )
+
+
+class PriceGuidanceRefresher:
+    """
+    Periodically recomputes the price guidance of buckets with changes.
+
+    Every proposal counts, whatever its status, so the bulk status sweeps
+    never move a bucket; only the writes calling mark_price_guidance_stale()
+    do. While the table is empty, as after the migration, a refresh
+    aggregates all proposals instead.
+    """
+
+    def __init__(self):
+        self._task: asyncio.Task | None = None
+        self._stopping: asyncio.Event | None = None
+
+    async def refresh(self) -> int:
+        """
+        Recompute the buckets marked since the last refresh.
+
+        Returns:
+            The number of buckets recomputed.
+        """
+        started = time.perf_counter()
+        async with database.AsyncSessionLocal() as session:
+            dialect = session.bind.dialect.name
+            if dialect == "postgresql" and not await session.scalar(
+                select(func.pg_try_advisory_xact_lock(ADVISORY_LOCK_KEY))
+            ):
+                # Another worker is refreshing right now.
+                return 0
+
+            # Claiming the marks by deleting them leaves those committed
+            # meanwhile for the next run.
+            result = await session.execute(
+                delete(PriceGuidanceChange).returning(
+                    PriceGuidanceChange.city, PriceGuidanceChange.duration_bucket
+                )
+            )
+            touched: set[Bucket] | None = set(result.tuples())
+            if await session.scalar(select(PriceGuidance.city).limit(1)) is None:
+                touched = None
+            elif not touched:
+                await session.commit()
+                return 0
+
+            rows = await _aggregate(session, dialect, touched)
+            stale = delete(PriceGuidance)
+            if touched is not None:
+                stale = stale.where(tuple_(PriceGuidance.city, PriceGuidance.duration_bucket).in_(touched))
+            await session.execute(stale)
+            if rows:
+                await session.execute(insert(PriceGuidance), rows)
+            await session.commit()
+
+        count = len(rows) if touched is None else len(touched)
+        logger.info(
+            "Price guidance refreshed for %s bucket(s)%s in %.3fs",
+            count, "" if touched is not None else " (full)", time.perf_counter() - started,
+        )
+        return count
+
+    async def start(self) -> None:
+        """Start refreshing periodically, unless disabled."""
+        if self._task is not None or not settings.price_guidance_enabled:
+            return
+        self._stopping = asyncio.Event()
+        self._task = asyncio.create_task(self._loop(), name="price-guidance-refresher")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stopping.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._stopping = None
+
+    async def _loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Price guidance refresh failed")
+            try:
+                await asyncio.wait_for(
+                    self._stopping.wait(), timeout=settings.price_guidance_refresh_seconds
+                )
+            except asyncio.TimeoutError:
+                pass
+
+
+async def _aggregate(session: AsyncSession, dialect: str, touched: set[Bucket] | None) -> list[dict]:
+    """Compute PriceGuidance rows for the touched buckets, or all if None."""
+    samples = (
+        select(
+            User.city.label("city"),
+            duration_bucket_column(dialect).label("duration_bucket"),
+            Proposal.price.label("price"),
+        )
+        .select_from(Proposal)
+        .join(CareOrder, CareOrder.id == Proposal.order_id)
+        .join(User, User.id == CareOrder.owner_id)
+        .where(User.city.is_not(None))
+    )
+    if touched is not None:
+        samples = samples.where(User.city.in_({city for city, _ in touched}))
+    samples = samples.subquery()
+    bucket = (samples.c.city, samples.c.duration_bucket)
+
+    if dialect == "postgresql":
+        query = select(
+            *bucket,
+            func.count(),
+            *(func.percentile_cont(percent / 100).within_group(samples.c.price) for percent in PERCENTILES),
+        ).group_by(*bucket)
+        if touched is not None:
+            query = query.where(tuple_(*bucket).in_(touched))
+        result = await session.execute(query)
+        aggregates = [(city, name, count, prices) for city, name, count, *prices in result]
+    else:
+        query = select(*bucket, samples.c.price).order_by(*bucket, samples.c.price)
+        result = await session.execute(query)
+        aggregates = []
+        for (city, name), group in itertools.groupby(result, key=lambda row: (row[0], row[1])):
+            if touched is not None and (city, name) not in touched:
+                continue
+            prices = [row[2] for row in group]
+            aggregates.append((city, name, len(prices), [percentile(prices, p) for p in PERCENTILES]))
+
+    refreshed_at = datetime.now(timezone.utc)
+    return [
+        {
+            "city": city,
+            "duration_bucket": name,
+            "sample_count": count,
+            **{f"price_p{percent}": round(price, 2) for percent, price in zip(PERCENTILES, prices)},
+            "refreshed_at": refreshed_at,
+        }
+        for city, name, count, prices in aggregates
+    ]
+
+
+# Process-wide refresher started and stopped by the app lifespan
+price_guidance_refresher = PriceGuidanceRefresher()
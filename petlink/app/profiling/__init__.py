@@ -0,0 +1,18 @@
+"""
+Per-request sampling profiler.
+
+Selected requests are sampled from a background thread and written as
+collapsed stacks, ready for ``flamegraph.pl`` or speedscope. Print a
+profiling token for the ``X-Profile`` header with::
+
+    python -m app.profiling [minutes]
+"""
+
+from app.profiling.middleware import ProfilingMiddleware
+from app.profiling.sampler import RequestProfile, StackSampler
+
+__all__ = [
+    "ProfilingMiddleware",
+    "RequestProfile",
+    "StackSampler",
+]
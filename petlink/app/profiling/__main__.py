@@ -0,0 +1,10 @@
+"""Print a token that enables profiling of requests sending it in ``X-Profile``."""
+
+import sys
+from datetime import timedelta
+
+from app.core.security import create_profiling_token
+
+if __name__ == "__main__":
+    minutes = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    print(create_profiling_token(timedelta(minutes=minutes)))
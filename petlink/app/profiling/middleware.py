@@ -0,0 +1,115 @@
+"""ASGI middleware profiling sampled or explicitly requested requests."""
+
+import asyncio
+import logging
+import random
+import re
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.security import verify_profiling_token
+from app.profiling.sampler import RequestProfile, StackSampler
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+
+def _route_slug(scope: Scope) -> str:
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    return re.sub(r"[^A-Za-z0-9]+", "_", route.path).strip("_") or "root"
+
+
+class ProfilingMiddleware:
+    """
+    Sample the stacks of selected requests and write them as flamegraph input.
+
+    A request is profiled when it carries a valid ``X-Profile`` token (see
+    ``create_profiling_token``) or is picked at ``profiling_sample_rate``.
+    Its stacks are written in the collapsed format to
+    ``profiling_output_dir``, in a file named after the method, route
+    template, duration and the id returned in ``X-Profile-Id``. Requests
+    that are not profiled only pay for the header check.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rate: float | None = None,
+        output_dir: str | None = None,
+        interval: float | None = None,
+    ):
+        self.app = app
+        self._sample_rate = settings.profiling_sample_rate if sample_rate is None else sample_rate
+        self._output_dir = Path(settings.profiling_output_dir if output_dir is None else output_dir)
+        self._sampler = StackSampler(
+            settings.profiling_interval_seconds if interval is None else interval
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._selected(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex[:12]
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", []).append((PROFILE_ID_HEADER, profile_id.encode()))
+            await send(message)
+
+        coro = self.app(scope, receive, send_wrapper)
+        profile = self._sampler.start(coro)
+        started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        try:
+            await coro
+        finally:
+            duration = time.perf_counter() - started
+            self._sampler.stop(profile)
+            # The response is already out; write the file off the loop.
+            asyncio.get_running_loop().run_in_executor(
+                None, self._write, scope, profile, profile_id, started_at, duration
+            )
+
+    def _selected(self, scope: Scope) -> bool:
+        if self._sample_rate and random.random() < self._sample_rate:
+            return True
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                return verify_profiling_token(value.decode("latin-1"))
+        return False
+
+    def _write(
+        self,
+        scope: Scope,
+        profile: RequestProfile,
+        profile_id: str,
+        started_at: datetime,
+        duration: float,
+    ) -> None:
+        name = "{}-{}-{}-{}ms-{}.collapsed".format(
+            started_at.strftime("%Y%m%dT%H%M%S"),
+            scope["method"],
+            _route_slug(scope),
+            round(duration * 1000),
+            profile_id,
+        )
+        try:
+            self._output_dir.mkdir(parents=True, exist_ok=True)
+            (self._output_dir / name).write_text(profile.collapsed())
+        except OSError:
+            logger.exception("Failed to write profile %s", name)
+            return
+        logger.info(
+            "Profiled %s %s in %.1f ms (%s samples): %s",
+            scope["method"], scope["path"], duration * 1000, profile.samples, name,
+        )
@@ -0,0 +1,124 @@
+"""Wall-clock stack sampler for individual requests on an event loop."""
+
+import sys
+import threading
+import time
+from collections import Counter
+from types import CodeType, CoroutineType, FrameType
+
+# Pseudo-frames closing stacks the sampler cannot see into
+AWAITING_FRAME = "<awaiting>"
+GREENLET_FRAME = "<greenlet>"
+
+_labels: dict[CodeType, str] = {}
+
+
+def _label(frame: FrameType) -> str:
+    code = frame.f_code
+    label = _labels.get(code)
+    if label is None:
+        module = frame.f_globals.get("__name__", "?")
+        label = _labels[code] = f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+    return label
+
+
+def _running_stack(frame: FrameType | None, root: FrameType) -> list[str]:
+    """Frames from ``root`` down to the frame the loop thread is executing."""
+    labels = []
+    while frame is not None:
+        labels.append(_label(frame))
+        if frame is root:
+            labels.reverse()
+            return labels
+        frame = frame.f_back
+    # SQLAlchemy runs sync ORM code inside a greenlet, whose frames do not
+    # link back to the coroutine that is waiting for it.
+    labels.append(GREENLET_FRAME)
+    labels.append(_label(root))
+    labels.reverse()
+    return labels
+
+
+def _awaiting_stack(coro: CoroutineType) -> list[str]:
+    """Frames of a suspended coroutine, following what each one awaits."""
+    labels = []
+    awaited = coro
+    while isinstance(awaited, CoroutineType) and awaited.cr_frame is not None:
+        labels.append(_label(awaited.cr_frame))
+        awaited = awaited.cr_await
+    if labels:
+        labels.append(AWAITING_FRAME)
+    return labels
+
+
+class RequestProfile:
+    """Stacks sampled while one request was running or suspended."""
+
+    def __init__(self, coro: CoroutineType, thread_id: int):
+        self.coro = coro
+        self.thread_id = thread_id
+        self.stacks: Counter[str] = Counter()
+
+    @property
+    def samples(self) -> int:
+        return sum(self.stacks.values())
+
+    def sample(self, thread_frame: FrameType | None) -> None:
+        coro = self.coro
+        if coro.cr_running:
+            labels = _running_stack(thread_frame, coro.cr_frame)
+        else:
+            labels = _awaiting_stack(coro)
+        if labels:
+            self.stacks[";".join(labels)] += 1
+
+    def collapsed(self) -> str:
+        """Return the stacks in the collapsed format read by flamegraph tools."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class StackSampler:
+    """
+    Sample the stacks of registered requests from a background thread.
+
+    Each tick looks at every registered request: if its coroutine is on
+    the loop thread, that thread's stack is recorded; otherwise the chain
+    of coroutines it is suspended in, ending in ``<awaiting>``. Time spent
+    waiting on the database or the password hashing pool therefore shows
+    up under the call that awaited it. The thread runs only while there
+    is something to sample.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._profiles: set[RequestProfile] = set()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def start(self, coro: CoroutineType) -> RequestProfile:
+        """Start sampling a coroutine that is about to run on this thread."""
+        profile = RequestProfile(coro, threading.get_ident())
+        with self._lock:
+            self._profiles.add(profile)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="request-profiler", daemon=True
+                )
+                self._thread.start()
+        return profile
+
+    def stop(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._profiles.discard(profile)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                profiles = list(self._profiles)
+                if not profiles:
+                    self._thread = None
+                    return
+            frames = sys._current_frames()
+            for profile in profiles:
+                profile.sample(frames.get(profile.thread_id))
@@ -0,0 +1,50 @@
+"""
+Request rate limiting.
+
+Token buckets are kept in memory per worker by default. With
+``settings.rate_limit_backend = "redis"`` they are shared by all workers
+through Redis, which is imported lazily so it is only needed when enabled.
+"""
+
+from app.core.config import settings
+from app.ratelimit.base import RateLimitStore
+from app.ratelimit.memory import MemoryRateLimitStore
+from app.ratelimit.middleware import RateLimitMiddleware, RateLimitRule, parse_rules
+
+_store: RateLimitStore | None = None
+
+
+def get_rate_limit_store() -> RateLimitStore:
+    """Return the process-wide rate limit store."""
+    global _store
+    if _store is None:
+        if settings.rate_limit_backend == "memory":
+            _store = MemoryRateLimitStore()
+        elif settings.rate_limit_backend == "redis":
+            from app.ratelimit.redis_store import RedisRateLimitStore
+
+            if not settings.redis_url:
+                raise RuntimeError("redis_url must be set when rate_limit_backend is 'redis'")
+            _store = RedisRateLimitStore(settings.redis_url)
+        else:
+            raise RuntimeError(f"Unknown rate limit backend: {settings.rate_limit_backend}")
+    return _store
+
+
+async def close_rate_limit_store() -> None:
+    """Close the store's connections, if it was created."""
+    global _store
+    if _store is not None:
+        await _store.close()
+        _store = None
+
+
+__all__ = [
+    "MemoryRateLimitStore",
+    "RateLimitMiddleware",
+    "RateLimitRule",
+    "RateLimitStore",
+    "close_rate_limit_store",
+    "get_rate_limit_store",
+    "parse_rules",
+]
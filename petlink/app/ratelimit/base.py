@@ -0,0 +1,24 @@
+"""Interface shared by rate limit stores."""
+
+from abc import ABC, abstractmethod
+
+
+class RateLimitStore(ABC):
+    """Keeps token buckets and takes tokens from them."""
+
+    @abstractmethod
+    async def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        """
+        Take one token from a bucket, creating it full if it does not exist.
+
+        Args:
+            key: Bucket key, unique per client and rule.
+            capacity: Max tokens in the bucket (the allowed burst).
+            refill_per_second: Tokens added back per second.
+
+        Returns:
+            0.0 if a token was taken, otherwise seconds until one is available.
+        """
+
+    async def close(self) -> None:
+        """Release connections held by the store."""
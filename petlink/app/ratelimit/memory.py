@@ -0,0 +1,62 @@
+"""In-process token bucket store."""
+
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from app.ratelimit.base import RateLimitStore
+
+# Max idle buckets dropped per call, to keep every call O(1)
+SWEEP_BATCH = 8
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """
+    Token buckets in a dict, kept in least-recently-used order.
+
+    Every call drops a few idle buckets from the cold end once they have
+    refilled completely, since a full bucket is the same as a missing one.
+    Limits apply per worker process.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        # key -> [tokens, updated_at, full_at]
+        self._buckets: OrderedDict[str, list[float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    async def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        now = self._clock()
+        self._sweep(now)
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            tokens = float(capacity)
+        else:
+            tokens = min(capacity, bucket[0] + (now - bucket[1]) * refill_per_second)
+            self._buckets.move_to_end(key)
+
+        if tokens >= 1:
+            tokens -= 1
+            retry_after = 0.0
+        else:
+            retry_after = (1 - tokens) / refill_per_second
+
+        full_at = now + (capacity - tokens) / refill_per_second
+        if bucket is None:
+            self._buckets[key] = [tokens, now, full_at]
+        else:
+            bucket[0], bucket[1], bucket[2] = tokens, now, full_at
+        return retry_after
+
+    def _sweep(self, now: float) -> None:
+        buckets = self._buckets
+        for _ in range(SWEEP_BATCH):
+            if not buckets:
+                return
+            key = next(iter(buckets))
+            if buckets[key][2] > now:
+                return
+            del buckets[key]
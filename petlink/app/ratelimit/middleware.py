@@ -0,0 +1,107 @@
+"""ASGI middleware enforcing the rate limit rules from settings."""
+
+import math
+from dataclasses import dataclass
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.security import cached_token_subject
+from app.ratelimit.base import RateLimitStore
+
+DEFAULT_RULE = "*"
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """Allow ``capacity`` requests per ``period`` seconds, refilled continuously."""
+    name: str
+    capacity: int
+    period: float
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.capacity / self.period
+
+
+def parse_rules(rules: dict[str, str]) -> dict[str, RateLimitRule]:
+    """
+    Parse ``{"POST /auth/login": "10/60", "*": "300/60"}`` style rules.
+
+    Raises:
+        ValueError: for malformed rules.
+    """
+    parsed = {}
+    for route, limit in rules.items():
+        capacity, _, period = limit.partition("/")
+        if not capacity.isdigit() or int(capacity) < 1:
+            raise ValueError(f"Invalid rate limit for {route!r}: {limit!r}")
+        try:
+            seconds = float(period)
+        except ValueError:
+            raise ValueError(f"Invalid rate limit for {route!r}: {limit!r}") from None
+        if seconds <= 0:
+            raise ValueError(f"Invalid rate limit for {route!r}: {limit!r}")
+        parsed[route] = RateLimitRule(name=route, capacity=int(capacity), period=seconds)
+    return parsed
+
+
+class RateLimitMiddleware:
+    """
+    Token bucket rate limiting per route and client.
+
+    Authenticated requests are limited per user, anonymous ones per client
+    IP. Routes are matched on exact ``"METHOD /path"``; everything else falls
+    under the ``"*"`` rule. Requests over the limit get 429 with Retry-After.
+    """
+
+    def __init__(self, app: ASGIApp, store_factory=None, rules: dict[str, str] | None = None):
+        from app.ratelimit import get_rate_limit_store
+
+        self.app = app
+        self._get_store = store_factory or get_rate_limit_store
+        parsed = parse_rules(settings.rate_limit_rules if rules is None else rules)
+        self._default = parsed.pop(DEFAULT_RULE, None)
+        self._rules = parsed
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.rate_limit_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        rule = self._rules.get(f"{scope['method']} {scope['path']}", self._default)
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        store: RateLimitStore = self._get_store()
+        retry_after = await store.take(
+            f"{rule.name}|{_client_key(scope)}", rule.capacity, rule.refill_per_second
+        )
+        if retry_after > 0:
+            response = JSONResponse(
+                status_code=429,
+                content={"detail": "Too many requests"},
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+
+def _client_key(scope: Scope) -> str:
+    forwarded_for = None
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                subject = cached_token_subject(token)
+                if subject is not None:
+                    return f"user:{subject}"
+        elif name == b"x-forwarded-for":
+            forwarded_for = value
+    if forwarded_for is not None and settings.rate_limit_trust_forwarded_for:
+        return "ip:" + forwarded_for.decode("latin-1").split(",", 1)[0].strip()
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
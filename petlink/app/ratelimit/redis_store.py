@@ -0,0 +1,64 @@
+"""Token bucket store shared by all workers through Redis."""
+
+import logging
+
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+
+from app.ratelimit.base import RateLimitStore
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "ratelimit:"
+
+# Refill and take atomically on the Redis server, using its clock so that
+# workers with skewed clocks agree. Buckets expire once they are full again.
+_TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1])
+local ts = tonumber(bucket[2])
+if tokens == nil then
+    tokens = capacity
+    ts = now
+end
+tokens = math.min(capacity, tokens + (now - ts) * rate)
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1000)
+return tostring(retry_after)
+"""
+
+
+class RedisRateLimitStore(RateLimitStore):
+    """
+    Token buckets in Redis hashes, updated by a Lua script.
+
+    If Redis is unreachable requests are let through, so an outage of the
+    limiter does not take the API down with it.
+    """
+
+    def __init__(self, url: str):
+        self._client = redis.from_url(url)
+        self._take = self._client.register_script(_TAKE_SCRIPT)
+
+    async def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        try:
+            retry_after = await self._take(
+                keys=[KEY_PREFIX + key], args=[capacity, refill_per_second]
+            )
+        except RedisError:
+            logger.warning("Rate limit store unavailable, letting request through", exc_info=True)
+            return 0.0
+        return float(retry_after)
+
+    async def close(self) -> None:
+        await self._client.aclose()
@@ -55,4 +55,11 @@ class CareOrderUpdate(BaseModel):
     description: Optional[constr(max_length=1000)] = None
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
+    # Not in_progress: an order is staffed by accepting a proposal
     status: Optional[OrderStatus] = None
+
+
+class CareOrderRecommendation(BaseModel):
+    """An open care order recommended to a petsitter, with its feed score."""
+    order: CareOrderRead
+    score: float
@@ -0,0 +1,59 @@
+"""
+Dashboard schemas.
+
+Defines the aggregated owner home screen: orders with a summary of their
+proposals and chat, plus the profiles of the users they deal with.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+from app.schemas.care_order import OrderStatus
+
+
+class ProposalSummary(BaseModel):
+    """Aggregate of the proposals received for an order."""
+    total: int = 0
+    pending: int = 0
+    lowest_pending_price: Optional[float] = None
+    accepted_proposal_id: Optional[int] = None
+    accepted_petsitter_id: Optional[int] = None
+
+
+class MessagePreview(BaseModel):
+    """Latest chat message of an order, with shortened content."""
+    id: int
+    sender_id: int
+    content: str
+    created_at: Optional[datetime] = None
+
+
+class DashboardOrder(BaseModel):
+    """Care order as shown on the owner dashboard."""
+    id: int
+    title: str
+    start_date: datetime
+    end_date: datetime
+    status: OrderStatus
+    proposals: ProposalSummary
+    last_message: Optional[MessagePreview] = None
+
+
+class CounterpartProfile(BaseModel):
+    """Public profile of a petsitter or chat partner on the dashboard."""
+    id: int
+    username: str
+    avatar_url: Optional[str] = None
+    avatar_variants: Optional[Dict[int, str]] = None
+    avatar_variants_jpeg: Optional[Dict[int, str]] = None
+    petsitter_rating: float
+    city: Optional[str] = None
+
+
+class Dashboard(BaseModel):
+    """Owner home screen, loaded in one round trip."""
+    orders: List[DashboardOrder]
+    # Profiles referenced by accepted_petsitter_id and last_message.sender_id
+    users: List[CounterpartProfile]
@@ -0,0 +1,56 @@
+"""
+Export schemas.
+
+Defines flat row shapes written to NDJSON exports. Rows carry foreign keys
+instead of nested objects, so they can be produced from a streamed cursor
+without extra relationship loads.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+from app.schemas.care_order import OrderStatus
+from app.schemas.proposal import ProposalStatus
+
+
+class OrderExport(BaseModel):
+    """Care order row in an export."""
+    id: int
+    owner_id: int
+    title: str
+    description: Optional[str] = None
+    start_date: datetime
+    end_date: datetime
+    status: OrderStatus
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ProposalExport(BaseModel):
+    """Proposal row in an export."""
+    id: int
+    order_id: int
+    petsitter_id: int
+    price: float
+    comment: Optional[str] = None
+    status: ProposalStatus
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class MessageExport(BaseModel):
+    """Chat message row in an export."""
+    id: int
+    order_id: int
+    sender_id: int
+    content: str
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
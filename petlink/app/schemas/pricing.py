@@ -0,0 +1,23 @@
+"""
+Pricing schemas.
+
+Defines the price suggestion served from the precomputed price guidance.
+"""
+
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class PriceSuggestion(BaseModel):
+    """Proposal prices seen for similar orders: same city, similar duration."""
+    city: str
+    duration_bucket: str
+    sample_count: int
+    # Median price of the bucket
+    suggested_price: float
+    price_p10: float
+    price_p25: float
+    price_p75: float
+    price_p90: float
+    refreshed_at: datetime
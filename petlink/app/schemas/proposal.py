@@ -7,6 +7,9 @@ Defines data validation and transfer objects for proposal operations.
 from typing import Optional
 from pydantic import BaseModel, condecimal
 from enum import Enum
+from datetime import datetime
+
+from app.schemas.user import PetsitterSummary
 
 
 class ProposalStatus(str, Enum):
@@ -32,7 +35,11 @@ class ProposalCreate(ProposalBase):
 class ProposalRead(ProposalBase):
     """Schema for reading proposal information."""
     id: int
+    order_id: int
+    petsitter_id: int
+    petsitter: PetsitterSummary
     status: ProposalStatus
+    created_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
@@ -46,4 +53,6 @@ class ProposalUpdate(BaseModel):
     """
     price: Optional[condecimal(gt=0)] = None
     comment: Optional[str] = None
+    # Only "canceled", to withdraw a pending proposal; owners accept with
+    # POST /proposals/{id}/accept
     status: Optional[ProposalStatus] = None
@@ -4,7 +4,7 @@ User schemas.
 Defines data validation and transfer objects for user operations.
 """
 
-from typing import Optional
+from typing import Dict, Optional
 from pydantic import BaseModel, EmailStr, constr
 from enum import Enum
 
@@ -26,7 +26,6 @@ class UserCreate(UserBase):
     """Schema for user registration. Includes password."""
     password: constr(min_length=8, max_length=128)
 
-    avatar_url: Optional[str] = None
     bio: Optional[str] = None
     pets: Optional[str] = None
     experience: Optional[str] = None
@@ -40,6 +39,10 @@ class UserRead(UserBase):
     petsitter_rating: float
 
     avatar_url: Optional[str] = None
+    # Size in px -> URL; points at the original until variants are ready
+    avatar_variants: Optional[Dict[int, str]] = None
+    # The same sizes as JPEG, for clients that cannot decode WebP
+    avatar_variants_jpeg: Optional[Dict[int, str]] = None
     bio: Optional[str] = None
     pets: Optional[str] = None
     experience: Optional[str] = None
@@ -55,13 +58,14 @@ class UserUpdate(BaseModel):
 
     All fields are optional.
     Password update should be handled separately with proper security checks.
+    The avatar is changed through the avatar upload and delete endpoints only,
+    which keep the stored files' reference counts.
     """
     username: Optional[constr(min_length=3, max_length=50)] = None
     email: Optional[EmailStr] = None
     role: Optional[UserRole] = None
     password: Optional[constr(min_length=8, max_length=128)] = None
 
-    avatar_url: Optional[str] = None
     bio: Optional[str] = None
     pets: Optional[str] = None
     experience: Optional[str] = None
@@ -74,3 +78,20 @@ class UserPublic(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class UserAvailability(BaseModel):
+    """Whether a username and an email address can still be registered; unset if not asked."""
+    username: Optional[bool] = None
+    email: Optional[bool] = None
+
+
+class PetsitterSummary(BaseModel):
+    """Short petsitter profile shown next to their proposals."""
+    id: int
+    username: str
+    avatar_url: Optional[str] = None
+    petsitter_rating: float
+
+    class Config:
+        from_attributes = True
@@ -5,7 +5,7 @@ from jose import jwt
 
 from app.models.user import User
 from app.schemas.auth import LoginRequest, TokenResponse
-from app.core.security import verify_password
+from app.core.security import verify_password_async
 from app.core.config import settings
 
 
@@ -21,7 +21,7 @@ async def authenticate_user(session: AsyncSession, login_data: LoginRequest) ->
             detail="Invalid username or password",
         )
 
-    if not verify_password(login_data.password, user.hashed_password):  # type: ignore[arg-type]
+    if not await verify_password_async(login_data.password, user.hashed_password):  # type: ignore[arg-type]
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid username or password",
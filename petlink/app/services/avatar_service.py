@@ -0,0 +1,368 @@
+"""
+Avatar service.
+
+Streams avatar uploads to a local staging file chunk by chunk, enforcing the
+size limit while the request body is still arriving. Blocking file operations
+run in the threadpool so large uploads never stall the event loop.
+
+Files are handed to the configured storage backend under their SHA-256
+content hash, shared between users who upload the same image, and
+reference-counted in the avatar_blobs table.
+"""
+
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+
+from fastapi import HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import MultipartParser, parse_options_header
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import USER, get_cache
+from app.db.database import AsyncSessionLocal
+from app.jobs import enqueue_job, job_handler
+from app.models.avatar_blob import AvatarBlob
+from app.models.user import User
+from app.services.thumbnail_service import enqueue_avatar_variants, variant_keys
+from app.storage import AVATAR_DIR, CONTENT_ADDRESSED_NAME, get_avatar_storage
+
+AVATAR_URL_PREFIX = f"/{AVATAR_DIR}"
+REMOVE_AVATAR_JOB = "avatar.remove"
+AVATAR_FORM_FIELD = "file"
+MAX_FILE_SIZE = 5 * 1024 * 1024
+# Room for multipart boundaries and part headers on top of the file itself.
+MAX_REQUEST_OVERHEAD = 16 * 1024
+
+# Signature bytes -> stored file extension.
+_MAGIC_SIGNATURES = (
+    (b"\xff\xd8\xff", "jpg"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+)
+_SNIFF_SIZE = 12
+
+
+def detect_image_type(head: bytes) -> str | None:
+    """Return the file extension for a supported image signature, or None."""
+    for signature, extension in _MAGIC_SIGNATURES:
+        if head.startswith(signature):
+            return extension
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
+@dataclass
+class StagedAvatar:
+    """Uploaded avatar written to a temporary file, named by its content hash."""
+    tmp_path: str
+    digest: str
+    extension: str
+
+    @property
+    def filename(self) -> str:
+        return f"{self.digest}.{self.extension}"
+
+    @property
+    def url(self) -> str:
+        return f"{AVATAR_URL_PREFIX}/{self.filename}"
+
+
+class _AvatarPartReader:
+    """
+    Collects the bytes of the avatar form field from a streaming multipart parser.
+
+    Parser callbacks are synchronous, so file data is buffered per body chunk
+    and flushed to disk by the caller between chunks.
+    """
+
+    def __init__(self, boundary: bytes):
+        self.pending = bytearray()
+        self.head = bytearray()
+        self.size = 0
+        self.found = False
+        self._in_file_part = False
+        self._header_field = bytearray()
+        self._header_value = bytearray()
+        self.parser = MultipartParser(boundary, {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        })
+
+    def _on_part_begin(self) -> None:
+        self._in_file_part = False
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        if self._header_field.lower() == b"content-disposition":
+            _, options = parse_options_header(bytes(self._header_value))
+            self._in_file_part = (
+                not self.found
+                and options.get(b"name") == AVATAR_FORM_FIELD.encode()
+                and b"filename" in options
+            )
+        self._header_field.clear()
+        self._header_value.clear()
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if not self._in_file_part:
+            return
+        chunk = data[start:end]
+        self.size += len(chunk)
+        if len(self.head) < _SNIFF_SIZE:
+            self.head += chunk[:_SNIFF_SIZE - len(self.head)]
+        if self.size <= MAX_FILE_SIZE:
+            self.pending += chunk
+
+    def _on_part_end(self) -> None:
+        if self._in_file_part:
+            self.found = True
+            self._in_file_part = False
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail="File too large (max 5MB)",
+    )
+
+
+def _open_temp_file(staging_dir: str):
+    return tempfile.NamedTemporaryFile(dir=staging_dir, prefix=".upload-", delete=False)
+
+
+def _write_chunk(tmp, hasher, data: bytes) -> None:
+    tmp.write(data)
+    hasher.update(data)
+
+
+def _close_temp_file(tmp) -> None:
+    tmp.flush()
+    os.fsync(tmp.fileno())
+    tmp.close()
+
+
+def _discard(tmp) -> None:
+    tmp.close()
+    _remove_path(tmp.name)
+
+
+def _remove_path(path: str) -> None:
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def avatar_key(avatar_url: str | None) -> str | None:
+    """Return the storage key of a stored avatar URL, or None for external URLs."""
+    if not avatar_url or not avatar_url.startswith(f"{AVATAR_URL_PREFIX}/"):
+        return None
+    return avatar_url.rsplit("/", 1)[-1]
+
+
+async def _publish(staged: StagedAvatar) -> None:
+    storage = get_avatar_storage()
+    if await storage.exists(staged.filename):
+        # Same content is already stored; keep the existing file.
+        await run_in_threadpool(_remove_path, staged.tmp_path)
+    else:
+        await storage.save(staged.filename, staged.tmp_path)
+
+
+async def _remove_avatar(key: str) -> None:
+    await get_avatar_storage().delete(key, *variant_keys(key))
+
+
+@job_handler(REMOVE_AVATAR_JOB)
+async def remove_avatar_files(payload: dict) -> None:
+    """
+    Job handler deleting an avatar file and its variants once unreferenced.
+
+    Queued by the transaction that released the last reference, so the file
+    is only deleted if that transaction committed. A content-addressed blob
+    may have been uploaded again in the meantime; it is kept in that case.
+    """
+    key = payload["key"]
+    match = CONTENT_ADDRESSED_NAME.match(key)
+    if match is None or match.group("size") is not None:
+        # Legacy per-user file name: never shared.
+        await _remove_avatar(key)
+        return
+
+    digest = match.group("digest")
+    async with AsyncSessionLocal() as session:
+        # Holding the row lock makes a concurrent upload of the same content
+        # wait, then recreate the row and republish the file.
+        blob = await session.scalar(
+            select(AvatarBlob).where(AvatarBlob.digest == digest).with_for_update()
+        )
+        if blob is not None and blob.refcount > 0:
+            return
+        await _remove_avatar(key)
+        if blob is not None:
+            await session.delete(blob)
+        await session.commit()
+
+
+async def save_avatar_upload(request: Request) -> StagedAvatar:
+    """
+    Stream a multipart avatar upload into a staging file of the avatar storage.
+
+    The body is read chunk by chunk, written and hashed off the event loop.
+    The upload is aborted as soon as it exceeds MAX_FILE_SIZE. The image type
+    is taken from the file's magic bytes, not the client headers.
+
+    Args:
+        request: Incoming request with a multipart/form-data body.
+
+    Raises:
+        HTTPException: 400 for malformed bodies or unsupported images,
+            413 if the file exceeds MAX_FILE_SIZE.
+
+    Returns:
+        Staged upload, to be attached to a user with set_user_avatar.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(status_code=400, detail="Expected multipart/form-data upload")
+
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() \
+            and int(content_length) > MAX_FILE_SIZE + MAX_REQUEST_OVERHEAD:
+        raise _too_large()
+
+    reader = _AvatarPartReader(boundary)
+    hasher = hashlib.sha256()
+    tmp = await run_in_threadpool(_open_temp_file, get_avatar_storage().staging_dir)
+    try:
+        async for chunk in request.stream():
+            reader.parser.write(chunk)
+            if reader.size > MAX_FILE_SIZE:
+                raise _too_large()
+            if len(reader.head) >= _SNIFF_SIZE and detect_image_type(bytes(reader.head)) is None:
+                raise HTTPException(status_code=400, detail="Invalid file type")
+            if reader.pending:
+                data = bytes(reader.pending)
+                reader.pending.clear()
+                await run_in_threadpool(_write_chunk, tmp, hasher, data)
+        reader.parser.finalize()
+
+        if not reader.found:
+            raise HTTPException(status_code=400, detail="No file uploaded")
+        extension = detect_image_type(bytes(reader.head))
+        if extension is None:
+            raise HTTPException(status_code=400, detail="Invalid file type")
+
+        await run_in_threadpool(_close_temp_file, tmp)
+    except MultipartParseError:
+        await run_in_threadpool(_discard, tmp)
+        raise HTTPException(status_code=400, detail="Malformed multipart body")
+    except BaseException:
+        await run_in_threadpool(_discard, tmp)
+        raise
+
+    return StagedAvatar(tmp_path=tmp.name, digest=hasher.hexdigest(), extension=extension)
+
+
+def _insert(session: AsyncSession):
+    """Return the dialect-specific INSERT construct that supports upserts."""
+    if session.bind.dialect.name == "sqlite":
+        return sqlite_insert
+    return pg_insert
+
+
+async def _acquire_blob(session: AsyncSession, staged: StagedAvatar) -> None:
+    insert = _insert(session)
+    stmt = insert(AvatarBlob).values(
+        digest=staged.digest, extension=staged.extension, refcount=1
+    )
+    await session.execute(stmt.on_conflict_do_update(
+        index_elements=[AvatarBlob.digest],
+        set_={"refcount": AvatarBlob.refcount + 1},
+    ))
+
+
+async def _release_blob(session: AsyncSession, avatar_url: str) -> None:
+    key = avatar_key(avatar_url)
+    if key is None:
+        # External URL from older profile updates; nothing stored by us.
+        return
+    match = CONTENT_ADDRESSED_NAME.match(key)
+    if match is None or match.group("size") is not None:
+        # Legacy per-user file name: never shared.
+        await enqueue_job(session, REMOVE_AVATAR_JOB, {"key": key})
+        return
+
+    digest = match.group("digest")
+    result = await session.execute(
+        update(AvatarBlob)
+        .where(AvatarBlob.digest == digest)
+        .values(refcount=AvatarBlob.refcount - 1)
+        .returning(AvatarBlob.refcount)
+    )
+    remaining = result.scalar_one_or_none()
+    if remaining is None or remaining <= 0:
+        # The row is kept at refcount 0 until the job has removed the file,
+        # so an upload of the same content before then simply reuses it.
+        await enqueue_job(session, REMOVE_AVATAR_JOB, {"key": key})
+
+
+async def set_user_avatar(
+    session: AsyncSession, user: User, staged: StagedAvatar | None
+) -> bool:
+    """
+    Point a user at a new avatar (or none) and update blob reference counts.
+
+    Identical uploads share one stored file. Once no user references the
+    previous avatar any more, a job queued in the same transaction deletes
+    its file and variants after the commit. A new upload also queues
+    generation of its resized variants.
+
+    Args:
+        session: Async SQLAlchemy session.
+        user: User whose avatar changes.
+        staged: Upload returned by save_avatar_upload, or None to remove the avatar.
+
+    Returns:
+        True if the user's avatar changed.
+    """
+    new_url = staged.url if staged else None
+    if new_url == user.avatar_url:
+        if staged:
+            await run_in_threadpool(_remove_path, staged.tmp_path)
+        return False
+
+    try:
+        if staged:
+            # The upsert locks the blob row, so a concurrent release of the
+            # same content cannot delete the file between publish and commit.
+            await _acquire_blob(session, staged)
+            await _publish(staged)
+            await enqueue_avatar_variants(session, user.id, new_url)
+        if user.avatar_url:
+            await _release_blob(session, user.avatar_url)
+        user.avatar_url = new_url
+        user.avatar_variants_ready = False
+        await session.commit()
+    except BaseException:
+        await session.rollback()
+        if staged:
+            await run_in_threadpool(_remove_path, staged.tmp_path)
+        raise
+
+    await get_cache().invalidate(USER, user.id)
+    return True
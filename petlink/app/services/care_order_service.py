@@ -1,17 +1,52 @@
 """Service functions for managing care orders."""
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import Select, select, and_, delete
 from sqlalchemy.future import select
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, load_only
 from fastapi import HTTPException
-from datetime import datetime
+from datetime import datetime, timezone
+import math
 
+from app.cache import CARE_ORDER, get_cache
+from app.db.database import AsyncSessionLocal
+from app.feed import SitterContext, order_feed, timestamp
+from app.jobs import enqueue_job, job_handler
 from app.models.care_order import CareOrder, OrderStatus
+from app.models.message import Message
+from app.models.proposal import Proposal
 from app.models.user import User, UserRole
-from app.schemas.care_order import CareOrderCreate, CareOrderUpdate
+from app.pricing import mark_price_guidance_stale
+from app.schemas.care_order import CareOrderCreate, CareOrderRead, CareOrderRecommendation, CareOrderUpdate
+from app.services.event_service import ORDER_STATUS_CHANGED, event_broker
+from app.services.user_service import get_user_public
 from sqlalchemy.exc import NoResultFound
 
+PURGE_ORDER_JOB = "care_order.purge"
+PURGE_BATCH_SIZE = 1000
+
+# Columns of the nested owner rendered by UserPublic
+OWNER_PUBLIC_COLUMNS = (User.id, User.username)
+
+
+def care_order_load_options(fields: frozenset[str] | None = None) -> list:
+    """
+    Build loader options for a sparse fieldset of CareOrderRead.
+
+    :param fields: Selected response fields, or None for all of them
+    :return: Options loading only the needed columns of the order and its owner
+    """
+    owner = joinedload(CareOrder.owner).load_only(*OWNER_PUBLIC_COLUMNS)
+    if fields is None:
+        return [owner]
+    columns = [
+        getattr(CareOrder, name) for name in fields if name in CareOrder.__table__.columns
+    ]
+    options = [load_only(*columns)]
+    if "owner" in fields:
+        options.append(owner)
+    return options
+
 
 async def create_care_order(session: AsyncSession, owner_id: int, order_data: CareOrderCreate) -> CareOrder:
     """
@@ -36,18 +71,21 @@ async def create_care_order(session: AsyncSession, owner_id: int, order_data: Ca
     return new_order
 
 
-async def get_care_order(session: AsyncSession, order_id: int) -> CareOrder:
+async def get_care_order(
+    session: AsyncSession, order_id: int, fields: frozenset[str] | None = None
+) -> CareOrder:
     """
     Get a care order by its ID.
 
     :param session: Async database session
     :param order_id: ID of the care order
+    :param fields: Response fields to load, or None for the whole order
     :return: CareOrder object if found
     :raises NoResultFound: If no care order with the given ID exists
     """
     result = await session.execute(
         select(CareOrder)
-        .options(joinedload(CareOrder.owner))   # <--- здесь
+        .options(*care_order_load_options(fields))
         .where(CareOrder.id == order_id)
     )
 
@@ -57,8 +95,35 @@ async def get_care_order(session: AsyncSession, order_id: int) -> CareOrder:
     return order
 
 
-async def list_care_orders(
-    session: AsyncSession,
+async def get_care_order_read(session: AsyncSession, order_id: int) -> CareOrderRead:
+    """
+    Get a care order as the API renders it, from the cache when possible.
+
+    The nested owner is taken from the owner's own cache entry, so renaming
+    a user does not have to invalidate all of their orders.
+
+    :param session: Async database session
+    :param order_id: ID of the care order
+    :return: The order with its owner
+    :raises NoResultFound: If no care order with the given ID exists
+    """
+
+    async def load() -> CareOrderRead | None:
+        try:
+            return CareOrderRead.model_validate(await get_care_order(session, order_id))
+        except NoResultFound:
+            return None
+
+    order = await get_cache().get_or_load(CARE_ORDER, order_id, "read", CareOrderRead, load)
+    if order is None:
+        raise NoResultFound(f"Care order with id {order_id} not found")
+    owner = await get_user_public(session, order.owner_id)
+    if owner is None or owner == order.owner:
+        return order
+    return order.model_copy(update={"owner": owner})
+
+
+def build_care_orders_query(
     current_user: User,
     skip: int = 0,
     limit: int = 20,
@@ -68,9 +133,27 @@ async def list_care_orders(
     start_date_to: datetime | None = None,
     end_date_from: datetime | None = None,
     end_date_to: datetime | None = None,
-) -> list[CareOrder]:
+    fields: frozenset[str] | None = None,
+) -> Select:
+    """
+    Build the query for a page of care orders visible to a user.
 
-    query = select(CareOrder).options(joinedload(CareOrder.owner))
+    Owners see their own orders, petsitters all open ones.
+
+    :param current_user: User the orders are listed for
+    :param skip: Number of orders to skip
+    :param limit: Max number of orders to return
+    :param status_filter: Only orders with this status; applies to owners only
+    :param order_by_date: "asc" or "desc" by start date
+    :param start_date_from: Only orders starting at or after this time
+    :param start_date_to: Only orders starting at or before this time
+    :param end_date_from: Only orders ending at or after this time
+    :param end_date_to: Only orders ending at or before this time
+    :param fields: Selected response fields, or None for all of them
+    :raises HTTPException: 403 if the user has neither role
+    :return: Select statement for the page
+    """
+    query = select(CareOrder).options(*care_order_load_options(fields))
 
     # 👤 OWNER — только свои
     if current_user.role == UserRole.owner:
@@ -111,26 +194,185 @@ async def list_care_orders(
     else:
         query = query.order_by(CareOrder.start_date.desc())
 
-    query = query.offset(skip).limit(limit)
+    return query.offset(skip).limit(limit)
 
+
+async def list_care_orders(
+    session: AsyncSession,
+    current_user: User,
+    skip: int = 0,
+    limit: int = 20,
+    status_filter: str | None = None,
+    order_by_date: str = "asc",
+    start_date_from: datetime | None = None,
+    start_date_to: datetime | None = None,
+    end_date_from: datetime | None = None,
+    end_date_to: datetime | None = None,
+    fields: frozenset[str] | None = None,
+) -> list[CareOrder]:
+    """List care orders visible to a user; arguments as for build_care_orders_query."""
+    query = build_care_orders_query(
+        current_user,
+        skip=skip,
+        limit=limit,
+        status_filter=status_filter,
+        order_by_date=order_by_date,
+        start_date_from=start_date_from,
+        start_date_to=start_date_to,
+        end_date_from=end_date_from,
+        end_date_to=end_date_to,
+        fields=fields,
+    )
     result = await session.execute(query)
     return result.scalars().all()
 
 
+async def list_recommended_care_orders(
+    session: AsyncSession,
+    current_user: User,
+    available_from: datetime | None = None,
+    available_to: datetime | None = None,
+    skip: int = 0,
+    limit: int = 20,
+) -> list[CareOrderRecommendation]:
+    """
+    Rank open orders for a petsitter with the in-memory order feed.
+
+    Orders the sitter already bid on are left out. An order that closed
+    after the feed last synced is skipped, so a page may be short.
+
+    Args:
+        session: Async SQLAlchemy session.
+        current_user: Petsitter to rank for; their city counts as a match.
+        available_from: Start of the sitter's availability, by default now.
+        available_to: End of the sitter's availability, by default open.
+        skip: Number of ranked orders to skip.
+        limit: Maximum number of orders to return.
+    Raises:
+        HTTPException: 403 for owners, 503 while the feed is not built yet.
+    Returns:
+        Orders with their scores, best first.
+    """
+    if current_user.role != UserRole.petsitter:
+        raise HTTPException(status_code=403, detail="Recommendations are available to petsitters only")
+    if not order_feed.ready:
+        raise HTTPException(status_code=503, detail="Order feed is not ready, try again")
+
+    now = datetime.now(timezone.utc)
+    bids = await session.execute(
+        select(Proposal.order_id)
+        .join(CareOrder, CareOrder.id == Proposal.order_id)
+        .where(Proposal.petsitter_id == current_user.id, CareOrder.status == OrderStatus.open)
+    )
+    sitter = SitterContext(
+        city=current_user.city,
+        available_from=timestamp(available_from or now),
+        available_to=timestamp(available_to) if available_to else math.inf,
+        excluded_order_ids=bids.scalars().all(),
+    )
+    order_ids, scores = order_feed.rank(sitter, skip + limit, now)
+    order_ids, scores = order_ids[skip:].tolist(), scores[skip:].tolist()
+    if not order_ids:
+        return []
+
+    result = await session.execute(
+        select(CareOrder)
+        .options(*care_order_load_options())
+        .where(CareOrder.id.in_(order_ids), CareOrder.status == OrderStatus.open)
+    )
+    orders = {order.id: order for order in result.scalars()}
+    return [
+        CareOrderRecommendation(order=orders[order_id], score=round(order_score, 4))
+        for order_id, order_score in zip(order_ids, scores)
+        if order_id in orders
+    ]
+
+
+async def publish_order_status_changed(session: AsyncSession, order: CareOrder) -> None:
+    """Notify the owner and every petsitter who bid on the order of its new status."""
+    result = await session.execute(
+        select(Proposal.petsitter_id).where(Proposal.order_id == order.id).distinct()
+    )
+    recipients = {order.owner_id, *result.scalars().all()}
+    event_broker.publish(
+        ORDER_STATUS_CHANGED, {"order_id": order.id, "status": order.status.value}, recipients
+    )
+
+
 async def update_care_order(session: AsyncSession, order_id: int, current_user: User, order_data: CareOrderUpdate) -> CareOrder:
     order = await get_care_order(session, order_id)
     if order.owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="You cannot update this order")
-    for field, value in order_data.dict(exclude_unset=True).items():
+    previous_status = order.status
+    changes = order_data.dict(exclude_unset=True)
+    if "status" in changes and changes["status"].value == OrderStatus.in_progress.value \
+            and previous_status != OrderStatus.in_progress:
+        # Only accepting a proposal staffs an order
+        raise HTTPException(
+            status_code=400,
+            detail="An order moves to in_progress only by accepting a proposal",
+        )
+    # New dates may move the order's proposals to another price bucket
+    moves_bucket = "start_date" in changes or "end_date" in changes
+    if moves_bucket:
+        await mark_price_guidance_stale(session, CareOrder.id == order_id)
+    for field, value in changes.items():
         setattr(order, field, value)
+    if moves_bucket:
+        await mark_price_guidance_stale(session, CareOrder.id == order_id)
     await session.commit()
+    await get_cache().invalidate(CARE_ORDER, order_id)
     await session.refresh(order)
+
+    if order.status != previous_status:
+        await publish_order_status_changed(session, order)
     return order
 
 
 async def delete_care_order(session: AsyncSession, order_id: int, current_user: User) -> None:
+    """
+    Delete a care order owned by the current user.
+
+    The order is canceled right away, so it drops out of sitter feeds, and
+    a background job removes it together with its chat and proposals.
+    """
     order = await get_care_order(session, order_id)
     if order.owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="You cannot delete this order")
-    await session.delete(order)
-    await session.commit()
\ No newline at end of file
+    previous_status = order.status
+    order.status = OrderStatus.canceled
+    await enqueue_job(session, PURGE_ORDER_JOB, {"order_id": order_id})
+    await session.commit()
+    await get_cache().invalidate(CARE_ORDER, order_id)
+
+    if previous_status != OrderStatus.canceled:
+        await publish_order_status_changed(session, order)
+
+
+@job_handler(PURGE_ORDER_JOB)
+async def purge_care_order(payload: dict) -> None:
+    """
+    Job handler deleting a care order with its messages and proposals.
+
+    Messages are removed in batches, so long chats never hold one huge
+    transaction open. Safe to run again if interrupted.
+    """
+    order_id = payload["order_id"]
+    async with AsyncSessionLocal() as session:
+        while True:
+            batch = (
+                select(Message.id)
+                .where(Message.order_id == order_id)
+                .limit(PURGE_BATCH_SIZE)
+                .scalar_subquery()
+            )
+            result = await session.execute(delete(Message).where(Message.id.in_(batch)))
+            await session.commit()
+            if result.rowcount < PURGE_BATCH_SIZE:
+                break
+
+        await mark_price_guidance_stale(session, CareOrder.id == order_id)
+        await session.execute(delete(Proposal).where(Proposal.order_id == order_id))
+        await session.execute(delete(CareOrder).where(CareOrder.id == order_id))
+        await session.commit()
+    await get_cache().invalidate(CARE_ORDER, order_id)
\ No newline at end of file
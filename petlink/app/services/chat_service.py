@@ -3,6 +3,7 @@ Service functions for CRUD operations on Message model.
 """
 
 from typing import List
+from sqlalchemy import Select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import NoResultFound
@@ -53,6 +54,18 @@ async def get_message(session: AsyncSession, message_id: int) -> Message:
     return message
 
 
+def build_messages_by_order_query(order_id: int, skip: int = 0, limit: int = 50) -> Select:
+    """Build the query behind list_messages_by_order; see there for the arguments."""
+    return (
+        select(Message)
+        .options(selectinload(Message.sender))
+        .where(Message.order_id == order_id)
+        .order_by(Message.created_at.asc())
+        .offset(skip)
+        .limit(limit)
+    )
+
+
 async def list_messages_by_order(
     session: AsyncSession, order_id: int, skip: int = 0, limit: int = 50
 ) -> List[Message]:
@@ -68,12 +81,5 @@ async def list_messages_by_order(
     Returns:
         List of Message instances.
     """
-    result = await session.execute(
-        select(Message)
-        .options(selectinload(Message.sender))
-        .where(Message.order_id == order_id)
-        .order_by(Message.created_at.asc())
-        .offset(skip)
-        .limit(limit)
-    )
+    result = await session.execute(build_messages_by_order_query(order_id, skip, limit))
     return result.scalars().all()
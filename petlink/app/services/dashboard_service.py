@@ -0,0 +1,179 @@
+"""
+Service functions for the owner dashboard.
+
+The dashboard is built with a fixed number of queries however many orders
+it shows: the page of orders, one grouped aggregate over their proposals,
+one window-function query for the latest message of each order, and one
+query for the counterpart profiles.
+"""
+
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import load_only
+
+from app.models.care_order import CareOrder
+from app.models.message import Message
+from app.models.proposal import Proposal, ProposalStatus
+from app.models.user import User
+from app.schemas.dashboard import (
+    CounterpartProfile,
+    Dashboard,
+    DashboardOrder,
+    MessagePreview,
+    ProposalSummary,
+)
+from app.services.thumbnail_service import AVATAR_FALLBACK_FORMAT, avatar_variant_urls
+
+MESSAGE_PREVIEW_LENGTH = 140
+
+
+async def _proposal_summaries(
+    session: AsyncSession, order_ids: list[int]
+) -> dict[int, ProposalSummary]:
+    pending = Proposal.status == ProposalStatus.pending
+    accepted = Proposal.status == ProposalStatus.accepted
+    result = await session.execute(
+        select(
+            Proposal.order_id,
+            func.count().label("total"),
+            func.count().filter(pending).label("pending"),
+            func.min(Proposal.price).filter(pending).label("lowest_pending_price"),
+            func.max(Proposal.id).filter(accepted).label("accepted_proposal_id"),
+            func.max(Proposal.petsitter_id).filter(accepted).label("accepted_petsitter_id"),
+        )
+        .where(Proposal.order_id.in_(order_ids))
+        .group_by(Proposal.order_id)
+    )
+    return {
+        row.order_id: ProposalSummary(
+            total=row.total,
+            pending=row.pending,
+            lowest_pending_price=row.lowest_pending_price,
+            accepted_proposal_id=row.accepted_proposal_id,
+            accepted_petsitter_id=row.accepted_petsitter_id,
+        )
+        for row in result
+    }
+
+
+async def _latest_messages(
+    session: AsyncSession, order_ids: list[int]
+) -> dict[int, MessagePreview]:
+    ranked = (
+        select(
+            Message.id,
+            Message.order_id,
+            Message.sender_id,
+            func.substr(Message.content, 1, MESSAGE_PREVIEW_LENGTH).label("content"),
+            Message.created_at,
+            func.row_number()
+            .over(
+                partition_by=Message.order_id,
+                order_by=(Message.created_at.desc(), Message.id.desc()),
+            )
+            .label("position"),
+        )
+        .where(Message.order_id.in_(order_ids))
+        .subquery()
+    )
+    result = await session.execute(select(ranked).where(ranked.c.position == 1))
+    return {
+        row.order_id: MessagePreview(
+            id=row.id,
+            sender_id=row.sender_id,
+            content=row.content,
+            created_at=row.created_at,
+        )
+        for row in result
+    }
+
+
+async def _counterpart_profiles(
+    session: AsyncSession, user_ids: set[int]
+) -> list[CounterpartProfile]:
+    if not user_ids:
+        return []
+    result = await session.execute(
+        select(User)
+        .options(load_only(
+            User.id,
+            User.username,
+            User.avatar_url,
+            User.avatar_variants_ready,
+            User.petsitter_rating,
+            User.city,
+        ))
+        .where(User.id.in_(user_ids))
+        .order_by(User.id)
+    )
+    return [
+        CounterpartProfile(
+            id=user.id,
+            username=user.username,
+            avatar_url=user.avatar_url,
+            avatar_variants=avatar_variant_urls(user.avatar_url, user.avatar_variants_ready),
+            avatar_variants_jpeg=avatar_variant_urls(
+                user.avatar_url, user.avatar_variants_ready, AVATAR_FALLBACK_FORMAT
+            ),
+            petsitter_rating=user.petsitter_rating,
+            city=user.city,
+        )
+        for user in result.scalars()
+    ]
+
+
+async def get_owner_dashboard(
+    session: AsyncSession, owner: User, skip: int = 0, limit: int = 20
+) -> Dashboard:
+    """
+    Build the dashboard of an owner.
+
+    Args:
+        session: Async SQLAlchemy session.
+        owner: Owner whose orders are shown.
+        skip: Number of orders to skip, newest first.
+        limit: Max number of orders to show.
+
+    Returns:
+        Orders with proposal summaries and chat previews, plus the profiles
+        of accepted petsitters and latest message senders.
+    """
+    result = await session.execute(
+        select(CareOrder)
+        .where(CareOrder.owner_id == owner.id)
+        .order_by(CareOrder.start_date.desc(), CareOrder.id.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    orders = result.scalars().all()
+    if not orders:
+        return Dashboard(orders=[], users=[])
+
+    order_ids = [order.id for order in orders]
+    summaries = await _proposal_summaries(session, order_ids)
+    messages = await _latest_messages(session, order_ids)
+
+    counterpart_ids = {
+        summary.accepted_petsitter_id
+        for summary in summaries.values()
+        if summary.accepted_petsitter_id is not None
+    }
+    counterpart_ids.update(message.sender_id for message in messages.values())
+    counterpart_ids.discard(owner.id)
+
+    return Dashboard(
+        orders=[
+            DashboardOrder(
+                id=order.id,
+                title=order.title,
+                start_date=order.start_date,
+                end_date=order.end_date,
+                status=order.status.value,
+                proposals=summaries.get(order.id, ProposalSummary()),
+                last_message=messages.get(order.id),
+            )
+            for order in orders
+        ],
+        users=await _counterpart_profiles(session, counterpart_ids),
+    )
@@ -0,0 +1,136 @@
+"""
+Event service.
+
+In-process broker for per-user marketplace events streamed over SSE. Each
+subscriber gets a bounded buffer; a subscriber that falls behind is dropped
+and resumes from the replay ring with ``Last-Event-ID`` when it reconnects.
+"""
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+# Event types
+PROPOSAL_CREATED = "proposal.created"
+PROPOSAL_UPDATED = "proposal.updated"
+PROPOSAL_ACCEPTED = "proposal.accepted"
+ORDER_STATUS_CHANGED = "order.status_changed"
+# Sent when events between Last-Event-ID and the replay ring were lost
+STREAM_RESET = "stream.reset"
+
+REPLAY_RING_SIZE = 1000
+SUBSCRIBER_BUFFER_SIZE = 100
+
+
+@dataclass(frozen=True)
+class Event:
+    """A typed event addressed to one or more users."""
+    id: int
+    type: str
+    data: dict[str, Any]
+    recipients: frozenset[int]
+
+
+class Subscription:
+    """One open event stream of a user."""
+
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        # None only wakes up a stream waiting for events after close()
+        self.queue: asyncio.Queue[Event | None] = asyncio.Queue(maxsize=SUBSCRIBER_BUFFER_SIZE)
+        # Set when the buffer overflowed or the worker is shutting down; the
+        # stream must close so the client reconnects and replays what it missed.
+        self.closed = asyncio.Event()
+
+    def offer(self, event: Event) -> None:
+        if self.closed.is_set():
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.closed.set()
+
+    def close(self) -> None:
+        """End the stream once the events already buffered are sent."""
+        if self.closed.is_set():
+            return
+        self.closed.set()
+        try:
+            self.queue.put_nowait(None)
+        except asyncio.QueueFull:
+            # Not waiting: the stream still has events to send.
+            pass
+
+
+class EventBroker:
+    """Fans out events to subscribed users and keeps a short replay ring."""
+
+    def __init__(self):
+        self._last_id = 0
+        self._ring: deque[Event] = deque(maxlen=REPLAY_RING_SIZE)
+        self._subscriptions: dict[int, set[Subscription]] = {}
+
+    def publish(self, event_type: str, data: dict[str, Any], recipients: Iterable[int]) -> None:
+        """
+        Publish an event to the given users.
+
+        Call after the change it describes has been committed.
+        """
+        users = frozenset(user_id for user_id in recipients if user_id is not None)
+        if not users:
+            return
+        self._last_id += 1
+        event = Event(id=self._last_id, type=event_type, data=data, recipients=users)
+        self._ring.append(event)
+        for user_id in users:
+            for subscription in self._subscriptions.get(user_id, ()):
+                subscription.offer(event)
+
+    def subscribe(self, user_id: int, last_event_id: int | None = None) -> Subscription:
+        """
+        Open a subscription, pre-filled with events missed since ``last_event_id``.
+
+        If the missed events are no longer in the replay ring, a STREAM_RESET
+        event tells the client to refetch its state.
+        """
+        subscription = Subscription(user_id)
+        if last_event_id is not None:
+            oldest_id = self._ring[0].id if self._ring else self._last_id + 1
+            # Either the ring has moved past the client, or this process
+            # restarted and its ids no longer match what the client saw.
+            if last_event_id < oldest_id - 1 or last_event_id > self._last_id:
+                subscription.offer(Event(
+                    id=oldest_id - 1, type=STREAM_RESET, data={}, recipients=frozenset({user_id})
+                ))
+                last_event_id = 0
+            for event in self._ring:
+                if event.id > last_event_id and user_id in event.recipients:
+                    subscription.offer(event)
+        self._subscriptions.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Close a subscription."""
+        subscriptions = self._subscriptions.get(subscription.user_id)
+        if subscriptions is None:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscriptions[subscription.user_id]
+
+    def close_all(self) -> None:
+        """
+        End every open stream; called on shutdown.
+
+        Streams never finish on their own, so the shutdown drain would
+        otherwise wait out its whole timeout. Clients reconnect to another
+        worker and resume with ``Last-Event-ID``.
+        """
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                subscription.close()
+
+
+# Process-wide broker; events only reach clients connected to this worker
+event_broker = EventBroker()
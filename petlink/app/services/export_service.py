@@ -0,0 +1,167 @@
+"""
+Service functions for NDJSON exports of order history and chat transcripts.
+
+Rows are read through server-side cursors (``stream_scalars`` with
+``yield_per``), so memory use does not grow with the size of the history.
+"""
+
+from typing import AsyncIterator
+
+from pydantic import BaseModel
+from sqlalchemy import or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.db.database import AsyncSessionLocal
+from app.models.care_order import CareOrder
+from app.models.message import Message
+from app.models.proposal import Proposal
+from app.models.user import User
+from app.schemas.export import MessageExport, OrderExport, ProposalExport
+from app.services.user_service import to_user_read
+
+EXPORT_BATCH_SIZE = 500
+
+
+def _ndjson_line(kind: str, row: BaseModel) -> bytes:
+    """Serialize one export row as a single NDJSON line."""
+    return b'{"type":"%s","data":%s}\n' % (kind.encode(), row.model_dump_json().encode())
+
+
+async def _stream_rows(
+    session: AsyncSession, query, kind: str, schema: type[BaseModel]
+) -> AsyncIterator[bytes]:
+    """
+    Stream ORM rows of a query as NDJSON lines.
+
+    Args:
+        session: Async SQLAlchemy session.
+        query: Select statement returning ORM entities.
+        kind: Row type written into every line.
+        schema: Export schema used to serialize each entity.
+
+    Yields:
+        Encoded NDJSON lines.
+    """
+    result = await session.stream_scalars(
+        query.execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    async for partition in result.partitions():
+        yield b"".join(
+            _ndjson_line(kind, schema.model_validate(item)) for item in partition
+        )
+        # Entities are not needed after serialization; keep the identity map flat.
+        session.expunge_all()
+
+
+async def user_has_order_access(session: AsyncSession, order: CareOrder, user: User) -> bool:
+    """
+    Check whether a user may export a care order.
+
+    The owner and any petsitter who sent a proposal for the order have access.
+
+    Args:
+        session: Async SQLAlchemy session.
+        order: Care order to check.
+        user: User requesting the export.
+
+    Returns:
+        True if the user is a participant of the order.
+    """
+    if order.owner_id == user.id:
+        return True
+    result = await session.execute(
+        select(Proposal.id)
+        .where(Proposal.order_id == order.id, Proposal.petsitter_id == user.id)
+        .limit(1)
+    )
+    return result.first() is not None
+
+
+async def export_care_order(order_id: int) -> AsyncIterator[bytes]:
+    """
+    Stream a care order with its proposals and chat transcript as NDJSON.
+
+    Opens its own session because the response body is produced after the
+    request dependencies have been closed.
+
+    Args:
+        order_id: ID of the care order to export.
+
+    Yields:
+        Encoded NDJSON lines: the order, then its proposals, then its messages.
+    """
+    async with AsyncSessionLocal() as session:
+        async for chunk in _stream_rows(
+            session, select(CareOrder).where(CareOrder.id == order_id), "order", OrderExport
+        ):
+            yield chunk
+        async for chunk in _stream_rows(
+            session,
+            select(Proposal).where(Proposal.order_id == order_id).order_by(Proposal.id),
+            "proposal",
+            ProposalExport,
+        ):
+            yield chunk
+        async for chunk in _stream_rows(
+            session,
+            select(Message).where(Message.order_id == order_id).order_by(Message.id),
+            "message",
+            MessageExport,
+        ):
+            yield chunk
+
+
+async def export_user_history(user_id: int) -> AsyncIterator[bytes]:
+    """
+    Stream a user's profile and full marketplace history as NDJSON.
+
+    Includes the user's own orders, proposals they sent or received, and all
+    messages in chats of those orders.
+
+    Args:
+        user_id: ID of the user to export.
+
+    Yields:
+        Encoded NDJSON lines: the user, then orders, proposals and messages.
+    """
+    async with AsyncSessionLocal() as session:
+        user = await session.get(User, user_id)
+        if user is None or user.is_deleted:
+            return
+        yield _ndjson_line("user", to_user_read(user))
+
+        own_order_ids = select(CareOrder.id).where(CareOrder.owner_id == user_id)
+        related_order_ids = (
+            select(Proposal.order_id).where(Proposal.petsitter_id == user_id)
+        )
+
+        async for chunk in _stream_rows(
+            session,
+            select(CareOrder).where(CareOrder.owner_id == user_id).order_by(CareOrder.id),
+            "order",
+            OrderExport,
+        ):
+            yield chunk
+        async for chunk in _stream_rows(
+            session,
+            select(Proposal)
+            .where(or_(Proposal.petsitter_id == user_id, Proposal.order_id.in_(own_order_ids)))
+            .order_by(Proposal.id),
+            "proposal",
+            ProposalExport,
+        ):
+            yield chunk
+        async for chunk in _stream_rows(
+            session,
+            select(Message)
+            .where(or_(
+                Message.sender_id == user_id,
+                Message.order_id.in_(own_order_ids),
+                Message.order_id.in_(related_order_ids),
+            ))
+            .order_by(Message.id),
+            "message",
+            MessageExport,
+        ):
+            yield chunk
@@ -0,0 +1,49 @@
+"""Service functions for price suggestions."""
+
+from datetime import datetime
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.price_guidance import PriceGuidance
+from app.pricing import duration_bucket
+from app.schemas.pricing import PriceSuggestion
+
+
+async def get_price_suggestion(
+    session: AsyncSession, city: str, start_date: datetime, end_date: datetime
+) -> PriceSuggestion:
+    """
+    Suggest a price for an order from the precomputed price guidance.
+
+    Args:
+        session: Async SQLAlchemy session.
+        city: Owner city of the order.
+        start_date: Start of the order.
+        end_date: End of the order.
+    Raises:
+        HTTPException: 400 if the order ends before it starts, 404 if too
+            few proposals were made for similar orders.
+    Returns:
+        Percentiles of the proposal prices of the order's bucket.
+    """
+    if end_date < start_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="end_date must not be before start_date")
+    guidance = await session.get(PriceGuidance, (city, duration_bucket(start_date, end_date)))
+    if guidance is None or guidance.sample_count < settings.price_guidance_min_samples:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not enough proposals for similar orders to suggest a price",
+        )
+    return PriceSuggestion(
+        city=guidance.city,
+        duration_bucket=guidance.duration_bucket,
+        sample_count=guidance.sample_count,
+        suggested_price=guidance.price_p50,
+        price_p10=guidance.price_p10,
+        price_p25=guidance.price_p25,
+        price_p75=guidance.price_p75,
+        price_p90=guidance.price_p90,
+        refreshed_at=guidance.refreshed_at,
+    )
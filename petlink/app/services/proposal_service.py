@@ -3,13 +3,49 @@ Service functions for CRUD operations on Proposal model.
 """
 
 from typing import List, Optional
+from fastapi import HTTPException, status
+from sqlalchemy import update
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import joinedload, load_only
 
+from app.cache import CARE_ORDER, get_cache
+from app.models.care_order import CareOrder, OrderStatus
+from app.models.user import User
 from app.models.proposal import Proposal, ProposalStatus
+from app.pricing import mark_price_guidance_stale
 from app.schemas.proposal import ProposalCreate, ProposalUpdate
+from app.services.event_service import (
+    PROPOSAL_ACCEPTED,
+    PROPOSAL_CREATED,
+    PROPOSAL_UPDATED,
+    event_broker,
+)
+from app.services.care_order_service import publish_order_status_changed
 from sqlalchemy.exc import NoResultFound
 
+# Postgres "lock_not_available", raised by FOR UPDATE NOWAIT
+LOCK_NOT_AVAILABLE = "55P03"
+
+# Columns of the nested petsitter rendered by PetsitterSummary
+PETSITTER_SUMMARY_COLUMNS = (User.id, User.username, User.avatar_url, User.petsitter_rating)
+
+
+def proposal_event_data(proposal: Proposal) -> dict:
+    """Build the event payload describing a proposal."""
+    return {
+        "proposal_id": proposal.id,
+        "order_id": proposal.order_id,
+        "petsitter_id": proposal.petsitter_id,
+        "price": float(proposal.price),
+        "status": proposal.status.value,
+    }
+
+
+async def _order_owner_id(session: AsyncSession, order_id: int) -> Optional[int]:
+    return await session.scalar(select(CareOrder.owner_id).where(CareOrder.id == order_id))
+
 
 async def create_proposal(
     session: AsyncSession, proposal_data: ProposalCreate
@@ -25,25 +61,52 @@ async def create_proposal(
     """
     new_proposal = Proposal(**proposal_data.dict())
     session.add(new_proposal)
+    await mark_price_guidance_stale(session, CareOrder.id == new_proposal.order_id)
     await session.commit()
     await session.refresh(new_proposal)
+    # Load the petsitter summary rendered by ProposalRead
+    new_proposal = await get_proposal(session, new_proposal.id)
+
+    owner_id = await _order_owner_id(session, new_proposal.order_id)
+    event_broker.publish(PROPOSAL_CREATED, proposal_event_data(new_proposal), [owner_id])
     return new_proposal
 
 
-async def get_proposal(session: AsyncSession, proposal_id: int) -> Proposal:
+def proposal_load_options(fields: Optional[frozenset[str]] = None) -> list:
+    """Build loader options for a sparse fieldset of ProposalRead."""
+    petsitter = joinedload(Proposal.petsitter).load_only(*PETSITTER_SUMMARY_COLUMNS)
+    if fields is None:
+        return [petsitter]
+    columns = [
+        getattr(Proposal, name) for name in fields if name in Proposal.__table__.columns
+    ]
+    options = [load_only(*columns)]
+    if "petsitter" in fields:
+        options.append(petsitter)
+    return options
+
+
+async def get_proposal(
+    session: AsyncSession, proposal_id: int, fields: Optional[frozenset[str]] = None
+) -> Proposal:
     """
     Retrieve a proposal by ID.
 
     Args:
         session: Async SQLAlchemy session.
         proposal_id: ID of the proposal to retrieve.
+        fields: Response fields to load, or None for the whole proposal.
     Raises:
         NoResultFound: if no proposal found with the given ID.
 
     Returns:
         Proposal instance.
     """
-    result = await session.execute(select(Proposal).where(Proposal.id == proposal_id))
+    result = await session.execute(
+        select(Proposal)
+        .options(*proposal_load_options(fields))
+        .where(Proposal.id == proposal_id)
+    )
     proposal = result.scalars().first()
     if not proposal:
         raise NoResultFound
@@ -51,19 +114,42 @@ async def get_proposal(session: AsyncSession, proposal_id: int) -> Proposal:
 
 
 async def list_proposals(
-    session: AsyncSession, skip: int = 0, limit: int = 20
+    session: AsyncSession,
+    skip: int = 0,
+    limit: int = 20,
+    order_id: Optional[int] = None,
+    petsitter_id: Optional[int] = None,
+    status_filter: Optional[str] = None,
+    fields: Optional[frozenset[str]] = None,
 ) -> List[Proposal]:
     """
-    Retrieve a list of proposals with pagination.
+    Retrieve a filtered list of proposals with pagination, oldest first.
+
+    Filtering by order or petsitter is served by the (order_id, id) and
+    (petsitter_id, id) indexes.
 
     Args:
         session: Async SQLAlchemy session.
         skip: Number of records to skip.
         limit: Max number of records to return.
+        order_id: Only proposals for this care order.
+        petsitter_id: Only proposals sent by this petsitter.
+        status_filter: Only proposals with this status.
+        fields: Response fields to load, or None for whole proposals.
     Returns:
-        List of Proposal instances.
+        List of Proposal instances with their petsitter summary loaded.
     """
-    result = await session.execute(select(Proposal).offset(skip).limit(limit))
+    query = select(Proposal).options(*proposal_load_options(fields))
+    if order_id is not None:
+        query = query.where(Proposal.order_id == order_id)
+    if petsitter_id is not None:
+        query = query.where(Proposal.petsitter_id == petsitter_id)
+    if status_filter is not None:
+        query = query.where(Proposal.status == ProposalStatus(status_filter))
+
+    result = await session.execute(
+        query.order_by(Proposal.id).offset(skip).limit(limit)
+    )
     return result.scalars().all()
 
 
@@ -73,21 +159,119 @@ async def update_proposal(
     """
     Update an existing proposal partially.
 
+    The only status change allowed here is withdrawing a pending proposal;
+    proposals are accepted with accept_proposal, which also updates the
+    order and the other proposals.
+
     Args:
         session: Async SQLAlchemy session.
         proposal_id: ID of proposal to update.
         proposal_data: ProposalUpdate schema with data to update.
     Raises:
         NoResultFound: if no proposal found with the given ID.
+        HTTPException: 400 for any other status change.
     Returns:
         Updated Proposal instance.
     """
     proposal = await get_proposal(session, proposal_id)
-    for field, value in proposal_data.dict(exclude_unset=True).items():
+    changes = proposal_data.dict(exclude_unset=True)
+    if "status" in changes:
+        new_status = ProposalStatus(changes["status"].value)
+        if new_status == proposal.status:
+            del changes["status"]
+        elif new_status != ProposalStatus.canceled or proposal.status != ProposalStatus.pending:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="A proposal can only be withdrawn while pending",
+            )
+        else:
+            changes["status"] = new_status
+    for field, value in changes.items():
         setattr(proposal, field, value)
     session.add(proposal)
+    if "price" in changes:
+        await mark_price_guidance_stale(session, CareOrder.id == proposal.order_id)
     await session.commit()
     await session.refresh(proposal)
+
+    data = proposal_event_data(proposal)
+    owner_id = await _order_owner_id(session, proposal.order_id)
+    event_broker.publish(PROPOSAL_UPDATED, data, [owner_id])
+    return proposal
+
+
+async def accept_proposal(
+    session: AsyncSession, proposal_id: int, current_user: User
+) -> Proposal:
+    """
+    Accept a proposal on behalf of the order owner, atomically.
+
+    In one transaction the order row is locked, the order moves to
+    in_progress, the proposal becomes accepted and every other pending
+    proposal on the order is rejected. A concurrent accept of the same order
+    fails immediately instead of queueing behind the lock.
+
+    Args:
+        session: Async SQLAlchemy session.
+        proposal_id: ID of the proposal to accept.
+        current_user: User accepting; must own the order.
+    Raises:
+        NoResultFound: if no proposal found with the given ID.
+        HTTPException: 403 if the user does not own the order, 409 if the
+            order is no longer open, the proposal is not pending, or another
+            accept holds the order.
+    Returns:
+        The accepted Proposal instance.
+    """
+    proposal = await get_proposal(session, proposal_id)
+    try:
+        result = await session.execute(
+            select(CareOrder)
+            .where(CareOrder.id == proposal.order_id)
+            .with_for_update(nowait=True)
+        )
+    except DBAPIError as exc:
+        await session.rollback()
+        sqlstate = getattr(exc.orig, "sqlstate", None) or getattr(exc.orig, "pgcode", None)
+        if sqlstate == LOCK_NOT_AVAILABLE:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Order is being updated, try again",
+            )
+        raise
+    order = result.scalar_one()
+
+    if order.owner_id != current_user.id:
+        await session.rollback()
+        raise HTTPException(status_code=403, detail="Not authorized to accept this proposal")
+    # Re-read under the order lock: a concurrent accept may have just committed.
+    await session.refresh(proposal)
+    if order.status != OrderStatus.open or proposal.status != ProposalStatus.pending:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Order is not open or proposal is not pending",
+        )
+
+    order.status = OrderStatus.in_progress
+    proposal.status = ProposalStatus.accepted
+    await session.execute(
+        update(Proposal)
+        .where(
+            Proposal.order_id == order.id,
+            Proposal.id != proposal.id,
+            Proposal.status == ProposalStatus.pending,
+        )
+        .values(status=ProposalStatus.rejected)
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
+    await get_cache().invalidate(CARE_ORDER, order.id)
+
+    data = proposal_event_data(proposal)
+    event_broker.publish(PROPOSAL_ACCEPTED, data, [proposal.petsitter_id])
+    event_broker.publish(PROPOSAL_UPDATED, data, [order.owner_id])
+    await publish_order_status_changed(session, order)
     return proposal
 
 
@@ -102,5 +286,6 @@ async def delete_proposal(session: AsyncSession, proposal_id: int) -> None:
         NoResultFound: if no proposal found with the given ID.
     """
     proposal = await get_proposal(session, proposal_id)
+    await mark_price_guidance_stale(session, CareOrder.id == proposal.order_id)
     await session.delete(proposal)
     await session.commit()
@@ -0,0 +1,208 @@
+"""
+Thumbnail service.
+
+Produces fixed-size avatar variants in a process pool, off the request path,
+and stores them next to the original in the avatar storage backend. Every
+size is rendered as WebP and as a JPEG fallback for clients without WebP. Work is
+queued as a durable job, so it is retried if rendering or storage fails.
+Until a user's variants are ready, their variant URLs fall back to the
+original avatar.
+"""
+
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi.concurrency import run_in_threadpool
+from PIL import Image, ImageOps
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import USER, get_cache
+from app.db.database import AsyncSessionLocal
+from app.jobs import PRIORITY_LOW, enqueue_job, job_handler
+from app.models.user import User
+from app.storage import get_avatar_storage
+
+RENDER_VARIANTS_JOB = "avatar.render_variants"
+
+AVATAR_VARIANT_SIZES = (64, 128, 256)
+AVATAR_VARIANT_FORMAT = "webp"
+AVATAR_FALLBACK_FORMAT = "jpg"
+# Variant file extension -> Pillow format and encoder options.
+_VARIANT_ENCODERS = {
+    AVATAR_VARIANT_FORMAT: ("WEBP", {"quality": 80, "method": 4}),
+    AVATAR_FALLBACK_FORMAT: ("JPEG", {"quality": 80, "optimize": True, "progressive": True}),
+}
+THUMBNAIL_WORKERS = 2
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def variant_url(avatar_url: str, size: int, extension: str = AVATAR_VARIANT_FORMAT) -> str:
+    """Return the URL of a resized variant of an avatar."""
+    stem, _ = os.path.splitext(avatar_url)
+    return f"{stem}_{size}.{extension}"
+
+
+def avatar_variant_urls(
+    avatar_url: str | None, ready: bool, extension: str = AVATAR_VARIANT_FORMAT
+) -> dict[int, str] | None:
+    """
+    Map every variant size to the URL clients should load.
+
+    Args:
+        avatar_url: URL of the original avatar.
+        ready: Whether the resized variants have been generated.
+        extension: Variant format, AVATAR_VARIANT_FORMAT or AVATAR_FALLBACK_FORMAT.
+
+    Returns:
+        Size -> URL mapping, pointing at the original while variants are pending,
+        or None if the user has no avatar.
+    """
+    if not avatar_url:
+        return None
+    if not ready:
+        return {size: avatar_url for size in AVATAR_VARIANT_SIZES}
+    return {size: variant_url(avatar_url, size, extension) for size in AVATAR_VARIANT_SIZES}
+
+
+def variant_keys(key: str) -> list[str]:
+    """Return the storage keys of every variant of a stored avatar, in every format."""
+    return [
+        variant_url(key, size, extension)
+        for size in AVATAR_VARIANT_SIZES
+        for extension in _VARIANT_ENCODERS
+    ]
+
+
+def render_avatar_variants(source_path: str, key: str, output_dir: str) -> dict[str, str]:
+    """
+    Decode an avatar and write a square variant for every configured size and format.
+
+    Runs inside a worker process, so it only deals with local files; the
+    caller hands the results to the storage backend.
+
+    Args:
+        source_path: Local path of the original avatar.
+        key: Storage key of the original, used to name the variants.
+        output_dir: Directory to write the variants into.
+
+    Returns:
+        Variant storage key -> local path of the rendered file.
+    """
+    rendered = {}
+    with Image.open(source_path) as image:
+        image = ImageOps.exif_transpose(image)
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+        for size in AVATAR_VARIANT_SIZES:
+            variant = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+            for extension, (image_format, options) in _VARIANT_ENCODERS.items():
+                target_key = variant_url(key, size, extension)
+                target = os.path.join(output_dir, f".variant-{os.getpid()}-{target_key}")
+                encoded = _opaque(variant) if image_format == "JPEG" else variant
+                encoded.save(target, format=image_format, **options)
+                rendered[target_key] = target
+    return rendered
+
+
+def _opaque(image: Image.Image) -> Image.Image:
+    """Flatten transparency onto white; JPEG has no alpha channel."""
+    if image.mode != "RGBA":
+        return image
+    background = Image.new("RGB", image.size, (255, 255, 255))
+    background.paste(image, mask=image.getchannel("A"))
+    return background
+
+
+def _remove_path(path: str) -> None:
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=THUMBNAIL_WORKERS)
+    return _pool
+
+
+async def _render_and_store(key: str) -> None:
+    storage = get_avatar_storage()
+    keys = variant_keys(key)
+    exists = await asyncio.gather(*(storage.exists(k) for k in keys))
+    if all(exists):
+        # Another user already uploaded the same content-addressed original.
+        return
+
+    source_path = storage.local_path(key)
+    downloaded = source_path is None
+    if downloaded:
+        source_path = os.path.join(storage.staging_dir, f".source-{key}")
+        await storage.download(key, source_path)
+
+    rendered = {}
+    try:
+        loop = asyncio.get_running_loop()
+        rendered = await loop.run_in_executor(
+            _get_pool(), render_avatar_variants, source_path, key, storage.staging_dir
+        )
+        for target_key, path in rendered.items():
+            await storage.save(target_key, path)
+    finally:
+        leftovers = list(rendered.values()) + ([source_path] if downloaded else [])
+        for path in leftovers:
+            await run_in_threadpool(_remove_path, path)
+
+
+@job_handler(RENDER_VARIANTS_JOB)
+async def generate_avatar_variants(payload: dict) -> None:
+    """
+    Job handler rendering the variants of a user's avatar.
+
+    Skips avatars the user has replaced since the job was queued, and only
+    flags the variants as ready if the avatar is still the same afterwards.
+    """
+    user_id, avatar_url = payload["user_id"], payload["avatar_url"]
+    async with AsyncSessionLocal() as session:
+        current_url = await session.scalar(select(User.avatar_url).where(User.id == user_id))
+    if current_url != avatar_url:
+        return
+
+    await _render_and_store(avatar_url.rsplit("/", 1)[-1])
+
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(User)
+            .where(User.id == user_id, User.avatar_url == avatar_url)
+            .values(avatar_variants_ready=True)
+        )
+        await session.commit()
+    await get_cache().invalidate(USER, user_id)
+
+
+async def enqueue_avatar_variants(session: AsyncSession, user_id: int, avatar_url: str) -> None:
+    """
+    Queue variant generation for a freshly uploaded avatar.
+
+    The job is part of the caller's transaction and runs after it commits.
+
+    Args:
+        session: Async SQLAlchemy session changing the avatar.
+        user_id: ID of the avatar owner.
+        avatar_url: URL of the stored original.
+    """
+    await enqueue_job(
+        session,
+        RENDER_VARIANTS_JOB,
+        {"user_id": user_id, "avatar_url": avatar_url},
+        priority=PRIORITY_LOW,
+    )
+
+
+def shutdown_thumbnail_pool() -> None:
+    """Stop the worker processes. Call after the job queue has drained."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True)
+        _pool = None
@@ -5,14 +5,26 @@ Handles user creation, retrieval, updates, and user fetching by token.
 """
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import Select, or_, select, update
+from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 
 from jose import JWTError, jwt
+from app.availability import availability_filter
+from app.cache import USER, get_cache
 from app.core.config import settings
+from app.metrics import AVAILABILITY_CHECKS
+from app.models.care_order import CareOrder
 from app.models.user import User, UserRole
-from app.schemas.user import UserCreate, UserRead, UserUpdate
-from app.core.security import hash_password
+from app.pricing import mark_price_guidance_stale
+from app.schemas.user import UserAvailability, UserCreate, UserPublic, UserRead, UserUpdate
+from app.core.security import hash_password_async
+from app.services.thumbnail_service import AVATAR_FALLBACK_FORMAT, avatar_variant_urls
+
+
+def active_user_query(user_id: int) -> Select:
+    """Select a user by ID, unless soft-deleted."""
+    return select(User).where(User.id == user_id, User.is_deleted == False)
 
 
 def to_user_read(user: User) -> UserRead:
@@ -25,6 +37,10 @@ def to_user_read(user: User) -> UserRead:
         owner_rating=user.owner_rating,
         petsitter_rating=user.petsitter_rating,
         avatar_url=user.avatar_url,
+        avatar_variants=avatar_variant_urls(user.avatar_url, user.avatar_variants_ready),
+        avatar_variants_jpeg=avatar_variant_urls(
+            user.avatar_url, user.avatar_variants_ready, AVATAR_FALLBACK_FORMAT
+        ),
         bio=user.bio,
         pets=user.pets,
         experience=user.experience,
@@ -32,22 +48,40 @@ def to_user_read(user: User) -> UserRead:
     )
 
 
+def _duplicate_user_detail(exc: IntegrityError) -> str | None:
+    """Which unique user field an insert violated, as an error message."""
+    message = str(exc.orig)
+    if "username" in message:
+        return "Username already exists"
+    if "email" in message:
+        return "Email already exists"
+    return None
+
+
 async def create_user(session: AsyncSession, user_data: UserCreate) -> UserRead:
-    """Create a new user."""
-    result = await session.execute(
-        select(User).where(User.username == user_data.username, User.is_deleted == False)
-    )
-    if result.scalars().first():
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username already exists")
+    """
+    Create a new user.
+
+    Raises:
+        HTTPException: 400 if the username or email is taken, also when
+            another worker registered it after this worker's availability
+            filter was last rebuilt.
+    """
+    # A username the availability filter has never seen cannot exist yet
+    if not availability_filter.is_free("username", user_data.username):
+        result = await session.execute(
+            select(User).where(User.username == user_data.username, User.is_deleted == False)
+        )
+        if result.scalars().first():
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username already exists")
 
     new_user = User(
     username=user_data.username,
     email=user_data.email,
-    hashed_password=hash_password(user_data.password),
+    hashed_password=await hash_password_async(user_data.password),
     role=user_data.role,
     is_deleted=False,
 
-    avatar_url=user_data.avatar_url,
     bio=user_data.bio,
     pets=user_data.pets,
     experience=user_data.experience,
@@ -57,23 +91,89 @@ async def create_user(session: AsyncSession, user_data: UserCreate) -> UserRead:
     petsitter_rating=0.0,
 )
     session.add(new_user)
-    await session.commit()
+    try:
+        await session.commit()
+    except IntegrityError as exc:
+        await session.rollback()
+        detail = _duplicate_user_detail(exc)
+        if detail is None:
+            raise
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail) from exc
+    availability_filter.add_user(new_user.username, new_user.email)
     await session.refresh(new_user)
     return to_user_read(new_user)
 
 
+async def check_availability(
+    session: AsyncSession, username: str | None = None, email: str | None = None
+) -> UserAvailability:
+    """
+    Check whether a username and an email address are still free.
+
+    Values the availability filter has never seen are reported free without
+    a query; the rest are looked up in one query. The answer is advisory:
+    a value registered through another worker can still be reported free
+    until this worker's filter is rebuilt, i.e. for up to
+    ``availability_filter_rebuild_seconds``. Registration still enforces
+    uniqueness.
+    """
+    availability = {}
+    unknown = {}
+    for field, value in (("username", username), ("email", email)):
+        if value is None:
+            continue
+        if availability_filter.is_free(field, value):
+            availability[field] = True
+            AVAILABILITY_CHECKS.labels(field, "filter").inc()
+        else:
+            unknown[field] = value
+            AVAILABILITY_CHECKS.labels(field, "database").inc()
+
+    if unknown:
+        result = await session.execute(
+            select(User.username, User.email).where(
+                or_(*(getattr(User, field) == value for field, value in unknown.items()))
+            )
+        )
+        taken = result.all()
+        for field, value in unknown.items():
+            availability[field] = all(getattr(row, field) != value for row in taken)
+    return UserAvailability(**availability)
+
+
 async def get_user_by_id(session: AsyncSession, user_id: int) -> UserRead:
-    """Retrieve user by ID, ignoring deleted users."""
-    result = await session.execute(select(User).where(User.id == user_id, User.is_deleted == False))
-    user = result.scalars().first()
+    """Retrieve user by ID, ignoring deleted users. Served from the cache when possible."""
+
+    async def load() -> UserRead | None:
+        result = await session.execute(active_user_query(user_id))
+        user = result.scalars().first()
+        return to_user_read(user) if user else None
+
+    user = await get_cache().get_or_load(USER, user_id, "read", UserRead, load)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    return to_user_read(user)
+    return user
+
+
+async def get_user_public(session: AsyncSession, user_id: int) -> UserPublic | None:
+    """
+    Return the public part of a user's profile, e.g. an order's owner.
+
+    Deleted users are included, as their orders still reference them.
+    Served from the cache when possible.
+    """
+
+    async def load() -> UserPublic | None:
+        result = await session.execute(select(User.id, User.username).where(User.id == user_id))
+        row = result.first()
+        return UserPublic(id=row.id, username=row.username) if row else None
+
+    return await get_cache().get_or_load(USER, user_id, "public", UserPublic, load)
 
 
 async def get_user_entity_by_id(session: AsyncSession, user_id: int) -> User:
     """Return raw User ORM object (including password)"""
-    result = await session.execute(select(User).where(User.id == user_id, User.is_deleted == False))
+    result = await session.execute(active_user_query(user_id))
     user = result.scalars().first()
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
@@ -82,7 +182,7 @@ async def get_user_entity_by_id(session: AsyncSession, user_id: int) -> User:
 
 async def update_user(session: AsyncSession, user_id: int, user_data: UserUpdate) -> UserRead:
     """Update user fields."""
-    result = await session.execute(select(User).where(User.id == user_id, User.is_deleted == False))
+    result = await session.execute(active_user_query(user_id))
     user = result.scalars().first()
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
@@ -94,10 +194,7 @@ async def update_user(session: AsyncSession, user_id: int, user_data: UserUpdate
     if user_data.role is not None:
         user.role = user_data.role
     if user_data.password is not None:
-        user.hashed_password = hash_password(user_data.password)
-
-    if user_data.avatar_url is not None:
-        user.avatar_url = user_data.avatar_url
+        user.hashed_password = await hash_password_async(user_data.password)
 
     if user_data.bio is not None:
         user.bio = user_data.bio
@@ -108,11 +205,16 @@ async def update_user(session: AsyncSession, user_id: int, user_data: UserUpdate
     if user_data.experience is not None:
         user.experience = user_data.experience
 
-    if user_data.city is not None:
+    if user_data.city is not None and user_data.city != user.city:
+        # The owner's orders move to the new city's price buckets
+        await mark_price_guidance_stale(session, CareOrder.owner_id == user_id)
         user.city = user_data.city
+        await mark_price_guidance_stale(session, CareOrder.owner_id == user_id)
 
     await session.commit()
+    await get_cache().invalidate(USER, user_id)
     await session.refresh(user)
+    availability_filter.add_user(user.username, user.email)
     return to_user_read(user)
 
 
@@ -123,7 +225,7 @@ async def update_user_rating(
     rater_role: UserRole,
 ) -> User:
     """Update the user's rating based on who rates them."""
-    result = await session.execute(select(User).where(User.id == user_id, User.is_deleted == False))
+    result = await session.execute(active_user_query(user_id))
     user = result.scalars().first()
 
     if not user:
@@ -137,6 +239,7 @@ async def update_user_rating(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid rating operation")
 
     await session.commit()
+    await get_cache().invalidate(USER, user_id)
     await session.refresh(user)
     return user
 
@@ -151,7 +254,7 @@ async def get_user_by_token(session: AsyncSession, token: str) -> User:
     except JWTError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
-    result = await session.execute(select(User).where(User.id == int(user_id), User.is_deleted == False))
+    result = await session.execute(active_user_query(int(user_id)))
     user = result.scalars().first()
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
@@ -160,7 +263,7 @@ async def get_user_by_token(session: AsyncSession, token: str) -> User:
 
 async def delete_user(session: AsyncSession, user_id: int) -> bool:
     """Soft-delete user by setting is_deleted=True."""
-    result = await session.execute(select(User).where(User.id == user_id, User.is_deleted == False))
+    result = await session.execute(active_user_query(user_id))
     user = result.scalars().first()
     if not user:
         return False
@@ -171,4 +274,5 @@ async def delete_user(session: AsyncSession, user_id: int) -> bool:
         .values(is_deleted=True)
     )
     await session.commit()
+    await get_cache().invalidate(USER, user_id)
     return True
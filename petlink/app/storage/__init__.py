@@ -0,0 +1,72 @@
+"""
+Avatar storage backends.
+
+The backend is chosen by ``settings.avatar_storage`` and created once per
+process. The S3 backend is imported lazily, so aiobotocore is only needed
+when it is enabled.
+"""
+
+import os
+import tempfile
+
+from app.core.config import settings
+from app.storage.base import (
+    CONTENT_ADDRESSED_NAME,
+    IMMUTABLE_CACHE_CONTROL,
+    AvatarStorage,
+    cache_control_for,
+    content_type_for,
+)
+from app.storage.local import LocalAvatarStorage
+
+AVATAR_DIR = "static/avatars"
+
+_storage: AvatarStorage | None = None
+
+
+def get_avatar_storage() -> AvatarStorage:
+    """Return the process-wide avatar storage backend."""
+    global _storage
+    if _storage is None:
+        if settings.avatar_storage == "local":
+            _storage = LocalAvatarStorage(AVATAR_DIR)
+        elif settings.avatar_storage == "s3":
+            from app.storage.s3 import S3AvatarStorage
+
+            if not settings.s3_bucket:
+                raise RuntimeError("s3_bucket must be set when avatar_storage is 's3'")
+            _storage = S3AvatarStorage(
+                bucket=settings.s3_bucket,
+                staging_dir=os.path.join(tempfile.gettempdir(), "petlink-avatars"),
+                endpoint_url=settings.s3_endpoint_url,
+                region=settings.s3_region,
+                access_key_id=settings.s3_access_key_id,
+                secret_access_key=settings.s3_secret_access_key,
+                public_base_url=settings.s3_public_base_url,
+                presign_expires_seconds=settings.s3_presign_expires_seconds,
+                max_pool_connections=settings.s3_max_pool_connections,
+            )
+        else:
+            raise RuntimeError(f"Unknown avatar storage backend: {settings.avatar_storage}")
+    return _storage
+
+
+async def close_avatar_storage() -> None:
+    """Close the storage backend's pooled connections, if it was created."""
+    global _storage
+    if _storage is not None:
+        await _storage.close()
+        _storage = None
+
+
+__all__ = [
+    "AVATAR_DIR",
+    "AvatarStorage",
+    "CONTENT_ADDRESSED_NAME",
+    "IMMUTABLE_CACHE_CONTROL",
+    "LocalAvatarStorage",
+    "cache_control_for",
+    "close_avatar_storage",
+    "content_type_for",
+    "get_avatar_storage",
+]
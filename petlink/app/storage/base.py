@@ -0,0 +1,68 @@
+"""Storage interface for avatar files."""
+
+import re
+from abc import ABC, abstractmethod
+
+# "<sha256>.<ext>" originals and "<sha256>_<size>.<ext>" variants
+CONTENT_ADDRESSED_NAME = re.compile(
+    r"^(?P<digest>[0-9a-f]{64})(?:_(?P<size>\d+))?\.(?P<ext>jpg|png|webp)$"
+)
+# Content-addressed files never change under their key.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+CONTENT_TYPES = {
+    "jpg": "image/jpeg",
+    "png": "image/png",
+    "webp": "image/webp",
+}
+
+
+def content_type_for(key: str) -> str:
+    """Guess the content type of a stored avatar from its key."""
+    return CONTENT_TYPES.get(key.rsplit(".", 1)[-1].lower(), "application/octet-stream")
+
+
+def cache_control_for(key: str) -> str | None:
+    """Cache-Control for a stored avatar, or None for legacy names that get overwritten."""
+    if CONTENT_ADDRESSED_NAME.match(key):
+        return IMMUTABLE_CACHE_CONTROL
+    return None
+
+
+class AvatarStorage(ABC):
+    """
+    Where avatar originals and their variants live.
+
+    Keys are plain file names such as ``<sha256>.png`` or ``<sha256>_64.webp``.
+    Files are prepared on local disk in ``staging_dir`` and handed over with
+    ``save``, so uploads and thumbnails never keep whole images in memory.
+    """
+
+    staging_dir: str
+
+    @abstractmethod
+    async def save(self, key: str, source_path: str) -> None:
+        """Store a local file under ``key``. The source file is consumed."""
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        """Return True if ``key`` is stored."""
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """Delete the given keys, ignoring ones that do not exist."""
+
+    @abstractmethod
+    async def download(self, key: str, target_path: str) -> None:
+        """Copy a stored file to a local path."""
+
+    @abstractmethod
+    def local_path(self, key: str) -> str | None:
+        """Return the file path for ``key`` if it is on this node's disk."""
+
+    @abstractmethod
+    async def redirect_url(self, key: str) -> str | None:
+        """Return a URL clients should fetch ``key`` from, or None to serve it locally."""
+
+    async def close(self) -> None:
+        """Release pooled connections."""
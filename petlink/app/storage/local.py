@@ -0,0 +1,46 @@
+"""Avatar storage on the local filesystem."""
+
+import os
+import shutil
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.storage.base import AvatarStorage
+
+
+def _remove_paths(paths: list[str]) -> None:
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+class LocalAvatarStorage(AvatarStorage):
+    """
+    Stores avatars in a directory on this node.
+
+    Staging happens in the same directory, so saving is an atomic rename.
+    Suitable for a single node or a shared volume.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.staging_dir = root
+        os.makedirs(root, exist_ok=True)
+
+    def local_path(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    async def save(self, key: str, source_path: str) -> None:
+        await run_in_threadpool(os.replace, source_path, self.local_path(key))
+
+    async def exists(self, key: str) -> bool:
+        return await run_in_threadpool(os.path.exists, self.local_path(key))
+
+    async def delete(self, *keys: str) -> None:
+        await run_in_threadpool(_remove_paths, [self.local_path(key) for key in keys])
+
+    async def download(self, key: str, target_path: str) -> None:
+        await run_in_threadpool(shutil.copyfile, self.local_path(key), target_path)
+
+    async def redirect_url(self, key: str) -> None:
+        return None
@@ -0,0 +1,173 @@
+"""
+Avatar storage in an S3-compatible object store.
+
+Uses one long-lived aiobotocore client per process, so connections are pooled
+across requests. Clients are redirected to the bucket (public base URL or a
+pre-signed URL), so API workers never proxy image bytes.
+"""
+
+import asyncio
+import os
+
+from aiobotocore.config import AioConfig
+from aiobotocore.session import get_session
+from botocore.exceptions import ClientError
+from fastapi.concurrency import run_in_threadpool
+
+from app.storage.base import AvatarStorage, cache_control_for, content_type_for
+
+# S3 requires parts of at least 5 MiB, except the last one.
+MULTIPART_PART_SIZE = 8 * 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DELETE_BATCH_SIZE = 1000
+
+
+def _read_part(path: str, offset: int, size: int) -> bytes:
+    with open(path, "rb") as source:
+        source.seek(offset)
+        return source.read(size)
+
+
+def _object_headers(key: str) -> dict[str, str]:
+    """
+    Metadata stored with an object and returned by S3 on every GET, so that
+    a CDN or the browser caches content-addressed avatars for good.
+    """
+    headers = {"ContentType": content_type_for(key)}
+    cache_control = cache_control_for(key)
+    if cache_control is not None:
+        headers["CacheControl"] = cache_control
+    return headers
+
+
+def _remove(path: str) -> None:
+    if os.path.exists(path):
+        os.remove(path)
+
+
+class S3AvatarStorage(AvatarStorage):
+    """Stores avatars as objects in an S3 bucket."""
+
+    def __init__(
+        self,
+        bucket: str,
+        staging_dir: str,
+        endpoint_url: str | None = None,
+        region: str = "us-east-1",
+        access_key_id: str | None = None,
+        secret_access_key: str | None = None,
+        public_base_url: str | None = None,
+        presign_expires_seconds: int = 3600,
+        max_pool_connections: int = 20,
+    ):
+        self.bucket = bucket
+        self.staging_dir = staging_dir
+        self.public_base_url = public_base_url.rstrip("/") if public_base_url else None
+        self.presign_expires_seconds = presign_expires_seconds
+        self._client_options = {
+            "endpoint_url": endpoint_url,
+            "region_name": region,
+            "aws_access_key_id": access_key_id,
+            "aws_secret_access_key": secret_access_key,
+            "config": AioConfig(max_pool_connections=max_pool_connections),
+        }
+        self._session = get_session()
+        self._client_context = None
+        self._client = None
+        self._lock = asyncio.Lock()
+        os.makedirs(staging_dir, exist_ok=True)
+
+    async def _get_client(self):
+        if self._client is None:
+            async with self._lock:
+                if self._client is None:
+                    context = self._session.create_client("s3", **self._client_options)
+                    self._client = await context.__aenter__()
+                    self._client_context = context
+        return self._client
+
+    def local_path(self, key: str) -> None:
+        return None
+
+    async def save(self, key: str, source_path: str) -> None:
+        client = await self._get_client()
+        size = await run_in_threadpool(os.path.getsize, source_path)
+        headers = _object_headers(key)
+        try:
+            if size <= MULTIPART_PART_SIZE:
+                body = await run_in_threadpool(_read_part, source_path, 0, size)
+                await client.put_object(Bucket=self.bucket, Key=key, Body=body, **headers)
+            else:
+                await self._multipart_upload(client, key, source_path, size, headers)
+        finally:
+            await run_in_threadpool(_remove, source_path)
+
+    async def _multipart_upload(self, client, key, source_path, size, headers) -> None:
+        upload = await client.create_multipart_upload(Bucket=self.bucket, Key=key, **headers)
+        upload_id = upload["UploadId"]
+        parts = []
+        try:
+            for number, offset in enumerate(range(0, size, MULTIPART_PART_SIZE), start=1):
+                body = await run_in_threadpool(
+                    _read_part, source_path, offset, MULTIPART_PART_SIZE
+                )
+                part = await client.upload_part(
+                    Bucket=self.bucket, Key=key, UploadId=upload_id,
+                    PartNumber=number, Body=body,
+                )
+                parts.append({"PartNumber": number, "ETag": part["ETag"]})
+            await client.complete_multipart_upload(
+                Bucket=self.bucket, Key=key, UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            await client.abort_multipart_upload(
+                Bucket=self.bucket, Key=key, UploadId=upload_id
+            )
+            raise
+
+    async def exists(self, key: str) -> bool:
+        client = await self._get_client()
+        try:
+            await client.head_object(Bucket=self.bucket, Key=key)
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
+    async def delete(self, *keys: str) -> None:
+        client = await self._get_client()
+        for start in range(0, len(keys), DELETE_BATCH_SIZE):
+            batch = keys[start:start + DELETE_BATCH_SIZE]
+            await client.delete_objects(
+                Bucket=self.bucket,
+                Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+            )
+
+    async def download(self, key: str, target_path: str) -> None:
+        client = await self._get_client()
+        response = await client.get_object(Bucket=self.bucket, Key=key)
+        target = await run_in_threadpool(open, target_path, "wb")
+        try:
+            async with response["Body"] as body:
+                async for chunk in body.iter_chunks(DOWNLOAD_CHUNK_SIZE):
+                    await run_in_threadpool(target.write, chunk)
+        finally:
+            await run_in_threadpool(target.close)
+
+    async def redirect_url(self, key: str) -> str:
+        if self.public_base_url:
+            return f"{self.public_base_url}/{key}"
+        client = await self._get_client()
+        return await client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": key},
+            ExpiresIn=self.presign_expires_seconds,
+        )
+
+    async def close(self) -> None:
+        if self._client_context is not None:
+            await self._client_context.__aexit__(None, None, None)
+            self._client_context = None
+            self._client = None
@@ -0,0 +1 @@
+"""Load tests (``benchmarks.load``) and microbenchmarks (``benchmarks.micro``)."""
@@ -0,0 +1,59 @@
+"""
+Helpers shared by the benchmarks.
+
+``configure_benchmark_settings`` installs settings that need no ``.env``,
+and ``bind_database`` points the app at the benchmark database before its
+lifespan would create an engine of its own.
+"""
+
+import os
+import subprocess
+
+# Settings insist on a PostgreSQL DSN; a SQLite run never connects to it.
+PLACEHOLDER_DATABASE_URL = "postgresql+asyncpg://benchmark@localhost/unused"
+DEFAULT_DATABASE_URL = "sqlite+aiosqlite:///./benchmark.db"
+
+
+def configure_benchmark_settings(database_url: str):
+    """Install app settings for a benchmark run and return them."""
+    from app.core.config import Settings, configure_settings
+
+    settings = Settings(
+        database_url=database_url if database_url.startswith("postgresql") else PLACEHOLDER_DATABASE_URL,
+        secret_key=os.environ.get("SECRET_KEY", "benchmark-secret-key"),
+    )
+    configure_settings(settings)
+    return settings
+
+
+def bind_database(database_url: str):
+    """Create an engine for ``database_url`` and make the app use it."""
+    from app.db import database
+
+    connect_args = {}
+    if database_url.startswith("sqlite"):
+        # Concurrent writers queue on SQLite's file lock instead of failing.
+        connect_args["timeout"] = 30
+    return database.init_engine(database_url, echo=False, connect_args=connect_args)
+
+
+async def reset_schema(engine) -> None:
+    """Drop and recreate all tables, then release the connections."""
+    from app.models import Base
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    # The app may run on another event loop (see --mode serve).
+    await engine.dispose()
+
+
+def git_commit() -> str | None:
+    """Return the checked out commit, if this is a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
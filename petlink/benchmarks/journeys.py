@@ -0,0 +1,172 @@
+"""
+Scripted user journeys for the load test.
+
+Every virtual user registers and logs in, then repeats its role's journey
+until the run ends. Requests are labelled with their route template, so
+results line up with the ``/metrics`` series.
+"""
+
+import asyncio
+import random
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+PASSWORD = "benchmark-password"
+# Chance that an owner accepts a pending proposal on an iteration
+ACCEPT_PROBABILITY = 0.3
+
+
+class Pacer:
+    """Spread requests evenly at ``rate`` per second; 0 means no limit."""
+
+    def __init__(self, rate: float):
+        self._interval = 1 / rate if rate > 0 else 0.0
+        self._next = 0.0
+
+    async def wait(self) -> None:
+        if not self._interval:
+            return
+        now = time.perf_counter()
+        slot = max(now, self._next)
+        self._next = slot + self._interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class Recorder:
+    """Latencies and status codes per request label."""
+
+    def __init__(self, client: httpx.AsyncClient, pacer: Pacer):
+        self.client = client
+        self.pacer = pacer
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.statuses: dict[str, Counter] = defaultdict(Counter)
+
+    @property
+    def requests(self) -> int:
+        return sum(len(values) for values in self.latencies.values())
+
+    async def request(self, label: str, method: str, url: str, **kwargs) -> httpx.Response | None:
+        await self.pacer.wait()
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError as exc:
+            self.latencies[label].append(time.perf_counter() - started)
+            self.statuses[label][type(exc).__name__] += 1
+            return None
+        self.latencies[label].append(time.perf_counter() - started)
+        self.statuses[label][str(response.status_code)] += 1
+        return response if response.is_success else None
+
+
+class VirtualUser:
+    """A registered user repeating the journey of its role."""
+
+    role: str
+
+    def __init__(self, recorder: Recorder, rng: random.Random, name: str):
+        self.recorder = recorder
+        self.rng = rng
+        self.name = name
+        self.user_id: int | None = None
+        self.headers: dict[str, str] = {}
+
+    async def sign_up(self) -> bool:
+        response = await self.recorder.request(
+            "POST /users/", "POST", "/users/",
+            json={
+                "username": self.name,
+                "email": f"{self.name}@benchmark.petlink.dev",
+                "password": PASSWORD,
+                "role": self.role,
+            },
+        )
+        if response is None:
+            return False
+        self.user_id = response.json()["id"]
+        response = await self.recorder.request(
+            "POST /auth/login", "POST", "/auth/login",
+            json={"username": self.name, "password": PASSWORD},
+        )
+        if response is None:
+            return False
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        return True
+
+    async def get(self, label: str, url: str, **params) -> httpx.Response | None:
+        return await self.recorder.request(label, "GET", url, params=params, headers=self.headers)
+
+    async def post(self, label: str, url: str, payload: dict) -> httpx.Response | None:
+        return await self.recorder.request(label, "POST", url, json=payload, headers=self.headers)
+
+    async def chat(self, order_id: int) -> None:
+        await self.get("GET /messages/", "/messages/", order_id=order_id)
+        await self.post("POST /messages/", "/messages/", {
+            "order_id": order_id,
+            "sender_id": self.user_id,
+            "content": f"Message from {self.name} at {datetime.now(timezone.utc):%H:%M:%S}",
+        })
+
+    async def iterate(self) -> None:
+        raise NotImplementedError
+
+
+class OwnerJourney(VirtualUser):
+    """Post an order, review its proposals, accept one now and then, and chat."""
+
+    role = "owner"
+
+    async def iterate(self) -> None:
+        start = datetime.now(timezone.utc) + timedelta(days=self.rng.randint(1, 30))
+        response = await self.post("POST /care_orders/", "/care_orders/", {
+            "title": f"Walk and feed, order by {self.name}",
+            "description": "Two walks a day, dry food in the evening.",
+            "start_date": start.isoformat(),
+            "end_date": (start + timedelta(days=self.rng.randint(1, 7))).isoformat(),
+        })
+        if response is None:
+            return
+        order_id = response.json()["id"]
+        await self.get("GET /dashboard/", "/dashboard/")
+
+        # Review proposals on one of the orders sitters had time to bid on.
+        mine = await self.get("GET /care_orders/", "/care_orders/", status="open", limit=20)
+        if mine is not None and mine.json():
+            order_id = self.rng.choice(mine.json())["id"]
+        proposals = await self.get("GET /proposals/", "/proposals/", order_id=order_id, status="pending")
+        if proposals is not None and proposals.json() and self.rng.random() < ACCEPT_PROBABILITY:
+            proposal_id = self.rng.choice(proposals.json())["id"]
+            await self.post(
+                "POST /proposals/{proposal_id}/accept", f"/proposals/{proposal_id}/accept", {}
+            )
+        await self.chat(order_id)
+
+
+class PetsitterJourney(VirtualUser):
+    """Browse open orders, bid on one, chat about it and check own bids."""
+
+    role = "petsitter"
+
+    async def iterate(self) -> None:
+        response = await self.get("GET /care_orders/", "/care_orders/", limit=20)
+        if response is None or not response.json():
+            # Nothing to bid on yet; give owners a moment.
+            await asyncio.sleep(0.1)
+            return
+        order_id = self.rng.choice(response.json())["id"]
+        await self.get("GET /care_orders/{order_id}", f"/care_orders/{order_id}")
+        await self.post("POST /proposals/", "/proposals/", {
+            "order_id": order_id,
+            "petsitter_id": self.user_id,
+            "price": round(self.rng.uniform(10, 100), 2),
+            "comment": "Happy to help, I have a garden.",
+        })
+        await self.chat(order_id)
+        await self.get("GET /proposals/me", "/proposals/me", limit=20)
+
+
+JOURNEYS = {journey.role: journey for journey in (OwnerJourney, PetsitterJourney)}
@@ -0,0 +1,304 @@
+"""
+Load test driving PetLink through scripted user journeys.
+
+Owners post orders, review and accept proposals and chat; petsitters
+browse open orders, bid and chat (see ``benchmarks.journeys``). Run from
+the ``petlink`` directory::
+
+    python -m benchmarks.load --users 40 --mix owner=1,petsitter=3 --duration 60
+
+Modes:
+
+- ``asgi`` (default) calls the app in-process, without a network stack.
+- ``serve`` starts uvicorn in this process and goes over real HTTP.
+- ``http`` targets a server that is already running at ``--base-url``;
+  start it with ``RATE_LIMIT_ENABLED=false``.
+
+``asgi`` and ``serve`` recreate the schema of ``--database-url`` first:
+a SQLite file by default, or a local PostgreSQL database. Results are
+written as JSON; pass an earlier result as ``--baseline`` to compare.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import platform
+import random
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.common import (
+    DEFAULT_DATABASE_URL,
+    bind_database,
+    configure_benchmark_settings,
+    git_commit,
+    reset_schema,
+)
+
+RESULTS_DIR = Path(__file__).parent / "results"
+STATEMENT_COUNT_METRIC = "db_statement_duration_seconds"
+
+
+def parse_mix(raw: str) -> dict[str, float]:
+    """Parse ``owner=1,petsitter=3`` into role weights."""
+    from benchmarks.journeys import JOURNEYS
+
+    mix = {}
+    for part in raw.split(","):
+        role, _, weight = part.partition("=")
+        role = role.strip()
+        if role not in JOURNEYS:
+            raise argparse.ArgumentTypeError(f"Unknown role {role!r}, expected one of {sorted(JOURNEYS)}")
+        mix[role] = float(weight or 1)
+    return mix
+
+
+def assign_roles(users: int, mix: dict[str, float]) -> list[str]:
+    """Split ``users`` between roles in proportion to the mix, at least one each."""
+    total = sum(mix.values())
+    counts = {role: max(1, round(users * weight / total)) for role, weight in mix.items()}
+    return [role for role, count in counts.items() for _ in range(count)]
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    return values[max(0, math.ceil(q / 100 * len(values)) - 1)]
+
+
+def step_stats(latencies: list[float], statuses: dict[str, int]) -> dict:
+    values = sorted(latencies)
+    return {
+        "count": len(values),
+        "errors": sum(n for code, n in statuses.items() if not code.startswith("2")),
+        "statuses": dict(sorted(statuses.items())),
+        "mean_ms": round(sum(values) / len(values) * 1000, 3),
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3),
+    }
+
+
+async def statement_counts(client) -> dict[str, float]:
+    """Read the app's SQL statement counters from ``/metrics``."""
+    from prometheus_client.parser import text_string_to_metric_families
+
+    response = await client.get("/metrics")
+    response.raise_for_status()
+    counts = {}
+    for family in text_string_to_metric_families(response.text):
+        if family.name == STATEMENT_COUNT_METRIC:
+            for sample in family.samples:
+                if sample.name.endswith("_count"):
+                    counts[sample.labels["operation"]] = sample.value
+    return counts
+
+
+async def run_journeys(client, args) -> dict:
+    from benchmarks.journeys import JOURNEYS, Pacer, Recorder
+
+    rng = random.Random(args.seed)
+    run_id = uuid.uuid4().hex[:8]
+    recorder = Recorder(client, Pacer(args.rate))
+    users = [
+        JOURNEYS[role](recorder, random.Random(rng.random()), f"bench_{run_id}_{index}")
+        for index, role in enumerate(assign_roles(args.users, args.mix))
+    ]
+
+    signup_started = time.perf_counter()
+    signed_up = await asyncio.gather(*(user.sign_up() for user in users))
+    signup_seconds = time.perf_counter() - signup_started
+    active = [user for user, ok in zip(users, signed_up) if ok]
+    if not active:
+        raise SystemExit("No virtual user could sign up; is the server reachable?")
+
+    # Steady state only: throughput and query counts leave out bcrypt-heavy signup.
+    statements_before = await statement_counts(client)
+    requests_before = recorder.requests
+    started = time.perf_counter()
+    deadline = started + args.duration
+
+    async def drive(user) -> None:
+        while time.perf_counter() < deadline:
+            await user.iterate()
+
+    await asyncio.gather(*(drive(user) for user in active))
+    elapsed = time.perf_counter() - started
+    statements_after = await statement_counts(client)
+
+    requests = recorder.requests - requests_before
+    statements = {
+        operation: statements_after.get(operation, 0) - statements_before.get(operation, 0)
+        for operation in statements_after
+    }
+    steps = {
+        label: step_stats(recorder.latencies[label], recorder.statuses[label])
+        for label in sorted(recorder.latencies)
+    }
+    return {
+        "summary": {
+            "virtual_users": len(active),
+            "signup_seconds": round(signup_seconds, 3),
+            "duration_seconds": round(elapsed, 3),
+            "requests": requests,
+            "errors": sum(step["errors"] for step in steps.values()),
+            "throughput_rps": round(requests / elapsed, 2),
+            "db_queries_per_request": round(sum(statements.values()) / max(requests, 1), 2),
+            "db_queries_by_operation": {op: int(n) for op, n in sorted(statements.items())},
+        },
+        "steps": steps,
+    }
+
+
+async def run_asgi(args) -> dict:
+    import httpx
+
+    from app.main import create_app
+
+    app = create_app()
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://petlink") as client:
+            return await run_journeys(client, args)
+
+
+async def run_http(args, base_url: str) -> dict:
+    import httpx
+
+    limits = httpx.Limits(max_connections=args.users * 2)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        return await run_journeys(client, args)
+
+
+def start_server(port: int, engine):
+    """Run uvicorn in a background thread and wait until it accepts requests."""
+    import uvicorn
+
+    from app.main import create_app
+
+    server = uvicorn.Server(uvicorn.Config(create_app(), host="127.0.0.1", port=port, log_level="warning"))
+
+    async def serve() -> None:
+        try:
+            await server.serve()
+        finally:
+            # Pooled connections belong to this thread's event loop.
+            await engine.dispose()
+
+    thread = threading.Thread(target=asyncio.run, args=(serve(),), name="benchmark-server", daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise SystemExit(f"Server failed to start on port {port}")
+        time.sleep(0.05)
+    return server, thread
+
+
+def compare(result: dict, baseline: dict) -> None:
+    """Print throughput and per-step p95 changes against a baseline run."""
+
+    def change(new: float, old: float) -> str:
+        return f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+
+    new, old = result["summary"], baseline["summary"]
+    print(f"\nAgainst {baseline['meta'].get('commit')} ({baseline['meta']['started_at']}):")
+    print(f"  throughput      {new['throughput_rps']:>10} rps  {change(new['throughput_rps'], old['throughput_rps'])}")
+    print(f"  queries/request {new['db_queries_per_request']:>10}      "
+          f"{change(new['db_queries_per_request'], old['db_queries_per_request'])}")
+    for label, step in result["steps"].items():
+        before = baseline["steps"].get(label)
+        if before:
+            print(f"  {label:<40} p95 {step['p95_ms']:>9} ms  {change(step['p95_ms'], before['p95_ms'])}")
+
+
+def report(result: dict) -> None:
+    summary = result["summary"]
+    print(
+        f"{summary['requests']} requests in {summary['duration_seconds']} s: "
+        f"{summary['throughput_rps']} rps, {summary['errors']} errors, "
+        f"{summary['db_queries_per_request']} DB queries/request"
+    )
+    print(f"{'step':<40} {'count':>7} {'err':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for label, step in result["steps"].items():
+        print(
+            f"{label:<40} {step['count']:>7} {step['errors']:>5} "
+            f"{step['p50_ms']:>9} {step['p95_ms']:>9} {step['p99_ms']:>9}"
+        )
+
+
+async def main(args) -> dict:
+    if args.mode == "http":
+        return await run_http(args, args.base_url)
+
+    settings = configure_benchmark_settings(args.database_url)
+    # The load test would mostly measure the limiter turning it away.
+    settings.rate_limit_enabled = False
+    engine = bind_database(args.database_url)
+    await reset_schema(engine)
+    if args.mode == "asgi":
+        try:
+            return await run_asgi(args)
+        finally:
+            await engine.dispose()
+
+    server, thread = start_server(args.port, engine)
+    try:
+        return await run_http(args, f"http://127.0.0.1:{args.port}")
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Load test PetLink with scripted user journeys.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--mode", choices=("asgi", "serve", "http"), default="asgi")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000", help="server for --mode http")
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL,
+                        help="database recreated for --mode asgi/serve")
+    parser.add_argument("--port", type=int, default=8089, help="port for --mode serve")
+    parser.add_argument("--users", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--mix", type=parse_mix, default="owner=1,petsitter=3",
+                        help="relative share of each role")
+    parser.add_argument("--rate", type=float, default=0,
+                        help="max requests per second over all users, 0 for no limit")
+    parser.add_argument("--duration", type=float, default=30, help="seconds of steady load")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, help="result file, by default under benchmarks/results/")
+    parser.add_argument("--baseline", type=Path, help="earlier result to compare against")
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    started_at = datetime.now(timezone.utc)
+    result = {
+        "meta": {
+            "commit": git_commit(),
+            "started_at": started_at.isoformat(timespec="seconds"),
+            "mode": args.mode,
+            "target": args.base_url if args.mode == "http" else args.database_url.split("://")[0],
+            "users": args.users,
+            "mix": args.mix,
+            "rate": args.rate,
+            "duration": args.duration,
+            "seed": args.seed,
+            "python": platform.python_version(),
+        },
+        **asyncio.run(main(args)),
+    }
+    report(result)
+
+    output = args.output or RESULTS_DIR / f"load-{started_at:%Y%m%dT%H%M%S}-{result['meta']['commit'] or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2) + "\n")
+    print(f"\nResults written to {output}", file=sys.stderr)
+    if args.baseline:
+        compare(result, json.loads(args.baseline.read_text()))
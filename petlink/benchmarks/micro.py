@@ -0,0 +1,308 @@
+"""
+Microbenchmarks for service and serialization hot paths.
+
+Each benchmark is calibrated to a loop count that runs for at least
+``--min-time`` seconds, warmed up, then sampled ``--samples`` times with
+the garbage collector paused. The median time per call is what runs are
+compared on. Run from the ``petlink`` directory::
+
+    python -m benchmarks.micro
+    python -m benchmarks.micro --baseline benchmarks/results/micro-....json --threshold 10
+
+With ``--baseline``, the exit status is 1 if any benchmark's median got
+slower by more than ``--threshold`` percent, so the suite can gate
+dependency upgrades.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from benchmarks.common import bind_database, configure_benchmark_settings, git_commit, reset_schema
+
+RESULTS_DIR = Path(__file__).parent / "results"
+PAGE_SIZE = 100
+# Open orders in the order feed snapshot ranked per call
+FEED_ORDERS = 100_000
+
+
+@dataclass
+class Benchmark:
+    name: str
+    # Runs the benchmarked call `loops` times and returns the elapsed seconds
+    run: Callable[[int], float]
+
+
+def timed(func: Callable[[], object]) -> Callable[[int], float]:
+    def run(loops: int) -> float:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        return time.perf_counter() - started
+
+    return run
+
+
+def timed_async(loop: asyncio.AbstractEventLoop, func: Callable[[], Awaitable]) -> Callable[[int], float]:
+    async def many(loops: int) -> float:
+        started = time.perf_counter()
+        for _ in range(loops):
+            await func()
+        return time.perf_counter() - started
+
+    return lambda loops: loop.run_until_complete(many(loops))
+
+
+def measure(benchmark: Benchmark, min_time: float, warmup: int, samples: int) -> dict:
+    """Calibrate, warm up and sample one benchmark; times are per call."""
+    loops = 1
+    while benchmark.run(loops) < min_time:
+        loops *= 2
+
+    timings = []
+    for index in range(warmup + samples):
+        gc.collect()
+        gc.disable()
+        try:
+            elapsed = benchmark.run(loops)
+        finally:
+            gc.enable()
+        if index >= warmup:
+            timings.append(elapsed / loops)
+
+    q1, _, q3 = statistics.quantiles(timings, n=4)
+    return {
+        "loops": loops,
+        "median_us": round(statistics.median(timings) * 1e6, 3),
+        "mean_us": round(statistics.fmean(timings) * 1e6, 3),
+        "stdev_us": round(statistics.stdev(timings) * 1e6, 3),
+        "min_us": round(min(timings) * 1e6, 3),
+        "iqr_us": round((q3 - q1) * 1e6, 3),
+    }
+
+
+def build_benchmarks(loop: asyncio.AbstractEventLoop, database_url: str) -> list[Benchmark]:
+    """Set up fixtures and return the benchmarks, in reporting order."""
+    from pydantic import TypeAdapter
+    from sqlalchemy.dialects import postgresql
+
+    from app.core import security
+    from app.core.config import settings
+    from app.db import database
+    from app.feed import OrderRow, OrderSnapshot, SitterContext
+    from app.feed.ranking import score, top
+    from app.models.care_order import CareOrder, OrderStatus
+    from app.models.message import Message
+    from app.models.user import User, UserRole
+    from app.schemas.care_order import CareOrderRead
+    from app.schemas.message import MessageRead
+    from app.services import auth_service
+    from app.services.care_order_service import build_care_orders_query
+    from app.services.user_service import get_user_by_id, get_user_by_token, to_user_read
+
+    now = datetime.now(timezone.utc)
+    owner = User(
+        id=1, username="owner", email="owner@example.com", hashed_password="x",
+        role=UserRole.owner, owner_rating=4.5, petsitter_rating=0.0, is_deleted=False,
+        avatar_url="/static/avatars/1.png", avatar_variants_ready=True,
+        bio="Two cats and a dog.", pets="cats, dog", experience=None, city="Berlin",
+    )
+    sitter = User(id=2, username="sitter", role=UserRole.petsitter)
+    orders = [
+        CareOrder(
+            id=index, owner_id=owner.id, owner=owner, title=f"Order {index}",
+            description="Feed twice a day.", start_date=now + timedelta(days=index),
+            end_date=now + timedelta(days=index + 3), status=OrderStatus.open, created_at=now,
+        )
+        for index in range(PAGE_SIZE)
+    ]
+    messages = [
+        Message(
+            id=index, sender_id=sitter.id, sender=sitter, order_id=1,
+            content=f"Message number {index}", created_at=now,
+        )
+        for index in range(PAGE_SIZE)
+    ]
+    order_page = TypeAdapter(list[CareOrderRead])
+    message_page = TypeAdapter(list[MessageRead])
+    access_token = security.create_access_token(str(owner.id))
+    pg_dialect = postgresql.asyncpg.dialect()
+
+    rng = random.Random(0)
+    feed_snapshot = OrderSnapshot.from_rows([
+        OrderRow(
+            id=index, city=f"City {rng.randrange(50)}",
+            start_date=now + timedelta(hours=rng.randrange(1, 2000)),
+            end_date=now + timedelta(hours=rng.randrange(2000, 2300)),
+            created_at=now - timedelta(hours=rng.randrange(500)),
+            owner_rating=rng.uniform(0, 5), proposal_count=rng.randrange(20),
+        )
+        for index in range(1, FEED_ORDERS + 1)
+    ])
+    feed_sitter = SitterContext(
+        city="City 7", available_from=now.timestamp(), available_to=(now + timedelta(days=30)).timestamp(),
+        excluded_order_ids=list(range(1, 200)),
+    )
+
+    def rank_feed() -> None:
+        scores = score(
+            feed_snapshot, feed_sitter, settings.order_feed_weights,
+            settings.order_feed_recency_half_life_hours * 3600, now.timestamp(),
+        )
+        top(feed_snapshot, scores, PAGE_SIZE)
+
+    engine = bind_database(database_url)
+
+    async def seed() -> None:
+        await reset_schema(engine)
+        async with database.AsyncSessionLocal() as session:
+            session.add(User(
+                id=owner.id, username=owner.username, email=owner.email,
+                hashed_password="x", role=UserRole.owner,
+            ))
+            await session.commit()
+
+    loop.run_until_complete(seed())
+
+    async def user_by_token() -> None:
+        async with database.AsyncSessionLocal() as session:
+            await get_user_by_token(session, access_token)
+
+    async def user_by_id() -> None:
+        async with database.AsyncSessionLocal() as session:
+            await get_user_by_id(session, owner.id)
+
+    def compile_list_query() -> None:
+        build_care_orders_query(owner, status_filter="open", start_date_from=now).compile(
+            dialect=pg_dialect
+        )
+
+    return [
+        Benchmark("user_service.to_user_read", timed(lambda: to_user_read(owner))),
+        Benchmark("security.create_access_token", timed(lambda: security.create_access_token("1"))),
+        Benchmark("security.decode_access_token", timed(lambda: security.decode_access_token(access_token))),
+        Benchmark("auth_service.create_access_token", timed(lambda: auth_service.create_access_token("1"))),
+        Benchmark(f"CareOrderRead validate {PAGE_SIZE} rows",
+                  timed(lambda: order_page.validate_python(orders, from_attributes=True))),
+        Benchmark(f"CareOrderRead validate+dump_json {PAGE_SIZE} rows",
+                  timed(lambda: order_page.dump_json(order_page.validate_python(orders, from_attributes=True)))),
+        Benchmark(f"MessageRead validate {PAGE_SIZE} rows",
+                  timed(lambda: message_page.validate_python(messages, from_attributes=True))),
+        Benchmark(f"MessageRead validate+dump_json {PAGE_SIZE} rows",
+                  timed(lambda: message_page.dump_json(message_page.validate_python(messages, from_attributes=True)))),
+        Benchmark("user_service.get_user_by_token (sqlite)", timed_async(loop, user_by_token)),
+        Benchmark("user_service.get_user_by_id (cache hit)", timed_async(loop, user_by_id)),
+        Benchmark("care_order_service.build_care_orders_query",
+                  timed(lambda: build_care_orders_query(owner, status_filter="open", start_date_from=now))),
+        Benchmark("care_order_service.build_care_orders_query+compile", timed(compile_list_query)),
+        Benchmark(f"order_feed rank {FEED_ORDERS} open orders", timed(rank_feed)),
+    ]
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Print median changes against a baseline; return the regressed benchmarks."""
+    regressed = []
+    print(f"\nAgainst {baseline['meta'].get('commit')} ({baseline['meta']['started_at']}), "
+          f"threshold {threshold}%:")
+    for name, stats in results.items():
+        before = baseline["benchmarks"].get(name)
+        if before is None:
+            print(f"  {name:<52} new")
+            continue
+        change = (stats["median_us"] - before["median_us"]) / before["median_us"] * 100
+        flag = ""
+        if change > threshold:
+            regressed.append(name)
+            flag = "  REGRESSION"
+        print(f"  {name:<52} {before['median_us']:>11} -> {stats['median_us']:>11} us  {change:+6.1f}%{flag}")
+    return regressed
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Microbenchmarks for PetLink hot paths.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds per sample")
+    parser.add_argument("--warmup", type=int, default=3, help="samples discarded before measuring")
+    parser.add_argument("--samples", type=int, default=15)
+    parser.add_argument("--database-url", help="database for DB-backed benchmarks, a temporary SQLite file by default")
+    parser.add_argument("--output", type=Path, help="result file, by default under benchmarks/results/")
+    parser.add_argument("--baseline", type=Path, help="earlier result to compare against")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="percent slowdown of a median that counts as a regression")
+    return parser
+
+
+def main(args) -> int:
+    started_at = datetime.now(timezone.utc)
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = args.database_url or f"sqlite+aiosqlite:///{tmp}/micro.db"
+        configure_benchmark_settings(database_url)
+        loop = asyncio.new_event_loop()
+        try:
+            benchmarks = build_benchmarks(loop, database_url)
+            results = {}
+            for benchmark in benchmarks:
+                if args.filter not in benchmark.name:
+                    continue
+                stats = results[benchmark.name] = measure(
+                    benchmark, args.min_time, args.warmup, args.samples
+                )
+                print(f"{benchmark.name:<52} {stats['median_us']:>11} us "
+                      f"(+- {stats['iqr_us']} IQR, {stats['loops']} loops)")
+        finally:
+            from app.db import database
+
+            loop.run_until_complete(database.engine.dispose())
+            loop.close()
+
+    output = {
+        "meta": {
+            "commit": git_commit(),
+            "started_at": started_at.isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pydantic": _version("pydantic"),
+            "sqlalchemy": _version("sqlalchemy"),
+            "min_time": args.min_time,
+            "warmup": args.warmup,
+            "samples": args.samples,
+        },
+        "benchmarks": results,
+    }
+    path = args.output or RESULTS_DIR / f"micro-{started_at:%Y%m%dT%H%M%S}-{output['meta']['commit'] or 'local'}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(output, indent=2) + "\n")
+    print(f"\nResults written to {path}", file=sys.stderr)
+
+    if args.baseline:
+        regressed = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+        if regressed:
+            print(f"\n{len(regressed)} benchmark(s) regressed by more than {args.threshold}%", file=sys.stderr)
+            return 1
+    return 0
+
+
+def _version(package: str) -> str | None:
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version(package)
+    except PackageNotFoundError:
+        return None
+
+
+if __name__ == "__main__":
+    sys.exit(main(build_parser().parse_args()))
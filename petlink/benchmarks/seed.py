@@ -0,0 +1,315 @@
+"""
+Synthetic data seeder for performance testing.
+
+Fills a freshly created schema with users, care orders, proposals and
+messages at production-like volume::
+
+    python -m benchmarks.seed --database-url postgresql+asyncpg://... --users 1000000
+
+Distributions:
+
+- cities follow a Zipf-like skew, and petsitters mostly bid in their own city
+- orders per owner and proposals per order are long-tailed
+- order dates match ``CareOrder`` semantics. Open orders start in the
+  future, in-progress ones span ``--now``, and completed ones have ended.
+  Every in-progress or completed order has exactly one accepted proposal.
+- many orders have no chat; the rest have Pareto-distributed chat lengths
+
+PostgreSQL is loaded with asyncpg ``COPY``, other databases with
+executemany batches. All users share one precomputed password hash, so
+hashing costs nothing and any seeded user logs in with ``SEED_PASSWORD``. The same ``--seed``
+and ``--now`` always produce the same rows.
+
+The target schema is dropped and recreated first.
+"""
+
+import argparse
+import asyncio
+import math
+import random
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.common import DEFAULT_DATABASE_URL, bind_database, configure_benchmark_settings, reset_schema
+
+SEED_PASSWORD = "seed-password"
+# bcrypt hash of SEED_PASSWORD, fixed so that seeded rows are reproducible
+SEED_PASSWORD_HASH = "$2b$12$2iK/bTyrDAlI3iQdJXd92OW5hpEkGngbUTRqepRdkFBBgC4Z9pZOq"
+
+CITIES = [
+    "Moscow", "Saint Petersburg", "Berlin", "Novosibirsk", "Yekaterinburg", "Kazan",
+    "Hamburg", "Munich", "Nizhny Novgorod", "Chelyabinsk", "Samara", "Omsk",
+    "Rostov-on-Don", "Ufa", "Krasnoyarsk", "Voronezh", "Perm", "Volgograd",
+    "Cologne", "Frankfurt",
+]
+# City of rank r gets weight 1 / r^1.1
+CITY_WEIGHTS = [1 / rank ** 1.1 for rank in range(1, len(CITIES) + 1)]
+
+ORDER_TITLES = [
+    "Walk my dog twice a day", "Cat sitting while I travel", "Feed the fish and water plants",
+    "Overnight stay with two dogs", "Check on my rabbit", "Puppy care for the weekend",
+    "Daily visits for an elderly cat", "Parrot sitting", "Long walks for an energetic husky",
+]
+MESSAGES = [
+    "Hi! Is the order still available?", "Sure, when can we meet?", "Here are the keys instructions.",
+    "How is he doing today?", "All good, we just came back from a walk.", "Thanks a lot!",
+    "Could you send a photo?", "Food is in the kitchen cupboard.", "She ate everything.",
+    "See you tomorrow at 9.",
+]
+
+# Columns written per table, in the order rows are generated
+COLUMNS = {
+    "users": (
+        "id", "username", "email", "hashed_password", "role", "owner_rating",
+        "petsitter_rating", "is_deleted", "avatar_variants_ready", "city",
+    ),
+    "care_orders": (
+        "id", "owner_id", "title", "description", "start_date", "end_date", "status", "created_at",
+    ),
+    "proposals": ("id", "order_id", "petsitter_id", "price", "comment", "status", "created_at"),
+    "messages": ("id", "sender_id", "order_id", "content", "created_at"),
+}
+# Flush order, so foreign keys always point at rows already loaded
+TABLES = tuple(COLUMNS)
+
+
+def long_tail(rng: random.Random, mean: float, minimum: int = 0) -> int:
+    """Geometric-like count with the given mean: mostly small, a few large."""
+    return max(minimum, int(rng.expovariate(1 / mean)) if mean > 0 else 0)
+
+
+class Loader:
+    """Buffers generated rows and bulk-loads them in foreign key order."""
+
+    def __init__(self, engine, batch_size: int):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.rows: dict[str, list[tuple]] = defaultdict(list)
+        self.loaded: dict[str, int] = defaultdict(int)
+        self._conn = None
+        self._raw = None
+
+    async def __aenter__(self) -> "Loader":
+        self._conn = await self.engine.connect()
+        if self.engine.dialect.name == "postgresql":
+            raw = await self._conn.get_raw_connection()
+            self._raw = raw.driver_connection
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        try:
+            if exc_info[0] is None:
+                await self.flush()
+                await self._finish()
+        finally:
+            await self._conn.close()
+
+    async def add(self, table: str, row: tuple) -> None:
+        rows = self.rows[table]
+        rows.append(row)
+        if len(rows) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        for table in TABLES:
+            rows = self.rows.pop(table, None)
+            if not rows:
+                continue
+            if self._raw is not None:
+                await self._raw.copy_records_to_table(table, records=rows, columns=COLUMNS[table])
+            else:
+                from app.models import Base
+
+                columns = COLUMNS[table]
+                await self._conn.execute(
+                    Base.metadata.tables[table].insert(), [dict(zip(columns, row)) for row in rows]
+                )
+                await self._conn.commit()
+            self.loaded[table] += len(rows)
+
+    async def _finish(self) -> None:
+        if self._raw is None:
+            return
+        # COPY bypasses the id sequences; move them past the loaded ids.
+        for table in TABLES:
+            await self._raw.execute(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"coalesce(max(id), 0) + 1, false) FROM {table}"
+            )
+        await self._raw.execute("ANALYZE")
+
+
+class Seeder:
+    """Deterministic row generator; see the module docstring for the shapes."""
+
+    def __init__(self, args, loader: Loader, password_hash: str):
+        self.args = args
+        self.loader = loader
+        self.password_hash = password_hash
+        self.rng = random.Random(args.seed)
+        self.now = args.now
+        self.owners: list[tuple[int, str]] = []
+        self.petsitters: list[int] = []
+        self.petsitters_by_city: dict[str, list[int]] = defaultdict(list)
+        self.next_id = defaultdict(lambda: 1)
+
+    def _id(self, table: str) -> int:
+        value = self.next_id[table]
+        self.next_id[table] = value + 1
+        return value
+
+    async def run(self) -> None:
+        await self.users()
+        for owner_id, city in self.owners:
+            for _ in range(long_tail(self.rng, self.args.orders_per_owner)):
+                await self.order(owner_id, city)
+
+    async def users(self) -> None:
+        rng = self.rng
+        for user_id in range(1, self.args.users + 1):
+            city = rng.choices(CITIES, CITY_WEIGHTS)[0]
+            is_petsitter = rng.random() < self.args.petsitter_share
+            if is_petsitter:
+                self.petsitters.append(user_id)
+                self.petsitters_by_city[city].append(user_id)
+            else:
+                self.owners.append((user_id, city))
+            rated = rng.random() < 0.7
+            await self.loader.add("users", (
+                user_id,
+                f"user{user_id}",
+                f"user{user_id}@seed.petlink.dev",
+                self.password_hash,
+                "petsitter" if is_petsitter else "owner",
+                round(rng.uniform(3.0, 5.0), 1) if rated and not is_petsitter else 0.0,
+                round(rng.uniform(3.0, 5.0), 1) if rated and is_petsitter else 0.0,
+                False,
+                False,
+                city,
+            ))
+
+    def _order_dates(self) -> tuple[datetime, datetime, datetime, str]:
+        rng = self.rng
+        created_at = self.now - timedelta(days=rng.uniform(0, self.args.history_days))
+        start = created_at + timedelta(hours=rng.uniform(1, 60 * 24))
+        end = start + timedelta(hours=rng.uniform(12, 21 * 24))
+        if end <= self.now:
+            status = "completed" if rng.random() < 0.85 else "canceled"
+        elif start <= self.now:
+            status = "in_progress"
+        else:
+            status = "open" if rng.random() < 0.9 else "canceled"
+        return created_at, start, end, status
+
+    def _petsitter(self, city: str) -> int:
+        local = self.petsitters_by_city.get(city)
+        if local and self.rng.random() < 0.8:
+            return self.rng.choice(local)
+        return self.rng.choice(self.petsitters)
+
+    async def order(self, owner_id: int, city: str) -> None:
+        rng = self.rng
+        order_id = self._id("care_orders")
+        created_at, start, end, status = self._order_dates()
+        await self.loader.add("care_orders", (
+            order_id, owner_id, rng.choice(ORDER_TITLES),
+            "Details will follow in the chat." if rng.random() < 0.5 else None,
+            start, end, status, created_at,
+        ))
+        if not self.petsitters:
+            return
+
+        staffed = status in ("in_progress", "completed")
+        count = long_tail(rng, self.args.proposals_per_order, minimum=1 if staffed else 0)
+        accepted = rng.randrange(count) if staffed else None
+        bid_until = min(start, self.now)
+        partner = None
+        for index in range(count):
+            petsitter_id = self._petsitter(city)
+            if index == accepted:
+                proposal_status, partner = "accepted", petsitter_id
+            elif staffed:
+                proposal_status = "rejected"
+            elif status == "canceled":
+                proposal_status = "canceled"
+            else:
+                proposal_status = "pending"
+            bid_at = created_at + (bid_until - created_at) * rng.random()
+            await self.loader.add("proposals", (
+                self._id("proposals"), order_id, petsitter_id,
+                round(rng.lognormvariate(math.log(30), 0.5), 2),
+                "I can do it." if rng.random() < 0.6 else None,
+                proposal_status,
+                # proposals.created_at has no time zone
+                bid_at.replace(tzinfo=None),
+            ))
+            partner = partner or petsitter_id
+
+        if partner is not None and rng.random() < self.args.chat_share:
+            await self.chat(order_id, owner_id, partner, created_at)
+
+    async def chat(self, order_id: int, owner_id: int, partner_id: int, since: datetime) -> None:
+        rng = self.rng
+        length = min(int(rng.paretovariate(1.2) * 2), self.args.max_messages)
+        sender, other = owner_id, partner_id
+        sent_at = since
+        for _ in range(length):
+            sent_at += timedelta(minutes=rng.expovariate(1 / 90))
+            if sent_at > self.now:
+                break
+            await self.loader.add("messages", (
+                self._id("messages"), sender, order_id, rng.choice(MESSAGES),
+                sent_at.replace(tzinfo=None),
+            ))
+            if rng.random() < 0.7:
+                sender, other = other, sender
+
+
+async def seed(args) -> dict[str, int]:
+    engine = bind_database(args.database_url)
+    try:
+        await reset_schema(engine)
+        async with Loader(engine, args.batch_size) as loader:
+            await Seeder(args, loader, SEED_PASSWORD_HASH).run()
+        return dict(loader.loaded)
+    finally:
+        await engine.dispose()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    parser = argparse.ArgumentParser(
+        description="Seed a PetLink database with synthetic data. Drops existing tables.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--petsitter-share", type=float, default=0.3)
+    parser.add_argument("--orders-per-owner", type=float, default=3.0, help="mean")
+    parser.add_argument("--proposals-per-order", type=float, default=4.0, help="mean")
+    parser.add_argument("--chat-share", type=float, default=0.6,
+                        help="share of orders with proposals that have a chat")
+    parser.add_argument("--max-messages", type=int, default=2000, help="longest chat")
+    parser.add_argument("--history-days", type=float, default=730,
+                        help="orders are created this far back from --now")
+    parser.add_argument("--now", type=datetime.fromisoformat, default=today,
+                        help="reference time for order dates and statuses")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    if args.now.tzinfo is None:
+        args.now = args.now.replace(tzinfo=timezone.utc)
+    configure_benchmark_settings(args.database_url)
+
+    started = time.perf_counter()
+    loaded = asyncio.run(seed(args))
+    elapsed = time.perf_counter() - started
+    for table in TABLES:
+        print(f"{table:<12} {loaded.get(table, 0):>12,}")
+    total = sum(loaded.values())
+    print(f"{total:,} rows in {elapsed:.1f} s ({total / elapsed:,.0f} rows/s); password: {SEED_PASSWORD}")
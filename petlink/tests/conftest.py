@@ -0,0 +1,99 @@
+"""
+Fixtures for the API tests.
+
+Tests run against a temporary SQLite database by default. Set
+``TEST_DATABASE_URL`` to a PostgreSQL database to run them there instead,
+including the tests that need PostgreSQL; its tables are dropped and
+recreated by every test.
+"""
+
+import os
+from itertools import count
+
+import httpx
+import pytest
+
+from app.core.config import Settings, configure_settings
+from app.db import database
+from app.models import Base
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+# Settings insist on a PostgreSQL DSN; a SQLite run never connects to it.
+PLACEHOLDER_DATABASE_URL = "postgresql+asyncpg://test@localhost/unused"
+PASSWORD = "password123"
+
+requires_postgres = pytest.mark.skipif(
+    not (TEST_DATABASE_URL or "").startswith("postgresql"),
+    reason="needs TEST_DATABASE_URL pointing at PostgreSQL",
+)
+
+_usernames = count(1)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def database_url(tmp_path) -> str:
+    return TEST_DATABASE_URL or f"sqlite+aiosqlite:///{tmp_path / 'test.db'}"
+
+
+@pytest.fixture
+def settings(database_url, tmp_path, monkeypatch) -> Settings:
+    # Avatars are stored relative to the working directory.
+    monkeypatch.chdir(tmp_path)
+    app_settings = Settings(
+        _env_file=None,
+        database_url=database_url if database_url.startswith("postgresql") else PLACEHOLDER_DATABASE_URL,
+        secret_key="test-secret-key",
+        database_warmup_enabled=False,
+        rate_limit_enabled=False,
+        cache_enabled=False,
+        status_scheduler_enabled=False,
+        availability_filter_enabled=False,
+        price_guidance_enabled=False,
+        order_feed_enabled=False,
+    )
+    configure_settings(app_settings)
+    return app_settings
+
+
+@pytest.fixture
+async def engine(settings, database_url):
+    connect_args = {"timeout": 30} if database_url.startswith("sqlite") else {}
+    engine = database.init_engine(database_url, echo=False, connect_args=connect_args)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await database.dispose_engine()
+
+
+@pytest.fixture
+async def client(engine):
+    from app.main import create_app
+
+    app = create_app()
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client
+
+
+async def register(client: httpx.AsyncClient, role: str = "owner", **fields) -> tuple[dict, dict]:
+    """Create a user and log in; returns the user and the auth headers."""
+    number = next(_usernames)
+    payload = {
+        "username": f"user{number}",
+        "email": f"user{number}@example.com",
+        "password": PASSWORD,
+        "role": role,
+        **fields,
+    }
+    response = await client.post("/users/", json=payload)
+    assert response.status_code == 201, response.text
+    login = await client.post("/auth/login", json={"username": payload["username"], "password": PASSWORD})
+    assert login.status_code == 200, login.text
+    return response.json(), {"Authorization": f"Bearer {login.json()['access_token']}"}
@@ -0,0 +1,155 @@
+import os
+
+import anyio
+import pytest
+from PIL import Image
+
+from app.services.avatar_service import MAX_FILE_SIZE
+from app.services.thumbnail_service import (
+    AVATAR_VARIANT_SIZES,
+    render_avatar_variants,
+    variant_keys,
+)
+from app.storage import AVATAR_DIR
+from tests.conftest import register
+
+pytestmark = pytest.mark.anyio
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+GIF = b"GIF89a" + b"\x00" * 64
+
+
+def staged_files() -> list[str]:
+    return [name for name in os.listdir(AVATAR_DIR) if name.startswith(".upload-")]
+
+
+async def test_upload_rejects_unsupported_image(client):
+    user, _ = await register(client)
+
+    response = await client.post(
+        f"/users/{user['id']}/avatar", files={"file": ("avatar.gif", GIF, "image/gif")}
+    )
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid file type"}
+    assert staged_files() == []
+
+
+async def test_upload_rejects_missing_file_field(client):
+    user, _ = await register(client)
+
+    response = await client.post(
+        f"/users/{user['id']}/avatar", files={"other": ("avatar.png", PNG, "image/png")}
+    )
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "No file uploaded"}
+    assert staged_files() == []
+
+
+async def test_upload_rejects_malformed_multipart(client):
+    user, _ = await register(client)
+
+    response = await client.post(
+        f"/users/{user['id']}/avatar",
+        content=b"--xyz\r\nnot a part header\r\n\r\n",
+        headers={"Content-Type": "multipart/form-data; boundary=xyz"},
+    )
+
+    assert response.status_code == 400
+    assert staged_files() == []
+
+
+async def test_upload_rejects_oversized_stream_without_content_length(client):
+    user, _ = await register(client)
+    body = PNG + b"\x00" * (MAX_FILE_SIZE + 1)
+
+    async def chunks():
+        yield b'--xyz\r\nContent-Disposition: form-data; name="file"; filename="a.png"\r\n'
+        yield b"Content-Type: image/png\r\n\r\n"
+        for offset in range(0, len(body), 64 * 1024):
+            yield body[offset:offset + 64 * 1024]
+        yield b"\r\n--xyz--\r\n"
+
+    response = await client.post(
+        f"/users/{user['id']}/avatar",
+        content=chunks(),
+        headers={"Content-Type": "multipart/form-data; boundary=xyz"},
+    )
+
+    assert response.status_code == 413
+    assert staged_files() == []
+
+
+async def test_upload_stores_png_by_content_hash(client):
+    user, _ = await register(client)
+
+    response = await client.post(
+        f"/users/{user['id']}/avatar", files={"file": ("avatar.png", PNG, "image/png")}
+    )
+
+    assert response.status_code == 200, response.text
+    avatar_url = response.json()["avatar_url"]
+    assert os.path.exists(os.path.join(AVATAR_DIR, avatar_url.rsplit("/", 1)[-1]))
+    assert staged_files() == []
+
+
+async def wait_until_removed(path: str, timeout: float = 5.0) -> bool:
+    deadline = anyio.current_time() + timeout
+    while os.path.exists(path):
+        if anyio.current_time() > deadline:
+            return False
+        await anyio.sleep(0.05)
+    return True
+
+
+async def test_delete_removes_file_after_commit_once_unreferenced(client):
+    first, first_headers = await register(client)
+    second, second_headers = await register(client)
+    for user in (first, second):
+        response = await client.post(
+            f"/users/{user['id']}/avatar", files={"file": ("avatar.png", PNG, "image/png")}
+        )
+        assert response.status_code == 200, response.text
+    path = os.path.join(AVATAR_DIR, response.json()["avatar_url"].rsplit("/", 1)[-1])
+
+    response = await client.delete(f"/users/{first['id']}/avatar", headers=first_headers)
+    assert response.status_code == 200, response.text
+    # Still used by the second user
+    assert not await wait_until_removed(path, timeout=0.5)
+
+    response = await client.delete(f"/users/{second['id']}/avatar", headers=second_headers)
+    assert response.status_code == 200, response.text
+    assert await wait_until_removed(path)
+
+
+async def test_profile_endpoints_ignore_avatar_url(client):
+    owner, _ = await register(client)
+    response = await client.post(
+        f"/users/{owner['id']}/avatar", files={"file": ("avatar.png", PNG, "image/png")}
+    )
+    assert response.status_code == 200, response.text
+    shared_url = response.json()["avatar_url"]
+
+    other, _ = await register(client, avatar_url=shared_url)
+    assert other["avatar_url"] is None
+
+    response = await client.patch(f"/users/{other['id']}", json={"avatar_url": shared_url, "bio": "hi"})
+    assert response.status_code == 200, response.text
+    assert response.json()["avatar_url"] is None
+    assert response.json()["bio"] == "hi"
+
+
+def test_variants_are_rendered_as_webp_and_jpeg(tmp_path):
+    source = tmp_path / "avatar.png"
+    Image.new("RGBA", (300, 200), (200, 40, 40, 128)).save(source)
+    key = "a" * 64 + ".png"
+
+    rendered = render_avatar_variants(str(source), key, str(tmp_path))
+
+    assert sorted(rendered) == sorted(variant_keys(key))
+    for size in AVATAR_VARIANT_SIZES:
+        for extension, image_format in (("webp", "WEBP"), ("jpg", "JPEG")):
+            with Image.open(rendered[f"{'a' * 64}_{size}.{extension}"]) as variant:
+                assert variant.format == image_format
+                assert variant.size == (size, size)
@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event
+
+from app.db.database import AsyncSessionLocal
+from app.models import CareOrder, Message, Proposal, User
+from app.models.care_order import OrderStatus
+from app.models.proposal import ProposalStatus
+from app.models.user import UserRole
+from app.services.dashboard_service import get_owner_dashboard
+
+pytestmark = pytest.mark.anyio
+
+# Orders, proposal summaries, latest messages, counterpart profiles
+DASHBOARD_QUERIES = 4
+
+
+async def seed_owner(session, order_count: int) -> User:
+    """An owner whose orders each have an accepted petsitter and a message."""
+    owner = User(username="owner", email="owner@example.com", hashed_password="x", role=UserRole.owner)
+    session.add(owner)
+    await session.flush()
+    start = datetime.now(timezone.utc) + timedelta(days=1)
+    for number in range(order_count):
+        sitter = User(
+            username=f"sitter{number}",
+            email=f"sitter{number}@example.com",
+            hashed_password="x",
+            role=UserRole.petsitter,
+        )
+        order = CareOrder(
+            owner_id=owner.id,
+            title=f"Order {number}",
+            start_date=start + timedelta(days=number),
+            end_date=start + timedelta(days=number + 1),
+            status=OrderStatus.in_progress,
+        )
+        session.add_all([sitter, order])
+        await session.flush()
+        session.add_all([
+            Proposal(order_id=order.id, petsitter_id=sitter.id, price=20.0, status=ProposalStatus.accepted),
+            Proposal(order_id=order.id, petsitter_id=sitter.id, price=25.0, status=ProposalStatus.rejected),
+            Message(order_id=order.id, sender_id=sitter.id, content="On my way"),
+        ])
+    await session.commit()
+    return owner
+
+
+@pytest.mark.parametrize("order_count", [1, 50])
+async def test_dashboard_query_count_is_independent_of_order_count(engine, order_count):
+    async with AsyncSessionLocal() as session:
+        owner = await seed_owner(session, order_count)
+
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+        try:
+            dashboard = await get_owner_dashboard(session, owner, limit=100)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    assert len(dashboard.orders) == order_count
+    assert len(dashboard.users) == order_count
+    assert all(order.last_message is not None for order in dashboard.orders)
+    assert len(statements) == DASHBOARD_QUERIES, statements
@@ -0,0 +1,25 @@
+import asyncio
+
+import anyio
+import pytest
+
+from app.lifecycle import in_flight_requests
+from app.services.event_service import event_broker
+from tests.conftest import register
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_closing_streams_lets_shutdown_drain_finish(client):
+    _, headers = await register(client)
+    stream = asyncio.create_task(client.get("/events/stream", headers=headers))
+    with anyio.fail_after(5):
+        while not event_broker._subscriptions:
+            await anyio.sleep(0.01)
+
+    event_broker.close_all()
+
+    assert await in_flight_requests.drain(timeout=2)
+    response = await stream
+    assert response.status_code == 200
+    assert response.text.startswith("retry:")
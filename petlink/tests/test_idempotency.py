@@ -0,0 +1,92 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from starlette.responses import JSONResponse
+
+from app.core.security import create_access_token
+from app.db.database import AsyncSessionLocal
+from app.idempotency import IdempotencyMiddleware
+from app.models import IdempotencyKey
+
+pytestmark = pytest.mark.anyio
+
+ROUTE = "POST /work"
+USER_ID = 7
+
+
+class SlowEndpoint:
+    """ASGI app that counts its runs and answers after a delay."""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.runs = 0
+
+    async def __call__(self, scope, receive, send):
+        self.runs += 1
+        await asyncio.sleep(self.seconds)
+        await JSONResponse({"run": self.runs}, status_code=201)(scope, receive, send)
+
+
+def client_for(app) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def headers(key: str = "key-1") -> dict:
+    token = create_access_token(str(USER_ID))
+    return {"Authorization": f"Bearer {token}", "Idempotency-Key": key}
+
+
+@pytest.fixture
+def short_lock(settings, monkeypatch):
+    monkeypatch.setattr(settings, "idempotency_lock_timeout_seconds", 1)
+
+
+@pytest.mark.parametrize("same_worker", [True, False])
+async def test_request_outliving_lock_timeout_keeps_its_key(engine, short_lock, same_worker):
+    endpoint = SlowEndpoint(2.5)
+    first_worker = IdempotencyMiddleware(endpoint, routes=[ROUTE])
+    second_worker = first_worker if same_worker else IdempotencyMiddleware(endpoint, routes=[ROUTE])
+
+    async with client_for(first_worker) as first, client_for(second_worker) as second:
+        original = asyncio.create_task(first.post("/work", json={}, headers=headers()))
+        await asyncio.sleep(1.5)
+        duplicate = await second.post("/work", json={}, headers=headers())
+        response = await original
+
+    assert endpoint.runs == 1
+    assert response.status_code == 201
+    assert duplicate.status_code == 201
+    assert duplicate.headers["idempotent-replayed"] == "true"
+    assert duplicate.json() == response.json()
+
+
+async def test_abandoned_key_is_claimed_again(engine, short_lock):
+    endpoint = SlowEndpoint(0)
+    middleware = IdempotencyMiddleware(endpoint, routes=[ROUTE])
+    async with client_for(middleware) as client:
+        response = await client.post("/work", json={}, headers=headers("probe"))
+        assert response.status_code == 201
+    async with AsyncSessionLocal() as session:
+        probe = await session.get(IdempotencyKey, 1)
+        now = datetime.now(timezone.utc)
+        # Claimed by a worker that died before finishing
+        session.add(IdempotencyKey(
+            user_id=USER_ID,
+            key="key-1",
+            method="POST",
+            path="/work",
+            request_hash=probe.request_hash,
+            created_at=now - timedelta(seconds=5),
+            expires_at=now + timedelta(days=1),
+            locked_until=now - timedelta(seconds=1),
+        ))
+        await session.commit()
+
+    async with client_for(middleware) as client:
+        response = await client.post("/work", json={}, headers=headers())
+
+    assert response.status_code == 201
+    assert "idempotent-replayed" not in response.headers
+    assert endpoint.runs == 2
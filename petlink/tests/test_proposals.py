@@ -0,0 +1,108 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from tests.conftest import register, requires_postgres
+
+pytestmark = pytest.mark.anyio
+
+CONCURRENT_ACCEPTS = 10
+
+
+async def create_order(client, headers) -> dict:
+    start = datetime.now(timezone.utc) + timedelta(days=1)
+    response = await client.post(
+        "/care_orders/",
+        json={
+            "title": "Feed the cat",
+            "start_date": start.isoformat(),
+            "end_date": (start + timedelta(days=2)).isoformat(),
+        },
+        headers=headers,
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+async def create_proposals(client, order, count: int) -> list[tuple[dict, dict]]:
+    """Bids on an order; returns (proposal, sitter auth headers) pairs."""
+    proposals = []
+    for _ in range(count):
+        sitter, sitter_headers = await register(client, role="petsitter")
+        response = await client.post(
+            "/proposals/",
+            json={"order_id": order["id"], "petsitter_id": sitter["id"], "price": "25.00"},
+            headers=sitter_headers,
+        )
+        assert response.status_code == 201, response.text
+        proposals.append((response.json(), sitter_headers))
+    return proposals
+
+
+@requires_postgres
+async def test_concurrent_accepts_let_exactly_one_through(client):
+    _, owner_headers = await register(client)
+    order = await create_order(client, owner_headers)
+    proposals = await create_proposals(client, order, CONCURRENT_ACCEPTS)
+    proposal_ids = [proposal["id"] for proposal, _ in proposals]
+
+    responses = await asyncio.gather(*(
+        client.post(f"/proposals/{proposal_id}/accept", headers=owner_headers)
+        for proposal_id in proposal_ids
+    ))
+
+    codes = sorted(response.status_code for response in responses)
+    assert codes == [200] + [409] * (CONCURRENT_ACCEPTS - 1), [r.text for r in responses]
+    accepted_id = next(r.json()["id"] for r in responses if r.status_code == 200)
+
+    response = await client.get("/proposals/", params={"order_id": order["id"], "limit": 100})
+    statuses = {proposal["id"]: proposal["status"] for proposal in response.json()}
+    assert statuses.pop(accepted_id) == "accepted"
+    assert set(statuses) == set(proposal_ids) - {accepted_id}
+    assert set(statuses.values()) == {"rejected"}
+
+    response = await client.get(f"/care_orders/{order['id']}")
+    assert response.json()["status"] == "in_progress"
+
+
+async def test_sitter_cannot_accept_own_proposal_by_patch(client):
+    _, owner_headers = await register(client)
+    order = await create_order(client, owner_headers)
+    (proposal, sitter_headers), _ = await create_proposals(client, order, 2)
+
+    response = await client.patch(
+        f"/proposals/{proposal['id']}", json={"status": "accepted"}, headers=sitter_headers
+    )
+
+    assert response.status_code == 400
+    response = await client.get("/proposals/", params={"order_id": order["id"]})
+    assert {p["status"] for p in response.json()} == {"pending"}
+    response = await client.get(f"/care_orders/{order['id']}")
+    assert response.json()["status"] == "open"
+
+
+async def test_sitter_can_withdraw_pending_proposal(client):
+    _, owner_headers = await register(client)
+    order = await create_order(client, owner_headers)
+    [(proposal, sitter_headers)] = await create_proposals(client, order, 1)
+
+    response = await client.patch(
+        f"/proposals/{proposal['id']}", json={"status": "canceled"}, headers=sitter_headers
+    )
+
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "canceled"
+
+
+async def test_owner_cannot_staff_order_by_patch(client):
+    _, owner_headers = await register(client)
+    order = await create_order(client, owner_headers)
+
+    response = await client.patch(
+        f"/care_orders/{order['id']}", json={"status": "in_progress"}, headers=owner_headers
+    )
+
+    assert response.status_code == 400
+    response = await client.get(f"/care_orders/{order['id']}")
+    assert response.json()["status"] == "open"
@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.db import database
+from app.jobs.status_scheduler import sweep_order_statuses
+from app.services.event_service import ORDER_STATUS_CHANGED, event_broker
+from tests.conftest import register
+from tests.test_proposals import create_order, create_proposals
+
+pytestmark = pytest.mark.anyio
+
+
+def status_changes(subscription) -> list[dict]:
+    events = []
+    while not subscription.queue.empty():
+        event = subscription.queue.get_nowait()
+        if event.type == ORDER_STATUS_CHANGED:
+            events.append(event.data)
+    return events
+
+
+async def test_expired_order_notifies_owner_and_bidders(client):
+    owner, owner_headers = await register(client)
+    outsider, _ = await register(client, role="petsitter")
+    order = await create_order(client, owner_headers)
+    proposals = await create_proposals(client, order, 2)
+    user_ids = [owner["id"], outsider["id"], *(p["petsitter_id"] for p, _ in proposals)]
+    subscriptions = {user_id: event_broker.subscribe(user_id) for user_id in user_ids}
+
+    try:
+        async with database.engine.connect() as conn:
+            stats = await sweep_order_statuses(conn, datetime.now(timezone.utc) + timedelta(days=2))
+    finally:
+        for subscription in subscriptions.values():
+            event_broker.unsubscribe(subscription)
+
+    assert stats.orders_expired == 1
+    expected = [{"order_id": order["id"], "status": "canceled"}]
+    assert status_changes(subscriptions[owner["id"]]) == expected
+    for proposal, _ in proposals:
+        assert status_changes(subscriptions[proposal["petsitter_id"]]) == expected
+    assert status_changes(subscriptions[outsider["id"]]) == []
@@ -0,0 +1,59 @@
+import pytest
+
+from app.storage import IMMUTABLE_CACHE_CONTROL
+from app.storage.s3 import MULTIPART_PART_SIZE, S3AvatarStorage
+
+pytestmark = pytest.mark.anyio
+
+DIGEST = "ab" * 32
+
+
+class RecordingClient:
+    """Stands in for the aiobotocore client and keeps the upload arguments."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def put_object(self, **kwargs):
+        self.calls.append(("put_object", kwargs))
+
+    async def create_multipart_upload(self, **kwargs):
+        self.calls.append(("create_multipart_upload", kwargs))
+        return {"UploadId": "upload"}
+
+    async def upload_part(self, **kwargs):
+        return {"ETag": f"etag-{kwargs['PartNumber']}"}
+
+    async def complete_multipart_upload(self, **kwargs):
+        pass
+
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = S3AvatarStorage(bucket="avatars", staging_dir=str(tmp_path))
+    storage._client = RecordingClient()
+    return storage
+
+
+@pytest.mark.parametrize("size", [16, MULTIPART_PART_SIZE + 1])
+async def test_content_addressed_objects_are_stored_immutable(storage, tmp_path, size):
+    source = tmp_path / "upload"
+    source.write_bytes(b"\x00" * size)
+
+    await storage.save(f"{DIGEST}_64.webp", str(source))
+
+    (_, arguments), = storage._client.calls
+    assert arguments["ContentType"] == "image/webp"
+    assert arguments["CacheControl"] == IMMUTABLE_CACHE_CONTROL
+    assert not source.exists()
+
+
+async def test_legacy_objects_are_stored_without_cache_control(storage, tmp_path):
+    source = tmp_path / "upload"
+    source.write_bytes(b"\x00" * 16)
+
+    await storage.save("12.png", str(source))
+
+    (_, arguments), = storage._client.calls
+    assert arguments["ContentType"] == "image/png"
+    assert "CacheControl" not in arguments
@@ -0,0 +1,30 @@
+import pytest
+
+from app.availability import availability_filter
+from tests.conftest import PASSWORD, register
+
+pytestmark = pytest.mark.anyio
+
+
+def new_user(username: str, email: str) -> dict:
+    return {"username": username, "email": email, "password": PASSWORD, "role": "owner"}
+
+
+async def test_duplicate_email_is_rejected_with_400(client):
+    user, _ = await register(client)
+
+    response = await client.post("/users/", json=new_user("someone_else", user["email"]))
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Email already exists"}
+
+
+async def test_username_taken_through_another_worker_is_rejected_with_400(client, monkeypatch):
+    user, _ = await register(client)
+    # This worker's filter has not seen the registration yet
+    monkeypatch.setattr(availability_filter, "is_free", lambda field, value: True)
+
+    response = await client.post("/users/", json=new_user(user["username"], "fresh@example.com"))
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Username already exists"}